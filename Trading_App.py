@@ -1,10 +1,15 @@
 import streamlit as st
+from pages.utils.cache import cache_stats, cache_entries, invalidate
+from pages.utils.indicator_cache import indicator_cache_stats
+from pages.utils.panel import memory_report
+from pages.utils.debug_panel import start_page, debug_panel
 
 st.set_page_config(
     page_title="Tradezy",
     page_icon="chart_with_upwards_trend:",
     layout="wide"
 )
+page_span = start_page('Home')
 
 st.title("Tradezy: Trading made EZ")
 
@@ -26,3 +31,19 @@ st.write("Work with the Capital Asset Pricing Model (CAPM), which provides a rel
 st.markdown("## :four: CAPM Beta")
 st.write("Here you can calculate the Beta of an equity asset. Beta measures how much your asset returns move compared to the overall market.")
 
+# Cache and panel memory statistics for tuning TTLs and size limits under load
+with st.expander("Cache and memory statistics"):
+    st.dataframe(cache_stats(), use_container_width=True)
+    st.dataframe(cache_entries(), use_container_width=True)
+    indicators = indicator_cache_stats()
+    st.write(f"**Indicator cache:** {indicators['entries']} entries, {indicators['bytes'] / 2**20:.1f} MB, "
+             f"{indicators['hits']} hits, {indicators['misses']} misses, {indicators['evictions']} evictions")
+    panels = memory_report()
+    st.write(f"**Price panels:** {panels['bytes'].sum() / 2**20:.1f} MB of "
+             f"{panels.attrs['budget_bytes'] / 2**20:.0f} MB budget")
+    st.dataframe(panels, use_container_width=True)
+    if st.button("Clear cache"):
+        invalidate()
+        st.rerun()
+
+debug_panel(page_span)
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from pages.utils.model_train import run_forecast
+from pages.utils.results_store import save_forecast
+from pages.utils.results_store import stored_forecasts
+from pages.utils.jobs import enter_worker
+
+# Precomputes forecasts into the results store
+#
+#   python batch_forecast.py AAPL MSFT TSLA
+#   python batch_forecast.py --file tickers.txt --workers 4 --auto-order --backtest-folds 5
+#   python batch_forecast.py --list
+
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+
+def forecast_ticker(ticker, auto_order=False, backtest_folds=0):
+    started = time.perf_counter()
+    result = run_forecast(ticker, auto_order, backtest_folds=backtest_folds)
+    save_forecast(ticker, auto_order, result)
+    return result['rmse'], result['order'], result.get('backtest'), time.perf_counter() - started
+
+
+def _read_tickers(args):
+    tickers = list(args.tickers)
+    if args.file:
+        with open(args.file) as f:
+            tickers += [line.split('#')[0].strip() for line in f]
+    return list(dict.fromkeys(ticker.upper() for ticker in tickers if ticker))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute 30 day forecasts into the local forecast store")
+    parser.add_argument('tickers', nargs='*', help="ticker symbols")
+    parser.add_argument('--file', help="file with one ticker per line ('#' starts a comment)")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="worker processes")
+    parser.add_argument('--auto-order', action='store_true', help="search the ARIMA order instead of (30, d, 30)")
+    parser.add_argument('--backtest-folds', type=int, default=0, help="also run a walk-forward backtest")
+    parser.add_argument('--list', action='store_true', help="list the stored forecasts and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print(stored_forecasts().to_string(index=False))
+        return 0
+
+    tickers = _read_tickers(args)
+    if not tickers:
+        parser.error("no tickers given")
+
+    rows = []
+    workers = min(args.workers, len(tickers))
+    # Order searches and backtests inside each worker get its share of the CPUs
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=enter_worker, initargs=(workers,)) as pool:
+        futures = {pool.submit(forecast_ticker, ticker, args.auto_order, args.backtest_folds): ticker
+                   for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                rmse, order, backtest, seconds = future.result()
+                rows.append((ticker, 'ok', rmse, order, backtest and round(backtest['rmse'], 4), round(seconds, 1)))
+            except Exception as e:
+                rows.append((ticker, f'failed: {e}', None, None, None, None))
+            print(f"[{len(rows)}/{len(tickers)}] {ticker}: {rows[-1][1]}", flush=True)
+
+    report = pd.DataFrame(rows, columns=['ticker', 'status', 'rmse', 'order', 'backtest_rmse', 'seconds'])
+    print(report.sort_values('ticker').to_string(index=False))
+    return 0 if (report['status'] == 'ok').all() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
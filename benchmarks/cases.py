@@ -0,0 +1,104 @@
+from benchmarks.synthetic import SIZES
+from benchmarks.synthetic import synthetic_ohlcv
+from benchmarks.synthetic import synthetic_closes
+from pages.utils import CAPM_func
+from pages.utils import model_train
+from pages.utils import plotly_figure
+from pages.utils import stationarity
+from pages.utils import indicator_cache
+from pages.utils import indicators
+
+# Cases for benchmarks/run.py; setup() builds untimed inputs and clears
+# caches so every repetition is a cold call
+
+
+class Case:
+    def __init__(self, name, fn, setup):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+
+    def __repr__(self):
+        return f"Case({self.name})"
+
+
+def _reset_caches():
+    stationarity._cache.clear()
+    indicator_cache._cache.clear()
+
+
+def _closes(size, n_tickers):
+    def setup():
+        return (synthetic_closes(SIZES[size], n_tickers),)
+    return setup
+
+
+def _close_series(size):
+    def setup():
+        _reset_caches()
+        return (synthetic_ohlcv(SIZES[size])[['Close']],)
+    return setup
+
+
+def _scaled_close(size):
+    def setup():
+        scaled, _ = model_train.scaling(synthetic_ohlcv(SIZES[size])['Close'])
+        return (scaled, 1)
+    return setup
+
+
+def _ohlcv(size):
+    def setup():
+        _reset_caches()
+        return (synthetic_ohlcv(SIZES[size]), 'max')
+    return setup
+
+
+def _first_stock_beta(frame):
+    return CAPM_func.calulate_beta(frame, frame.columns[1])
+
+
+# Five price overlays plus the three indicator panels, as the analysis page
+# can request them at once
+INDICATOR_SET = (('sma', 20), ('sma', 200), ('ema', 12), ('ema', 26), ('bbands', 20, 2),
+                 ('rsi', 14), ('macd', 12, 26, 9), ('atr', 14))
+
+
+def _indicator_set(size):
+    def setup():
+        return (synthetic_ohlcv(SIZES[size]), INDICATOR_SET)
+    return setup
+
+
+# ARIMA(30, d, 30) takes minutes per fit, too slow to repeat in a suite;
+# the same fit path is timed with a small order instead
+def _fit_model(data, d):
+    return model_train.fit_model(data, d, order=(2, d, 2))
+
+
+def build_cases():
+    cases = []
+    for size, n_tickers in (('1Y', 1), ('10Y', 100), ('30Y', 1000)):
+        label = f"[{size} x {n_tickers}]"
+        cases.append(Case('capm.daily_return' + label, CAPM_func.daily_return, _closes(size, n_tickers)))
+        cases.append(Case('capm.normalize' + label, CAPM_func.normalize, _closes(size, n_tickers)))
+    cases.append(Case('capm.calulate_beta[10Y x 1]', _first_stock_beta, _closes('10Y', 1)))
+    cases.append(Case('capm.calculate_betas[10Y x 1000]', CAPM_func.calculate_betas, _closes('10Y', 1000)))
+    for size in ('1Y', '10Y'):
+        cases.append(Case(f'model.get_differencing_order[{size}]', model_train.get_differencing_order,
+                          _close_series(size)))
+    cases.append(Case('model.fit_model[1Y, order (2, 1, 2)]', _fit_model, _scaled_close('1Y')))
+    for size in ('1Y', '30Y'):
+        cases.append(Case(f'indicators.compute_indicators[{size}, 8 specs]', indicators.compute_indicators,
+                          _indicator_set(size)))
+    for size in ('1Y', '10Y', '30Y'):
+        for name in ('close_chart', 'candlestick', 'RSI', 'plot_MACD'):
+            cases.append(Case(f'plot.{name}[{size}]', getattr(plotly_figure, name), _ohlcv(size)))
+    return cases
+
+
+def select(cases, pattern=None):
+    if not pattern:
+        return cases
+    return [case for case in cases if pattern in case.name]
+
@@ -0,0 +1,96 @@
+import os
+import re
+import ast
+import sys
+import json
+import argparse
+import subprocess
+
+# Import time per page against a startup budget; fails if a DEFERRED
+# library is imported eagerly
+#
+#   python -m benchmarks.imports [--budget 2.0] [--top 10]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ['Trading_App.py', 'pages/Stock_Analysis.py', 'pages/Stock_Prediction.py',
+         'pages/CAPM_Return.py', 'pages/CAPM_Beta.py']
+STARTUP_BUDGET = float(os.environ.get('TRADEZY_STARTUP_BUDGET_S', 2.0))
+REPEAT = 3
+TOP = 5
+# Libraries that must only load on first use
+DEFERRED = ('statsmodels', 'sklearn', 'scipy', 'yfinance', 'pandas_datareader', 'ta')
+
+_IMPORTTIME = re.compile(r'import time:\s+(\d+) \|\s+\d+ \| *(\S+)')
+
+_CHILD = """
+import sys, json, time
+started = time.perf_counter()
+{imports}
+seconds = time.perf_counter() - started
+loaded = sorted({{name.split('.')[0] for name in sys.modules}})
+print(json.dumps({{'seconds': seconds, 'loaded': loaded}}))
+"""
+
+
+def page_imports(path):
+    with open(os.path.join(ROOT, path)) as f:
+        tree = ast.parse(f.read(), path)
+    return '\n'.join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+# Own import time in microseconds per top-level package (per module for
+# this repo's pages.utils), from the -X importtime log
+def _packages(stderr):
+    totals = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            name = match.group(2)
+            package = '.'.join(name.split('.')[:3]) if name.startswith('pages.') else name.split('.')[0]
+            totals[package] = totals.get(package, 0) + int(match.group(1))
+    return totals
+
+
+def measure(path, repeat=REPEAT):
+    code = _CHILD.format(imports=page_imports(path))
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, env=env,
+                              capture_output=True, text=True, check=True)
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = dict(result, packages=_packages(proc.stderr))
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report page import times and enforce the startup budget")
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET, help="seconds allowed per page")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="runs per page, the fastest counts")
+    parser.add_argument('--top', type=int, default=TOP, help="heaviest packages listed per page")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for path in PAGES:
+        result = measure(path, args.repeat)
+        eager = [name for name in DEFERRED if name in result['loaded']]
+        problems = []
+        if result['seconds'] > args.budget:
+            problems.append(f"over budget ({args.budget:.2f}s)")
+        if eager:
+            problems.append("eager: " + ', '.join(eager))
+        failures += bool(problems)
+        print(f"{path:<28} {result['seconds']:>7.3f}s  {'; '.join(problems) or 'ok'}")
+        heaviest = sorted(result['packages'].items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for package, micros in heaviest:
+            print(f"    {package:<24} {micros / 1e6:>7.3f}s")
+
+    if failures:
+        print(f"{failures} page(s) over budget or importing deferred libraries eagerly")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+
+# Times the cases in benchmarks/cases.py against benchmarks/baselines.json
+#
+#   python -m benchmarks.run [--filter plot.] [--update]
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+THRESHOLD = float(os.environ.get('TRADEZY_BENCH_THRESHOLD', 0.5))
+REPEAT = 5
+# Baselines are the median over this many full measurements of a case
+BASELINE_ROUNDS = 3
+# Differences below these are treated as noise whatever the ratio
+MIN_SECONDS = 0.01
+MIN_BYTES = 1024 * 1024
+
+# Keep the price store and model cache of a benchmark run out of the repo
+os.environ.setdefault('TRADEZY_STORE_DIR', tempfile.mkdtemp(prefix='tradezy_bench_'))
+
+from benchmarks.cases import build_cases, select  # noqa: E402
+
+
+def measure(case, repeat=REPEAT):
+    case.fn(*case.setup())
+    timings = []
+    for _ in range(repeat):
+        args = case.setup()
+        started = time.perf_counter()
+        case.fn(*args)
+        timings.append(time.perf_counter() - started)
+
+    args = case.setup()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        case.fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(timings), 'peak_bytes': peak - baseline}
+
+
+def load_baselines(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)['cases']
+
+
+def save_baselines(results, path=BASELINE_PATH):
+    previous = load_baselines(path)
+    previous.update(results)
+    document = {
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'processor': platform.machine(), 'cpus': os.cpu_count()},
+        'cases': dict(sorted(previous.items())),
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
+
+
+# Names of the metrics of result that regressed against base
+def regressions(result, base, threshold=THRESHOLD):
+    failed = []
+    if result['seconds'] > base['seconds'] * (1 + threshold) and result['seconds'] - base['seconds'] > MIN_SECONDS:
+        failed.append('time')
+    if result['peak_bytes'] > base['peak_bytes'] * (1 + threshold) and \
+            result['peak_bytes'] - base['peak_bytes'] > MIN_BYTES:
+        failed.append('memory')
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analytics hot paths against stored baselines")
+    parser.add_argument('--filter', help="only run cases whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="timed repetitions per case")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="allowed slowdown, 0.5 = 50%%")
+    parser.add_argument('--update', action='store_true', help="write the results as the new baselines")
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines()
+    results = {}
+    failures = 0
+    print(f"{'case':<42} {'seconds':>10} {'baseline':>10} {'peak MB':>9} {'baseline':>9}  status")
+    for case in select(build_cases(), args.filter):
+        if args.update:
+            rounds = [measure(case, args.repeat) for _ in range(BASELINE_ROUNDS)]
+            result = {key: statistics.median(r[key] for r in rounds) for key in rounds[0]}
+        else:
+            result = measure(case, args.repeat)
+        results[case.name] = result
+        base = baselines.get(case.name)
+        if base is None:
+            status = 'new'
+        else:
+            failed = regressions(result, base, args.threshold)
+            if failed:
+                retry = measure(case, args.repeat)
+                result = {key: min(result[key], retry[key]) for key in result}
+                results[case.name] = result
+                failed = regressions(result, base, args.threshold)
+            status = 'REGRESSED (' + ', '.join(failed) + ')' if failed else 'ok'
+            failures += bool(failed)
+        print(f"{case.name:<42} {result['seconds']:>10.4f} "
+              f"{base['seconds'] if base else float('nan'):>10.4f} "
+              f"{result['peak_bytes'] / 2**20:>9.1f} "
+              f"{base['peak_bytes'] / 2**20 if base else float('nan'):>9.1f}  {status}", flush=True)
+
+    if args.update:
+        save_baselines(results)
+        print(f"Baselines written to {BASELINE_PATH}")
+        return 0
+    if failures:
+        print(f"{failures} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+# Deterministic synthetic market data for offline benchmarks
+
+SIZES = {'1Y': 252, '10Y': 2520, '30Y': 7560}
+START = '1990-01-02'
+
+
+# Daily OHLCV bars in the store layout (DatetimeIndex 'Date', float64 columns)
+def synthetic_ohlcv(n_days, seed=0, start=START):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=n_days, name='Date')
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_days)))
+    open_ = close * np.exp(rng.normal(0, 0.004, n_days))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, n_days)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, n_days)))
+    volume = rng.integers(100_000, 10_000_000, n_days).astype(np.float64)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
+
+
+# Closes of n_tickers stocks driven by one market factor, in the CAPM page
+# layout: a 'Date' column, one column per ticker and the 'sp500' index
+def synthetic_closes(n_days, n_tickers, seed=0, start=START):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0003, 0.01, n_days)
+    betas = rng.uniform(0.5, 1.8, n_tickers)
+    returns = market[:, None] * betas + rng.normal(0, 0.012, (n_days, n_tickers))
+    frame = pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)),
+                         columns=[f'T{i:04d}' for i in range(n_tickers)])
+    frame.insert(0, 'Date', pd.bdate_range(start, periods=n_days))
+    frame['sp500'] = 1000 * np.exp(np.cumsum(market))
+    return frame
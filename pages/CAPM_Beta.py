@@ -1,11 +1,16 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import datetime
-import pandas_datareader.data as web
 import plotly.graph_objects as go
-from sklearn.linear_model import LinearRegression
 import numpy as np
+from pages.utils.panel import PricePanel
+from pages.utils.risk_engine import beta_alpha
+from pages.utils.risk_engine import simple_returns
+from pages.utils.risk_engine import rolling_beta_alpha
+from pages.utils.risk_engine import ewma_beta_alpha
+from pages.utils.debug_panel import start_page, debug_panel
+
+ROLLING_WINDOWS = [60, 120, 252]
 
 # ---------- Page Config ----------
 st.set_page_config(
@@ -13,6 +18,7 @@ st.set_page_config(
     page_icon="📈",
     layout="wide"
 )
+page_span = start_page('CAPM_Beta')
 
 st.markdown("## Calculate Beta and Return for Individual Stock")
 
@@ -27,51 +33,25 @@ with col2:
 # ---------- Date Range ----------
 end = datetime.date.today()
 start = datetime.date(end.year - years, end.month, end.day)
+# Extra history so the longest rolling window is filled from the first day shown
+history_start = start - datetime.timedelta(days=int(max(ROLLING_WINDOWS) * 1.6))
 
 # ---------- Data Download ----------
-@st.cache_data
-def download_data(ticker, start_date, end_date):
-    try:
-        # Download stock data
-        stock_data = yf.download(ticker, start=start_date, end=end_date)
-        stock_data = stock_data[['Close']].rename(columns={'Close': 'Stock'})
-        
-        # Download S&P 500 data
-        sp500_data = web.DataReader('SP500', 'fred', start_date, end_date)
-        sp500_data = sp500_data.rename(columns={'SP500': 'SP500'})
-        
-        return stock_data, sp500_data
-    except Exception as e:
-        st.error(f"Error downloading data: {e}")
-        return None, None
-
-stock_data, sp500_data = download_data(stock_ticker, start, end)
-
-if stock_data is None or sp500_data is None:
+# One panel on the trading calendar holds the stock and the S&P 500 as
+# aligned columns; both loaders go through the app-wide cache
+try:
+    panel = PricePanel.build([stock_ticker], history_start, end, benchmark='SP500')
+except Exception as e:
+    st.error(f"Error downloading data: {e}")
+    st.stop()
+
+if stock_ticker not in panel:
+    st.error(f"Error downloading data: no prices for {stock_ticker}")
     st.stop()
 
 # ---------- Data Alignment ----------
-def align_data(stock_df, sp500_df):
-    # Convert to DataFrames if they're Series
-    if isinstance(stock_df, pd.Series):
-        stock_df = stock_df.to_frame('Stock')
-    if isinstance(sp500_df, pd.Series):
-        sp500_df = sp500_df.to_frame('SP500')
-    
-    # Ensure we have proper column names
-    stock_df.columns = ['Stock']
-    sp500_df.columns = ['SP500']
-    
-    # Convert indices to datetime and normalize
-    stock_df.index = pd.to_datetime(stock_df.index).normalize()
-    sp500_df.index = pd.to_datetime(sp500_df.index).normalize()
-    
-    # Merge using index alignment
-    combined = pd.concat([stock_df, sp500_df], axis=1).dropna()
-    
-    return combined
-
-df = align_data(stock_data, sp500_data)
+df = panel.window(start).frame([stock_ticker, 'SP500'], dropna=True)
+df.columns = ['Stock', 'SP500']
 
 if df.empty:
     st.error("No overlapping data found between stock and S&P 500")
@@ -83,13 +63,9 @@ df['sp500_return'] = df['SP500'].pct_change() * 100
 df = df.dropna()
 
 # ---------- Calculate Beta ----------
-X = df['sp500_return'].values.reshape(-1, 1)
-y = df['stock_return'].values.reshape(-1, 1)
-
-model = LinearRegression()
-model.fit(X, y)
-beta = float(model.coef_[0])
-alpha = float(model.intercept_[0])
+b, a = beta_alpha(df['stock_return'].to_numpy(), df['sp500_return'].to_numpy())
+beta = float(b[0])
+alpha = float(a[0])
 
 # ---------- Calculate Expected Return ----------
 rf = 0  # risk-free rate
@@ -174,4 +150,51 @@ fig.add_annotation(
 )
 
 # Display the plot
-st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+st.plotly_chart(fig, use_container_width=True)
+
+# ---------- Rolling Beta ----------
+st.markdown("## Rolling Beta")
+col1, col2, col3 = st.columns([2, 1, 1])
+with col1:
+    compare = st.text_input("Compare with (comma separated tickers)", value="")
+with col2:
+    windows = st.multiselect("Windows (trading days)", ROLLING_WINDOWS, default=ROLLING_WINDOWS)
+with col3:
+    halflife = st.number_input("EWMA half-life (days, 0 = off)", min_value=0, max_value=252, value=0)
+
+# Comparison tickers are added to the same panel; missing bars stay NaN and
+# only drop that ticker's pairs, not the whole row
+compare_tickers = [t.strip().upper() for t in compare.split(',') if t.strip()]
+failures = panel.add_tickers(compare_tickers)
+if failures:
+    st.warning(f"Could not load: {', '.join(sorted(failures))}")
+tickers = [t for t in dict.fromkeys([stock_ticker] + compare_tickers) if t in panel]
+panel_returns = simple_returns(panel.matrix(tickers)) * 100
+market_returns = simple_returns(panel.column('SP500')).ravel() * 100
+panel_returns[0] = market_returns[0] = np.nan
+shown = panel.index >= pd.Timestamp(start)
+
+series = {f"{w}d": rolling_beta_alpha(panel_returns, market_returns, w)[0] for w in windows}
+if halflife:
+    series[f"EWMA {halflife}d"] = ewma_beta_alpha(panel_returns, market_returns, halflife)[0]
+
+fig_rolling = go.Figure()
+for label, betas in series.items():
+    for i, ticker in enumerate(tickers):
+        fig_rolling.add_trace(go.Scatter(x=panel.index[shown], y=betas[shown, i], mode='lines',
+                                         name=f"{ticker} {label}"))
+fig_rolling.add_hline(y=1, line_dash='dot', line_color='rgba(255,255,255,0.5)')
+fig_rolling.update_layout(
+    title='Rolling Beta vs S&P 500',
+    yaxis_title='Beta',
+    plot_bgcolor='black',
+    paper_bgcolor='black',
+    font=dict(color='white'),
+    xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+    yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    hovermode='x unified'
+)
+st.plotly_chart(fig_rolling, use_container_width=True)
+
+debug_panel(page_span)
@@ -1,20 +1,60 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import datetime
-import pandas_datareader.data as web
 from pages.utils.CAPM_func import interactive_plot
 from pages.utils.CAPM_func import normalize
 from pages.utils.CAPM_func import daily_return
-from pages.utils.CAPM_func import calulate_beta
+from pages.utils.CAPM_func import calculate_betas
+from pages.utils.risk_engine import capm_expected_return
+from pages.utils.panel import PricePanel
+from pages.utils.universe import load_universe_capm
+from pages.utils.table_view import paged_table
+from pages.utils.debug_panel import start_page, debug_panel
 
 st.set_page_config(
     page_title="CAPM",
     page_icon="chart_with_downwards_trend",
     layout="wide"
 )
+page_span = start_page('CAPM_Return')
 st.title("Capital Asset Pricing Model")
 
+mode = st.radio("Mode", ["Selected stocks", "Stored universe"], horizontal=True)
+
+# Every ticker in the local price store, each regressed over its own history
+if mode == "Stored universe":
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        year = st.number_input("Number of years", 1, 10)
+    with col2:
+        min_observations = st.number_input("Minimum observations", 20, 2520, 60)
+    with col3:
+        rf = st.number_input("Risk-free rate (% per year)", 0.0, 20.0, 0.0)
+    end = datetime.date.today()
+    start = datetime.date(end.year - year, end.month, end.day)
+    try:
+        universe = load_universe_capm(start, end, rf, min_observations)
+    except Exception as e:
+        st.error(f"Could not compute the universe: {e}")
+        st.stop()
+    if universe.empty:
+        st.info("No stored tickers have enough history yet. Load some stocks on the other pages first.")
+        st.stop()
+    st.markdown(f"### CAPM for {len(universe)} stocks")
+    # Sorted and paged on the server, so the whole universe never goes to the browser
+    paged_table(
+        universe, key='universe', sort_by='Beta', ascending=False, decimals=4,
+        column_config={
+            'Beta': st.column_config.NumberColumn(format='%.3f'),
+            'Alpha': st.column_config.NumberColumn('Alpha (% per day)', format='%.4f'),
+            'Expected Return': st.column_config.NumberColumn('Expected Return (%)', format='%.2f'),
+            'Residual Vol': st.column_config.NumberColumn('Residual Vol (%)', format='%.2f'),
+            'R2': st.column_config.NumberColumn('R²', format='%.3f'),
+        },
+    )
+    debug_panel(page_span)
+    st.stop()
+
 # User Input
 col1, col2 = st.columns([1, 1])
 with col1:
@@ -31,32 +71,17 @@ try:
     end = datetime.date.today()
     start = datetime.date(end.year - year, end.month, end.day)
 
-    # Download SP500 Data
-    SP500 = web.DataReader('SP500', 'fred', start, end)
-    SP500 = SP500.reset_index()
-    SP500.columns = ['Date', 'sp500']
-    SP500['Date'] = pd.to_datetime(SP500['Date'])
-
-    # Download stock data and combine
-    stock_data_list = []
+    # Stocks and the S&P 500 as aligned columns of one trading-calendar panel
+    panel = PricePanel.build(stocks_list, start, end, benchmark='SP500')
+    failures = [stock for stock in stocks_list if stock not in panel]
+    if failures:
+        st.warning("Could not download: " + ", ".join(failures))
+    stocks = [stock for stock in stocks_list if stock in panel]
+    if not stocks:
+        raise ValueError("no valid tickers")
 
-    for stock in stocks_list:
-        df = yf.download(stock, start=start, end=end)[['Close']]
-        df = df.rename(columns={'Close': stock})
-        stock_data_list.append(df)
-
-    # Combine stock close prices on the index (which is Date)
-    combined_stocks = pd.concat(stock_data_list, axis=1, join='inner')
-
-    # Reset index and flatten completely
-    combined_stocks = combined_stocks.reset_index()  # Makes 'Date' a column
-    combined_stocks['Date'] = pd.to_datetime(combined_stocks['Date'])
-
-    # Ensure no MultiIndex remains
-    combined_stocks.columns = [col if isinstance(col, str) else col[0] for col in combined_stocks.columns]
-
-    # Merge with SP500 data
-    merged_df = pd.merge(combined_stocks, SP500, on='Date', how='inner')
+    # Days on which every selected stock and the index have a close
+    merged_df = panel.frame(stocks + ['SP500'], dropna=True).rename(columns={'SP500': 'sp500'}).reset_index()
 
     # Display result
     col1, col2 = st.columns([1, 1])
@@ -78,16 +103,15 @@ try:
     stock_daily_return=daily_return(merged_df)
     print(stock_daily_return.head())
 
-    beta={}
-    alpha={}
+    with st.expander("Full price and daily return tables"):
+        tab_prices, tab_returns = st.tabs(["Prices", "Daily returns (%)"])
+        with tab_prices:
+            paged_table(merged_df.set_index('Date'), key='capm_prices', ascending=False)
+        with tab_returns:
+            paged_table(stock_daily_return.set_index('Date'), key='capm_returns', ascending=False)
+
+    beta, alpha = calculate_betas(stock_daily_return, 'sp500')
 
-    for i in stock_daily_return.columns:
-        if i!='Date' and i!='SP500':
-            b,a = calulate_beta(stock_daily_return,i)
-            beta[i]=b
-            alpha[i]=a
-    print(beta,alpha)
-        
     beta_df=pd.DataFrame(columns=['Stock', 'Beta Value'])
     beta_df['Stock']=beta.keys()
     beta_df['Beta Value']=[str(round(i,2)) for i in beta.values()]
@@ -99,10 +123,7 @@ try:
     rf = 0
     rm = stock_daily_return['sp500'].mean() * 252
     return_df = pd.DataFrame()
-    return_value = []
-
-    for stock, value in beta.items():
-        return_value.append(str(round(rf + (value * (rm - rf)), 2)))
+    return_value = capm_expected_return(list(beta.values()), rm, rf).round(2).astype(str)
 
     return_df['Stock'] = list(beta.keys())  # Match exactly with return_value
     return_df['Return Value'] = return_value
@@ -114,3 +135,5 @@ try:
 
 except:
     st.write("Please Select Valid Tickers")
+
+debug_panel(page_span)
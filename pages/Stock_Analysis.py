@@ -1,22 +1,29 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-import plotly.graph_objects as go
 import datetime
-import ta
-from pages.utils.plotly_figure import plotly_table
-from pages.utils.plotly_figure import filter_data
 from pages.utils.plotly_figure import close_chart
 from pages.utils.plotly_figure import candlestick
 from pages.utils.plotly_figure import RSI
 from pages.utils.plotly_figure import Moving_average
 from pages.utils.plotly_figure import plot_MACD
+from pages.utils.plotly_figure import ATR
+from pages.utils.data_store import load_prices
+from pages.utils.windows import slice_period
+from pages.utils.windows import slice_range
+from pages.utils.data_store import load_info
+from pages.utils.indicator_cache import get_indicator
+from pages.utils.indicator_cache import get_indicators
+from pages.utils.downsample import target_points
+from pages.utils.table_view import paged_table
+from pages.utils.tracing import span
+from pages.utils.debug_panel import start_page, debug_panel
 
 st.set_page_config(
     page_title="Stock Analysis",
     page_icon="📄",
     layout="wide",
 )
+page_span = start_page('Stock_Analysis')
 
 # Extremely aggressive CSS to reduce all spacing
 st.markdown("""
@@ -81,6 +88,17 @@ available_tickers = [
     "AAPL", "MSFT", "GOOGL", "TSLA", "AMZN", "NVDA", "META", "NFLX", "BRK-B", "JPM"
 ]
 
+# Price overlays for the main chart; the selected ones are computed together
+# in one pass over the full history
+OVERLAYS = {
+    'SMA 20': ('sma', 20),
+    'SMA 50': ('sma', 50),
+    'SMA 200': ('sma', 200),
+    'EMA 12': ('ema', 12),
+    'EMA 26': ('ema', 26),
+    'Bollinger Bands (20, 2)': ('bbands', 20, 2),
+}
+
 col1, col2, col3 = st.columns(3)
 today = datetime.date.today()
 
@@ -93,9 +111,8 @@ with col3:
 
 st.subheader(ticker)
 
-# Load stock
-stock = yf.Ticker(ticker)
-info = stock.info
+# Load stock profile (cached for a day)
+info = load_info(ticker)
 
 # Business summary with minimal spacing
 st.write(info.get('longBusinessSummary', 'No business summary available.'))
@@ -132,11 +149,13 @@ with metrics_row[1]:
     })
     st.dataframe(df2.set_index('Metric'), height=150)
 
+# Full daily history is fetched once per ticker; the custom range and every
+# period window below are slices of it
+history = load_prices(ticker)
+
 # Daily close and last 10 days data in a tight layout
 try:
-    data = yf.download(ticker, start=start_date, end=end_date)
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.get_level_values(0)
+    data = slice_range(history, start_date, end_date)
 
     if len(data) < 2:
         st.warning("Not enough historical data available to show daily change.")
@@ -155,6 +174,11 @@ try:
             st.markdown("**Data of the Last 10 Days**")
             last_10_df = data.tail(10).sort_index(ascending=False).round(3)
             st.dataframe(last_10_df)
+
+        # Whole selected range, sent to the browser one page at a time
+        with st.expander("Full price history"):
+            paged_table(data.assign(**{'Return (%)': data['Close'].pct_change() * 100}),
+                        key=f'history_{ticker}', ascending=False)
             
 except Exception as e:
     st.error(f"Error loading stock data: {e}")
@@ -184,30 +208,57 @@ with period_cols[6]:
     if st.button('MAX', key='max'):
         num_period = 'max'
 
+# Keep the chosen period across reruns so zooming does not reset it
+if num_period:
+    st.session_state['num_period'] = num_period
+num_period = st.session_state.get('num_period', '')
+
 # Chart selection with minimal spacing
 chart_cols = st.columns([1, 1, 4])
 with chart_cols[0]:
     chart_type = st.selectbox('Chart Type', ['Line', 'Candle'])
 with chart_cols[1]:
     if chart_type == 'Candle':
-        indicator = st.selectbox('Indicator', ['RSI', 'MACD'])
+        indicator = st.selectbox('Indicator', ['RSI', 'MACD', 'ATR'])
     else:
-        indicator = st.selectbox('Indicator', ['RSI', 'Moving Average', 'MACD'])
+        indicator = st.selectbox('Indicator', ['RSI', 'Moving Average', 'MACD', 'ATR'])
+with chart_cols[2]:
+    overlays = st.multiselect('Overlays', list(OVERLAYS))
 
 # Charts with minimal spacing
 st.markdown("### Main Chart")
-data_used = stock.history(period=num_period if num_period else '1y')
 period_used = num_period if num_period else '1y'
+data_used = slice_period(history, period_used)
+
+# Long periods are downsampled to the chart width; zooming into a narrower
+# range re-renders it at a higher resolution
+if len(data_used) > target_points():
+    first_day, last_day = data_used.index[0].date(), data_used.index[-1].date()
+    zoom = st.slider('Zoom', min_value=first_day, max_value=last_day, value=(first_day, last_day),
+                     key=f'zoom_{ticker}_{period_used}')
+    data_used = slice_range(data_used, zoom[0], pd.Timestamp(zoom[1]) + pd.Timedelta(days=1))
 
-if chart_type == 'Candle':
-    st.plotly_chart(candlestick(data_used, period_used), use_container_width=True)
-else:
-    st.plotly_chart(close_chart(data_used, period_used), use_container_width=True)
+overlay_block = get_indicators(ticker, history, [OVERLAYS[name] for name in overlays]) if overlays else None
+
+# figure.render covers building and serializing the figure
+with span('figure.render', chart=chart_type):
+    if chart_type == 'Candle':
+        st.plotly_chart(candlestick(data_used, period_used, overlay_block), use_container_width=True)
+    else:
+        st.plotly_chart(close_chart(data_used, period_used, overlay_block), use_container_width=True)
 
 st.markdown("### Indicator Chart")
-if indicator == 'RSI':
-    st.plotly_chart(RSI(data_used, period_used), use_container_width=True)
-elif indicator == 'Moving Average':
-    st.plotly_chart(Moving_average(data_used, period_used), use_container_width=True)
-elif indicator == 'MACD':
-    st.plotly_chart(plot_MACD(data_used, period_used), use_container_width=True)
\ No newline at end of file
+# Indicators are kept over the full stored history, only updated with new bars
+# and memoized per data version, so switching indicators reuses earlier results
+full_close = history['Close']
+with span('figure.render', chart=indicator):
+    if indicator == 'RSI':
+        st.plotly_chart(RSI(data_used, period_used, get_indicator(ticker, full_close, ('rsi', 14))), use_container_width=True)
+    elif indicator == 'Moving Average':
+        st.plotly_chart(Moving_average(data_used, period_used, get_indicator(ticker, full_close, ('sma', 50))), use_container_width=True)
+    elif indicator == 'MACD':
+        st.plotly_chart(plot_MACD(data_used, period_used, get_indicator(ticker, full_close, ('macd', 12, 26, 9))), use_container_width=True)
+    elif indicator == 'ATR':
+        st.plotly_chart(ATR(data_used, period_used, get_indicators(ticker, history, [('atr', 14)])), use_container_width=True)
+
+debug_panel(page_span)
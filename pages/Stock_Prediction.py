@@ -1,44 +1,103 @@
+import time
+import datetime
 import streamlit as st
 import pandas as pd
-from pages.utils.model_train import get_data
-from pages.utils.model_train import stationary_check
-from pages.utils.model_train import get_rolling_mean
-from pages.utils.model_train import get_differencing_order
-from pages.utils.model_train import fit_model
-from pages.utils.model_train import evaluate_model
-from pages.utils.model_train import scaling
-from pages.utils.model_train import get_forecast
-from pages.utils.model_train import inverse_scaling
+from pages.utils.model_train import run_forecast
+from pages.utils.backtest import N_FOLDS
 from pages.utils.plotly_figure import plotly_table
 from pages.utils.plotly_figure import Moving_average_forecast
+from pages.utils.jobs import get_runner, PENDING, RUNNING, FAILED, CANCELLING, CANCELLED
+from pages.utils.results_store import load_forecast, save_forecast
+from pages.utils.debug_panel import start_page, debug_panel
 
 st.set_page_config(
     page_title="Stock Prediction",
     page_icon="chart_with_downwards_trend",
     layout="wide",
 )
+page_span = start_page('Stock_Prediction')
 
 st.title("Stock Prediction")
 col1, col2, col3 = st.columns(3)
 
 with col1:
     ticker=st.text_input("Enter the Stock Ticker", 'TSLA')
+with col2:
+    auto_order=st.checkbox("Automatic order selection", value=False,
+                           help="Search small (p, d, q) orders by AIC instead of the fixed ARIMA(30, d, 30)")
+with col3:
+    backtest=st.checkbox("Walk-forward backtest", value=False,
+                         help=f"Also score the model over {N_FOLDS} rolling 30-day origins (slower)")
+backtest_folds = N_FOLDS if backtest else 0
 rmse=0
 
 st.subheader("Predicting the Close Price over the next 30 days for:"+ticker)
 
-close_price=get_data(ticker)
-rolling_price=get_rolling_mean(close_price)
+# Forecasts precomputed by batch_forecast.py (or an earlier live fit) are
+# served straight from the results store, unless a backtest is wanted and
+# the stored one has none
+result = load_forecast(ticker, auto_order)
+if result is not None and backtest and not result.get('backtest'):
+    result = None
+if result is not None:
+    st.caption(f"Precomputed forecast from {result['created_at']:%Y-%m-%d %H:%M} UTC")
 
-differencing_order = get_differencing_order(rolling_price)
-scaled_data, scaler = scaling(rolling_price)
-rmse = evaluate_model(scaled_data, differencing_order)
+# Otherwise forecasts run on the shared background job runner; identical
+# requests from other sessions reuse the same job, and this page polls until
+# it finishes
+if result is None:
+    runner = get_runner()
+    job_key = ('forecast', ticker.upper(), auto_order, backtest_folds, datetime.date.today().isoformat())
+    job_id = runner.lookup(job_key)
+    if job_id is None:
+        job_id = runner.submit(run_forecast, ticker, auto_order, backtest_folds=backtest_folds, key=job_key)
+    status = runner.status(job_id)
 
-st.write("**Model RMSE Score:**", rmse)
+    if status == CANCELLED:
+        st.info("Forecast cancelled.")
+        if st.button("Run forecast again"):
+            runner.submit(run_forecast, ticker, auto_order, backtest_folds=backtest_folds, key=job_key)
+            st.rerun()
+        st.stop()
+
+    # A running fit only stops at the job's next progress report
+    if status == CANCELLING:
+        st.progress(runner.progress(job_id)[0], text="Cancelling once the current step finishes")
+        time.sleep(1)
+        st.rerun()
+
+    if status in (PENDING, RUNNING):
+        fraction, message = runner.progress(job_id)
+        st.progress(fraction, text=message if status == RUNNING else "Waiting for a free worker")
+        if st.button("Cancel forecast"):
+            runner.cancel(job_id)
+            st.rerun()
+        time.sleep(1)
+        st.rerun()
+
+    if status == FAILED:
+        st.error(f"Forecast failed: {runner.error(job_id)}")
+        if st.button("Retry forecast"):
+            runner.submit(run_forecast, ticker, auto_order, backtest_folds=backtest_folds, key=job_key)
+            st.rerun()
+        st.stop()
 
-forecast = get_forecast(scaled_data, differencing_order)
+    result = runner.result(job_id)
+    save_forecast(ticker, auto_order, result)
+
+rmse = result['rmse']
+forecast = result['forecast']
+rolling_price = result['rolling_price']
+
+st.write("**Model RMSE Score:**", rmse)
+st.write("**Model Order (p, d, q):**", str(result['order']))
+if result.get('backtest'):
+    scores = result['backtest']
+    st.write(f"**Walk-forward backtest ({scores['folds']} folds):** RMSE {scores['rmse']:.3f}, MAE {scores['mae']:.3f}")
+if result['order_table'] is not None:
+    with st.expander("Order search results"):
+        st.dataframe(result['order_table'], use_container_width=True)
 
-forecast['Close'] = inverse_scaling(scaler, forecast['Close'])
 st.write('### Forecast Data (Next 30 days)')
 fig_tail = plotly_table(forecast.sort_index(ascending=True).round(3))
 fig_tail.update_layout(height=220)
@@ -48,3 +107,4 @@ forecast = pd.concat([rolling_price, forecast])
 
 st.plotly_chart(Moving_average_forecast(forecast.iloc[100:]), use_container_width=True)
 
+debug_panel(page_span)
@@ -1,5 +1,8 @@
 import plotly.express as px
-import numpy as np
+import pandas as pd
+from pages.utils.risk_engine import simple_returns
+from pages.utils.risk_engine import normalize_prices
+from pages.utils.risk_engine import beta_alpha
 
 #function to plaot interactive chart
 
@@ -10,24 +13,27 @@ def interactive_plot(df):
     fig.update_layout(width=450, margin=dict(l=20, r=20, t=50, b=20), legend=dict(orientation='h', yanchor='top', y=1.02, xanchor='right', x=1))
     return fig
 
+# Rebuild a frame with the 'Date' column followed by the given value matrix
+def _with_date(df, values):
+    result = pd.DataFrame(values, columns=df.columns[1:], index=df.index)
+    result.insert(0, df.columns[0], df[df.columns[0]])
+    return result
+
 # Normalization function to normalize the price of the stocks based on initial price
 def normalize(df_2):
-    df=df_2.copy()
-    for i in df.columns[1:]:
-        df[i]=df[i]/df[i][0]
-    return df
+    return _with_date(df_2, normalize_prices(df_2[df_2.columns[1:]].to_numpy()))
 
 # Functions to create daily returns
 def daily_return(df):
-    df_daily_return=df.copy()
-    for i in df_daily_return.columns[1:]:
-        for j in range(1,len(df)):
-            df_daily_return[i][j]=((df_daily_return[i][j]-df_daily_return[i][j-1])/df_daily_return[i][j-1])*100
-        df_daily_return[i][0]=0
-    return df_daily_return
+    return _with_date(df, simple_returns(df[df.columns[1:]].to_numpy(), percent=True))
 
 # function to calculate beta
 def calulate_beta(stock_daily_return, stock):
-    rm=stock_daily_return['sp500'].mean()*252
-    b,a=np.polyfit(stock_daily_return['sp500'], stock_daily_return[stock],1)
-    return b,a
\ No newline at end of file
+    b,a=beta_alpha(stock_daily_return[stock].to_numpy(), stock_daily_return['sp500'].to_numpy())
+    return float(b[0]),float(a[0])
+
+# Beta and alpha of every stock column against the market column in one pass
+def calculate_betas(stock_daily_return, market='sp500'):
+    stocks=[i for i in stock_daily_return.columns[1:] if i!=market]
+    b,a=beta_alpha(stock_daily_return[stocks].to_numpy(), stock_daily_return[market].to_numpy())
+    return dict(zip(stocks, b.tolist())), dict(zip(stocks, a.tolist()))
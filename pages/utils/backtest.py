@@ -0,0 +1,127 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from pages.utils.tracing import traced
+from pages.utils.lazy import lazy_import
+
+# Walk-forward ARIMA backtests; each worker chunk fits once, then moves
+# forward with results.append(refit=False)
+
+arima_model = lazy_import('statsmodels.tsa.arima.model')
+
+N_FOLDS = 10
+HORIZON = 30
+MIN_TRAIN = 100
+# Folds per worker chunk never drop below this, so most folds are appends
+MIN_CHUNK_FOLDS = 3
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+FOLD_COLUMNS = ['ticker', 'fold', 'origin', 'rmse', 'mae', 'fit_seconds', 'update']
+
+
+class BacktestResult:
+    def __init__(self, folds):
+        self.folds = folds
+
+    @property
+    def summary(self):
+        grouped = self.folds.groupby('ticker', sort=False)
+        return pd.DataFrame({
+            'folds': grouped.size(),
+            'rmse': grouped['rmse'].mean(),
+            'mae': grouped['mae'].mean(),
+            'fit_seconds': grouped['fit_seconds'].sum(),
+        })
+
+    def __repr__(self):
+        return f"BacktestResult(folds={len(self.folds)})"
+
+
+# Forecast origins (train lengths), oldest first, each followed by a full horizon
+def fold_origins(n_obs, n_folds=N_FOLDS, horizon=HORIZON, step=None, min_train=MIN_TRAIN):
+    step = step or horizon
+    origins = [n_obs - horizon - step * i for i in reversed(range(n_folds))]
+    origins = [origin for origin in origins if origin >= min_train]
+    if not origins:
+        raise ValueError(f"Series of {n_obs} bars is too short for a {horizon}-bar backtest")
+    return origins
+
+
+def _run_chunk(data, order, origins, horizon, refit_every, ticker, first_fold):
+    # Import statsmodels before the clock runs, or a fresh worker's first
+    # fold would be timed with the import
+    arima_model.ARIMA
+    rows = []
+    model_fit = None
+    previous = None
+    for i, origin in enumerate(origins):
+        started = time.perf_counter()
+        if model_fit is None:
+            model_fit = arima_model.ARIMA(data[:origin], order=order).fit()
+            update = 'fit'
+        elif refit_every and i % refit_every == 0:
+            model_fit = arima_model.ARIMA(data[:origin], order=order).fit(start_params=model_fit.params)
+            update = 'refit'
+        else:
+            model_fit = model_fit.append(data[previous:origin], refit=False)
+            update = 'append'
+        fit_seconds = time.perf_counter() - started
+        previous = origin
+
+        errors = np.asarray(model_fit.forecast(steps=horizon)) - data[origin:origin + horizon]
+        rows.append((ticker, first_fold + i, origin, float(np.sqrt(np.mean(errors ** 2))),
+                     float(np.mean(np.abs(errors))), round(fit_seconds, 4), update))
+    return rows
+
+
+def _chunks(origins, n_chunks):
+    return [list(chunk) for chunk in np.array_split(origins, n_chunks) if len(chunk)]
+
+
+def _collect(futures):
+    rows = [row for future in futures for row in future.result()]
+    folds = pd.DataFrame(rows, columns=FOLD_COLUMNS)
+    return BacktestResult(folds.sort_values(['ticker', 'origin'], kind='stable').reset_index(drop=True))
+
+
+def _executor(max_workers):
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+# Walk-forward backtest of one series with its folds spread across cores
+@traced('model.backtest')
+def walk_forward(data, order, n_folds=N_FOLDS, horizon=HORIZON, step=None, refit_every=None,
+                 max_workers=MAX_WORKERS, ticker=None):
+    data = np.asarray(data, dtype=np.float64).ravel()
+    origins = fold_origins(len(data), n_folds, horizon, step)
+    chunks = _chunks(origins, max(1, min(max_workers, len(origins) // MIN_CHUNK_FOLDS)))
+    if len(chunks) == 1:
+        # Nothing to parallelize (e.g. already inside a batch worker)
+        folds = pd.DataFrame(_run_chunk(data, order, origins, horizon, refit_every, ticker, 0), columns=FOLD_COLUMNS)
+        return BacktestResult(folds)
+    with _executor(len(chunks)) as pool:
+        futures = []
+        first_fold = 0
+        for chunk in chunks:
+            futures.append(pool.submit(_run_chunk, data, order, chunk, horizon, refit_every, ticker, first_fold))
+            first_fold += len(chunk)
+        return _collect(futures)
+
+
+# Walk-forward backtests of many series; each ticker's folds run in one
+# worker so the append path is used for all but its first fold.
+# order is one (p, d, q) for all tickers or a {ticker: order} dict.
+@traced('model.backtest_many')
+def backtest_many(series_by_ticker, order, n_folds=N_FOLDS, horizon=HORIZON, step=None, refit_every=None,
+                  max_workers=MAX_WORKERS):
+    with _executor(max_workers) as pool:
+        futures = []
+        for ticker, series in series_by_ticker.items():
+            data = np.asarray(series, dtype=np.float64).ravel()
+            ticker_order = order[ticker] if isinstance(order, dict) else order
+            origins = fold_origins(len(data), n_folds, horizon, step)
+            futures.append(pool.submit(_run_chunk, data, ticker_order, origins, horizon, refit_every, ticker, 0))
+        return _collect(futures)
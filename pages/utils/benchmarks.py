@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pages.utils.data_store import STORE_DIR
+from pages.utils.data_store import missing_ranges
+from pages.utils.cache import cached
+from pages.utils.tracing import traced
+from pages.utils.lazy import lazy_import
+from pages.utils.storage import atomic_write
+from pages.utils.storage import keyed_lock
+
+# Benchmark series (FRED ids) kept on disk like the price store; the recent
+# edge is refetched at most every REFRESH_HOURS
+
+web = lazy_import('pandas_datareader.data')
+
+BENCHMARK_DIR = os.path.join(STORE_DIR, 'benchmarks')
+REFRESH_HOURS = float(os.environ.get('TRADEZY_BENCHMARK_REFRESH_HOURS', 6))
+EARLIEST_DATE = pd.Timestamp('1970-01-02')
+METADATA_KEY = b'tradezy_benchmark'
+
+def _normalize_series(series, name):
+    series = pd.Series(series, dtype='float64', name=name)
+    index = pd.DatetimeIndex(series.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    series.index = index.normalize()
+    series.index.name = 'DATE'
+    return series[~series.index.duplicated(keep='last')].sort_index()
+
+
+class BenchmarkProvider:
+    name = 'base'
+
+    # Observations of one series in [start, end); may be empty
+    def fetch(self, series, start, end):
+        raise NotImplementedError
+
+
+class FredProvider(BenchmarkProvider):
+    name = 'fred'
+
+    @traced('fetch.fred')
+    def fetch(self, series, start, end):
+        data = web.DataReader(series, 'fred', start, end - pd.Timedelta(days=1))
+        return _normalize_series(data[series], series)
+
+
+# Reads <directory>/<SERIES>.parquet or <SERIES>.csv (date index + one value column)
+class FileBenchmarkProvider(BenchmarkProvider):
+    name = 'file'
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def fetch(self, series, start, end):
+        base = os.path.join(self.directory, series.upper())
+        if os.path.exists(base + '.parquet'):
+            data = pd.read_parquet(base + '.parquet')
+        elif os.path.exists(base + '.csv'):
+            data = pd.read_csv(base + '.csv', index_col=0, parse_dates=True)
+        else:
+            raise FileNotFoundError(f"No benchmark file for {series} in {self.directory}")
+        data = _normalize_series(data.iloc[:, 0], series)
+        left = data.index.searchsorted(start, side='left')
+        right = data.index.searchsorted(end, side='left')
+        return data.iloc[left:right]
+
+
+# Provider selected with TRADEZY_BENCHMARK_PROVIDER: 'fred' or 'file:<directory>'.
+# Unset, an offline price fixture directory (TRADEZY_PROVIDER=fixture:<dir>)
+# also serves the benchmarks.
+def get_benchmark_provider():
+    setting = os.environ.get('TRADEZY_BENCHMARK_PROVIDER')
+    if setting is None and os.environ.get('TRADEZY_PROVIDER', '').startswith('fixture:'):
+        setting = 'file:' + os.environ['TRADEZY_PROVIDER'].split(':', 1)[1]
+    if setting and setting.startswith('file:'):
+        return FileBenchmarkProvider(setting.split(':', 1)[1])
+    return FredProvider()
+
+
+def _series_path(series):
+    return os.path.join(BENCHMARK_DIR, series.upper().replace('/', '_') + '.parquet')
+
+
+def _read(series):
+    path = _series_path(series)
+    if not os.path.exists(path):
+        return None, None
+    table = pq.read_table(path)
+    meta = json.loads(table.schema.metadata[METADATA_KEY])
+    return table.to_pandas()[series], meta
+
+
+def _write(series, data, meta):
+    path = _series_path(series)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(data.to_frame(), preserve_index=True)
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps(meta)
+    table = table.replace_schema_metadata(metadata)
+    with atomic_write(path) as tmp_path:
+        pq.write_table(table, tmp_path)
+
+
+# Stored series covering [start, end), topped up from the provider
+@traced('data.benchmark')
+def _load(series, start, end, provider):
+    with keyed_lock('benchmarks', series):
+        stored, meta = _read(series)
+        coverage = None
+        if meta is not None:
+            coverage = (pd.Timestamp(meta['start']), pd.Timestamp(meta['end']))
+            # Reopen the recent edge so late publications are picked up
+            if time.time() - meta['fetched_at'] > REFRESH_HOURS * 3600 and not stored.empty:
+                coverage = (coverage[0], min(coverage[1], stored.index[-1] + pd.Timedelta(days=1)))
+
+        gaps = missing_ranges(coverage, start, end)
+        if gaps:
+            provider = provider or get_benchmark_provider()
+            frames = [] if stored is None else [stored]
+            covered_start, covered_end = coverage if coverage else (start, start)
+            for gap_start, gap_end in gaps:
+                frames.append(provider.fetch(series, gap_start, gap_end))
+                covered_start = min(covered_start, gap_start)
+                covered_end = max(covered_end, min(gap_end, pd.Timestamp.today().normalize()))
+            frames = [frame for frame in frames if not frame.empty]
+            stored = pd.concat(frames) if frames else _normalize_series([], series)
+            stored = stored[~stored.index.duplicated(keep='last')].sort_index()
+            _write(series, stored, {'start': covered_start.isoformat(),
+                                    'end': max(covered_start, covered_end).isoformat(),
+                                    'fetched_at': time.time()})
+
+    left = stored.index.searchsorted(start, side='left')
+    right = stored.index.searchsorted(end, side='left')
+    return stored.iloc[left:right]
+
+
+# Benchmark series for [start, end] (end inclusive, as with FRED), as a
+# one-column DataFrame named after the series on a 'DATE' index
+@cached('benchmark')
+def load_benchmark(series='SP500', start=None, end=None, provider=None):
+    start = EARLIEST_DATE if start is None else pd.Timestamp(start).normalize()
+    end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end).normalize()
+    return _load(series, start, end + pd.Timedelta(days=1), provider).to_frame()
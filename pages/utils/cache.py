@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+import threading
+import functools
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# In-process cache shared by all pages and sessions: per-type TTLs, LRU
+# bounded by entries and bytes, hit/miss counters
+
+TTLS = {
+    'fundamentals': 24 * 3600,
+    'prices': 15 * 60,
+    'benchmark': 6 * 3600,
+    'intraday': 2 * 60,
+}
+DEFAULT_TTL = 15 * 60
+MAX_ENTRIES = int(os.environ.get('TRADEZY_CACHE_MAX_ENTRIES', 512))
+MAX_BYTES = int(float(os.environ.get('TRADEZY_CACHE_MAX_MB', 512)) * 1024 * 1024)
+
+
+def ttl_for(kind):
+    return float(os.environ.get(f'TRADEZY_CACHE_TTL_{kind.upper()}', TTLS.get(kind, DEFAULT_TTL)))
+
+
+# Approximate memory held by a cached value
+def sizeof(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum()) if isinstance(value, pd.DataFrame) \
+            else int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+# Callers get their own shallow copy of frames so renaming or adding columns
+# does not leak into the cached value
+def _detach(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_detach(item) for item in value)
+    if isinstance(value, dict):
+        return {k: _detach(v) for k, v in value.items()}
+    return value
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return tuple(sorted(value))
+    return value
+
+
+class _Stats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class TTLCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _kind_stats(self, kind):
+        if kind not in self._stats:
+            self._stats[kind] = _Stats()
+        return self._stats[kind]
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    # (found, value) for a key, counting the hit or miss
+    def get(self, kind, key):
+        with self._lock:
+            stats = self._kind_stats(kind)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.time():
+                self._drop(key)
+                stats.expirations += 1
+                entry = None
+            if entry is None:
+                stats.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            stats.hits += 1
+            return True, entry[0]
+
+    def set(self, kind, key, value, ttl=None):
+        size = sizeof(value)
+        expires = time.time() + (ttl if ttl is not None else ttl_for(kind))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, expires, size)
+            self._bytes += size
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                evicted_key = next(iter(self._entries))
+                self._drop(evicted_key)
+                self._kind_stats(evicted_key[0]).evictions += 1
+
+    # Drop entries of one data type, one cached function, or everything
+    def invalidate(self, kind=None, func=None):
+        name = None if func is None else f"{func.__module__}.{func.__qualname__}"
+        with self._lock:
+            for key in list(self._entries):
+                if (kind is None or key[0] == kind) and (name is None or key[1] == name):
+                    self._drop(key)
+
+    def stats(self):
+        with self._lock:
+            rows = {}
+            for kind, stats in self._stats.items():
+                rows[kind] = {'entries': 0, 'bytes': 0, 'hits': stats.hits, 'misses': stats.misses,
+                              'evictions': stats.evictions, 'expirations': stats.expirations}
+            for key, (_, _, size) in self._entries.items():
+                rows[key[0]]['entries'] += 1
+                rows[key[0]]['bytes'] += size
+        report = pd.DataFrame.from_dict(rows, orient='index',
+                                        columns=['entries', 'bytes', 'hits', 'misses', 'evictions', 'expirations'])
+        # Typed even before the first cached call, when there are no rows yet
+        report = report.astype('int64')
+        lookups = report['hits'] + report['misses']
+        report['hit_rate'] = (report['hits'] / lookups.where(lookups > 0)).round(3)
+        report.index.name = 'kind'
+        return report
+
+    # One row per live entry: data type, function, size and seconds left
+    def entries(self):
+        now = time.time()
+        with self._lock:
+            rows = [(key[0], key[1], size, round(expires - now)) for key, (_, expires, size) in self._entries.items()]
+        return pd.DataFrame(rows, columns=['kind', 'function', 'bytes', 'ttl_left'])
+
+
+_cache = TTLCache()
+
+
+# Decorator caching a function's result under a data type ('fundamentals',
+# 'prices', 'benchmark', 'intraday'). Arguments must be hashable once lists
+# and dicts are turned into tuples. Exceptions are never cached, and neither
+# are results for which skip(result) is true (e.g. partial failures).
+def cached(kind, ttl=None, skip=None):
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (kind, name, _freeze(args), _freeze(kwargs))
+            found, value = _cache.get(kind, key)
+            if not found:
+                value = func(*args, **kwargs)
+                if skip is None or not skip(value):
+                    _cache.set(kind, key, value, ttl)
+            return _detach(value)
+
+        wrapper.invalidate = lambda: _cache.invalidate(func=func)
+        return wrapper
+    return decorator
+
+
+def invalidate(kind=None):
+    _cache.invalidate(kind=kind)
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+def cache_entries():
+    return _cache.entries()
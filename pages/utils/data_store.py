@@ -0,0 +1,259 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+import dateutil.relativedelta
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pages.utils.providers import empty_frame
+from pages.utils.fetcher import fetch_many
+from pages.utils.providers import get_provider
+from pages.utils.cache import cached
+from pages.utils.tracing import traced
+from pages.utils.storage import atomic_write
+from pages.utils.storage import keyed_lock
+
+# Parquet store of daily OHLCV bars, one file per ticker; its coverage
+# metadata means only missing edges are downloaded
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STORE_DIR = os.environ.get('TRADEZY_STORE_DIR', os.path.join(ROOT_DIR, '.tradezy_store'))
+
+EARLIEST_DATE = pd.Timestamp('1970-01-02')
+METADATA_KEY = b'tradezy_coverage'
+READ_WORKERS = 8
+# Relative change in a stored close that counts as a new adjustment basis
+REBASE_TOLERANCE = 1e-5
+
+PERIOD_OFFSETS = {
+    '5d': dateutil.relativedelta.relativedelta(days=5),
+    '1mo': dateutil.relativedelta.relativedelta(months=1),
+    '6mo': dateutil.relativedelta.relativedelta(months=6),
+    '1y': dateutil.relativedelta.relativedelta(years=1),
+    '5y': dateutil.relativedelta.relativedelta(years=5),
+}
+
+
+def _ticker_path(ticker):
+    file_name = ticker.upper().replace('/', '_') + '.parquet'
+    return os.path.join(STORE_DIR, 'prices', file_name)
+
+
+def _to_timestamp(value, default):
+    if value is None:
+        return default
+    return pd.Timestamp(value).normalize()
+
+
+def _today():
+    return pd.Timestamp.today().normalize()
+
+
+def _read(ticker):
+    path = _ticker_path(ticker)
+    if not os.path.exists(path):
+        return None, None
+    table = pq.read_table(path)
+    meta = json.loads(table.schema.metadata[METADATA_KEY])
+    coverage = (pd.Timestamp(meta['start']), pd.Timestamp(meta['end']))
+    return table.to_pandas(), coverage
+
+
+def _write(ticker, df, coverage):
+    path = _ticker_path(ticker)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    meta = dict(table.schema.metadata or {})
+    meta[METADATA_KEY] = json.dumps({'start': coverage[0].isoformat(), 'end': coverage[1].isoformat()})
+    table = table.replace_schema_metadata(meta)
+    with atomic_write(path) as tmp_path:
+        pq.write_table(table, tmp_path)
+
+
+# Date ranges (end exclusive) that have to be downloaded so that the stored
+# coverage spans [start, end). Ranges always touch the existing coverage so
+# that it stays one contiguous block.
+def missing_ranges(coverage, start, end):
+    if coverage is None:
+        return [(start, end)] if start < end else []
+    covered_start, covered_end = coverage
+    ranges = []
+    if start < covered_start:
+        ranges.append((start, covered_start))
+    if end > covered_end:
+        ranges.append((covered_end, end))
+    return ranges
+
+
+def _has_trading_days(start, end):
+    return len(pd.bdate_range(start, end - pd.Timedelta(days=1))) > 0
+
+
+# Last settled stored bar (today's bar is still moving). Top-ups refetch it
+# so a split or dividend that re-adjusted the history shows up as a changed bar.
+def _overlap_date(stored, coverage):
+    if stored is None or coverage is None:
+        return None
+    settled = stored.index[stored.index < coverage[1]]
+    return settled[-1] if len(settled) else None
+
+
+# True when fetched bars disagree with the settled stored bars they overlap
+def _rebased(stored, coverage, fetched):
+    if stored is None or coverage is None:
+        return False
+    for _, _, frame in fetched:
+        if frame is None or frame.empty:
+            continue
+        common = stored.index.intersection(frame.index)
+        common = common[common < coverage[1]]
+        if len(common) and not np.allclose(frame.loc[common, 'Close'], stored.loc[common, 'Close'],
+                                           rtol=REBASE_TOLERANCE, atol=0):
+            return True
+    return False
+
+
+def _slice(df, start, end):
+    left = df.index.searchsorted(start, side='left')
+    right = df.index.searchsorted(end, side='left')
+    return df.iloc[left:right]
+
+
+# Merge fetched gap frames into the stored frame and extend its coverage
+def _update(ticker, stored, coverage, fetched):
+    frames = [] if stored is None else [stored]
+    covered_start, covered_end = coverage if coverage else (None, None)
+    for gap_start, gap_end, frame in fetched:
+        if frame is None:
+            # Failed or not yet published; leave the gap to be retried
+            continue
+        frames.append(frame)
+        # Today's bar is still moving, so it is never marked as covered
+        gap_end = min(gap_end, _today())
+        covered_start = gap_start if covered_start is None else min(covered_start, gap_start)
+        covered_end = gap_end if covered_end is None else max(covered_end, gap_end)
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return empty_frame()
+    merged = pd.concat(frames) if len(frames) > 1 else frames[0]
+    merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+    # Only new bars are worth rewriting the file for; a gap that came back
+    # empty is simply fetched again next time
+    if len(merged) > (0 if stored is None else len(stored)):
+        _write(ticker, merged, (covered_start, max(covered_start, covered_end)))
+    return merged
+
+
+# Daily OHLCV bars for [start, end) for several tickers, served from disk and
+# topped up from the network only for the dates that have not been fetched
+# before. Tickers sharing the same missing range are fetched as one batch.
+# Returns ({ticker: frame}, {ticker: error}) so pages can report partial failures.
+@traced('data.load')
+def _load_many(tickers, start=None, end=None, provider=None):
+    tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+    start = _to_timestamp(start, EARLIEST_DATE)
+    end = _to_timestamp(end, _today() + pd.Timedelta(days=1))
+
+    locks = [keyed_lock('prices', ticker) for ticker in sorted(tickers)]
+    for lock in locks:
+        lock.acquire()
+    try:
+        state = {ticker: _read(ticker) for ticker in tickers}
+        requests = {}
+        for ticker, (stored, coverage) in state.items():
+            overlap = _overlap_date(stored, coverage)
+            for gap_start, gap_end in missing_ranges(coverage, start, end):
+                if overlap is not None and gap_start == coverage[1] and _has_trading_days(gap_start, gap_end):
+                    gap_start = overlap
+                requests.setdefault((gap_start, gap_end), []).append(ticker)
+
+        fetched = {}
+        failures = {}
+        for (gap_start, gap_end), group in requests.items():
+            if not _has_trading_days(gap_start, gap_end):
+                continue
+            result = fetch_many(group, gap_start, gap_end, provider=provider)
+            for ticker in group:
+                fetched.setdefault(ticker, []).append((gap_start, gap_end, result.frames.get(ticker)))
+            failures.update(result.failures)
+
+        # History re-adjusted since it was stored: the whole file is fetched
+        # again on the new basis and replaces the old one with its coverage
+        rebased = {}
+        for ticker in fetched:
+            stored, coverage = state[ticker]
+            if _rebased(stored, coverage, fetched[ticker]):
+                full = (min(start, coverage[0]), max(end, coverage[1]))
+                rebased.setdefault(full, []).append(ticker)
+        for (full_start, full_end), group in rebased.items():
+            result = fetch_many(group, full_start, full_end, provider=provider)
+            for ticker in group:
+                frame = result.frames.get(ticker)
+                if frame is None:
+                    # Keep serving the old file rather than mixing two bases
+                    del fetched[ticker]
+                    continue
+                state[ticker] = (None, None)
+                fetched[ticker] = [(full_start, full_end, frame)]
+            failures.update(result.failures)
+
+        frames = {}
+        for ticker, (stored, coverage) in state.items():
+            if ticker in fetched:
+                stored = _update(ticker, stored, coverage, fetched[ticker])
+            elif stored is None:
+                stored = empty_frame()
+            frames[ticker] = _slice(stored, start, end)
+    finally:
+        for lock in locks:
+            lock.release()
+    # Only report tickers that came back with nothing at all
+    failures = {ticker: error for ticker, error in failures.items() if frames[ticker].empty}
+    return frames, failures
+
+
+@cached('prices', skip=lambda result: bool(result[1]))
+def load_many(tickers, start=None, end=None, provider=None):
+    return _load_many(tickers, start, end, provider)
+
+
+# Daily OHLCV bars for one ticker in [start, end), see load_many
+@cached('prices', skip=lambda result: result.empty)
+def load_prices(ticker, start=None, end=None):
+    frames, _ = _load_many([ticker], start, end)
+    return frames[ticker.upper()]
+
+
+# Tickers that have a price file in the store
+def stored_tickers():
+    directory = os.path.join(STORE_DIR, 'prices')
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name[:-len('.parquet')] for name in os.listdir(directory) if name.endswith('.parquet'))
+
+
+# Stored closes aligned to index as a (len(index), len(tickers)) matrix, NaN
+# where a ticker has no bar. Reads only the Close column and never fetches.
+@traced('data.read_closes')
+def read_closes(tickers, index):
+    matrix = np.full((len(index), len(tickers)), np.nan)
+
+    def read(j):
+        path = _ticker_path(tickers[j])
+        if os.path.exists(path):
+            close = pq.read_pandas(path, columns=['Close']).to_pandas()['Close']
+            matrix[:, j] = close.reindex(index).to_numpy()
+
+    # Parquet decoding releases the GIL, so files are read on threads
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        list(pool.map(read, range(len(tickers))))
+    return matrix
+
+
+# Company profile and fundamentals (yfinance .info layout)
+@cached('fundamentals')
+def load_info(ticker):
+    return get_provider().fetch_info(ticker.upper())
+
@@ -0,0 +1,34 @@
+import uuid
+import streamlit as st
+from pages.utils import tracing
+
+# Sidebar panel with the spans of the current page run; the toggle only
+# traces this session (TRADEZY_TRACE=1 traces every session)
+
+
+def start_page(name):
+    session = st.session_state.setdefault('_trace_session', uuid.uuid4().hex)
+    tracing.set_session(session, st.session_state.get('_trace_enabled', False))
+    st.session_state['_trace_since'] = tracing.current_sequence()
+    return tracing.begin(f'page.{name}', root=True)
+
+
+def debug_panel(page_span):
+    page_span.end()
+    with st.sidebar:
+        enabled = st.toggle("Trace timings", value=tracing.ENABLED or st.session_state.get('_trace_enabled', False),
+                            disabled=tracing.ENABLED)
+        if enabled != st.session_state.get('_trace_enabled', False) and not tracing.ENABLED:
+            st.session_state['_trace_enabled'] = enabled
+            st.rerun()
+        if not enabled:
+            return
+        since = st.session_state.get('_trace_since', 0)
+        session = st.session_state.get('_trace_session')
+        spans = tracing.span_table(since, session)
+        st.markdown("**Spans in this run**")
+        st.dataframe(spans[[c for c in ('name', 'parent', 'ms') if c in spans.columns]], use_container_width=True)
+        st.markdown("**Totals since start, all sessions**")
+        st.dataframe(tracing.summary_table().round(4), use_container_width=True)
+        st.download_button("Spans (JSON lines)", tracing.jsonl_text(since, session), file_name='spans.jsonl')
+        st.download_button("Metrics (Prometheus)", tracing.prometheus_text(), file_name='metrics.prom')
@@ -0,0 +1,86 @@
+import os
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from pages.utils.tracing import traced
+
+# Chart downsampling to the pixel width: LTTB for lines, OHLC buckets for
+# candles
+
+CHART_WIDTH_PX = int(os.environ.get('TRADEZY_CHART_WIDTH_PX', 1400))
+POINTS_PER_PX = 2
+WEBGL_THRESHOLD = int(os.environ.get('TRADEZY_WEBGL_THRESHOLD', 1000))
+
+
+def target_points(width_px=None):
+    return (width_px or CHART_WIDTH_PX) * POINTS_PER_PX
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').view('int64').astype(np.float64)
+    return x.astype(np.float64)
+
+
+# Indices of the n_out points LTTB keeps (first and last are always kept)
+@traced('figure.lttb')
+def lttb(x, y, n_out):
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+# (x, y) of a line trace reduced to at most n_out points; missing values
+# (e.g. indicator warm-up) are dropped before the reduction
+def downsample_line(x, y, n_out=None):
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n_out = n_out or target_points()
+    if len(y) <= n_out:
+        return x, y
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    selected = lttb(x, y, n_out)
+    return x[selected], y[selected]
+
+
+# Candles aggregated into at most n_out buckets of consecutive bars: first
+# open, highest high, lowest low, last close, indexed by the first date
+@traced('figure.ohlc_buckets')
+def ohlc_buckets(dataframe, n_out=None):
+    n_out = n_out or target_points() // 4
+    n = len(dataframe)
+    if n <= n_out:
+        return dataframe
+    starts = np.linspace(0, n, n_out, endpoint=False).astype(np.int64)
+    ends = np.append(starts[1:], n) - 1
+    return pd.DataFrame({
+        'Open': dataframe['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(dataframe['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(dataframe['Low'].to_numpy(), starts),
+        'Close': dataframe['Close'].to_numpy()[ends],
+    }, index=dataframe.index[starts])
+
+
+# go.Scattergl for traces with many points, go.Scatter otherwise
+def scatter_class(n_points):
+    return go.Scattergl if n_points > WEBGL_THRESHOLD else go.Scatter
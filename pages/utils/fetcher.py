@@ -0,0 +1,61 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pages.utils.providers import get_provider
+from pages.utils.tracing import traced
+
+# Multi-ticker fetch: one batched request, then per-ticker retries on a
+# thread pool; failures are reported, not raised
+
+MAX_WORKERS = 8
+RETRIES = 2
+RETRY_DELAY = 0.5
+
+
+class FetchResult:
+    def __init__(self, frames, failures):
+        self.frames = frames
+        self.failures = failures
+
+    def __repr__(self):
+        return f"FetchResult(frames={sorted(self.frames)}, failures={sorted(self.failures)})"
+
+
+def _fetch_with_retry(provider, ticker, start, end, retries):
+    for attempt in range(retries + 1):
+        try:
+            return provider.fetch(ticker, start, end)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(RETRY_DELAY * 2 ** attempt)
+
+
+@traced('fetch.many')
+def fetch_many(tickers, start, end, provider=None, max_workers=MAX_WORKERS, retries=RETRIES):
+    provider = provider or get_provider()
+    tickers = list(dict.fromkeys(tickers))
+    frames = {}
+    failures = {}
+    if not tickers:
+        return FetchResult(frames, failures)
+
+    if len(tickers) > 1:
+        try:
+            frames.update(provider.fetch_batch(tickers, start, end))
+        except Exception:
+            pass
+
+    remaining = [ticker for ticker in tickers if ticker not in frames]
+    if remaining:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(remaining))) as pool:
+            futures = {
+                pool.submit(_fetch_with_retry, provider, ticker, start, end, retries): ticker
+                for ticker in remaining
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    frames[ticker] = future.result()
+                except Exception as e:
+                    failures[ticker] = str(e)
+    return FetchResult(frames, failures)
@@ -0,0 +1,119 @@
+import copy
+import numpy as np
+import plotly.io as pio
+import plotly.graph_objects as go
+from pages.utils.downsample import scatter_class
+
+# Chart skeletons on the 'tradezy' template: traces and layout are built
+# once, each figure only swaps in data (dates as epoch ms)
+
+TEMPLATE = 'tradezy'
+
+_template = go.layout.Template(pio.templates['plotly'])
+_template.layout.update(
+    plot_bgcolor='black',
+    paper_bgcolor='#e1efff',
+    xaxis=dict(showgrid=True, gridcolor='lightgray', tickfont=dict(color='black')),
+    yaxis=dict(showgrid=True, gridcolor='lightgray', tickfont=dict(color='black')),
+)
+pio.templates[TEMPLATE] = _template
+
+_LEGEND = dict(orientation='h', yanchor='top', y=1.02, xanchor='right', x=1, font=dict(color='black'))
+_WIDE = dict(height=500, margin=dict(l=0, r=20, t=20, b=0))
+_SHORT = dict(height=200, margin=dict(l=0, r=0, t=0, b=0))
+
+
+def _line(name, color, dash=None):
+    return go.Scatter(mode='lines', name=name, line=dict(width=2, color=color, dash=dash))
+
+
+def _threshold(name, level, color):
+    return dict(type='line', xref='paper', x0=0, x1=1, y0=level, y1=level, name=name, showlegend=True,
+                line=dict(width=2, color=color, dash='dash'))
+
+
+def epoch_ms(index):
+    return np.asarray(index, dtype='datetime64[ms]').astype(np.int64).astype(np.float64)
+
+
+def _merge(trace, update):
+    merged = dict(trace)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(trace.get(key), dict):
+            value = dict(trace[key], **value)
+        merged[key] = value
+    return merged
+
+
+class Skeleton:
+    def __init__(self, traces, **layout):
+        spec = go.Figure(data=traces, layout=dict(template=TEMPLATE, **layout)).to_plotly_json()
+        self.traces = spec['data']
+        self.layout = spec['layout']
+
+    # One dict of data properties per trace, in skeleton order; a 'type' entry
+    # switches that trace's class (e.g. to scattergl for long series), nested
+    # dicts such as marker are merged into the skeleton's. extra traces (see
+    # overlay_traces) are drawn after the skeleton's own.
+    def build(self, *values, extra=()):
+        data = [_merge(trace, update) for trace, update in zip(self.traces, values)] + list(extra)
+        return go.Figure(dict(data=data, layout=copy.deepcopy(self.layout)))
+
+
+SKELETONS = {
+    'price': Skeleton(
+        [_line('Open', '#5ab7ff'), _line('Close', 'black'), _line('High', '#0078ff'), _line('Low', 'red')],
+        legend=dict(_LEGEND, font=dict(size=14, color='black')),
+        xaxis=dict(type='date', rangeslider=dict(visible=True)), **_WIDE),
+    'candlestick': Skeleton(
+        [go.Candlestick(showlegend=False)], legend=_LEGEND, xaxis=dict(type='date'), **_WIDE),
+    'rsi': Skeleton(
+        [_line('RSI', 'orange')],
+        shapes=[_threshold('Overbought', 70, 'red'), _threshold('Oversold', 30, '#79da84')],
+        yaxis=dict(range=[0, 100]), legend=_LEGEND, xaxis=dict(type='date'), **_SHORT),
+    'moving_average': Skeleton(
+        [_line('Open', '#5ab7ff'), _line('Close', 'black'), _line('High', '#0078ff'), _line('Low', 'red'),
+         _line('SMA 50', 'purple')],
+        legend=_LEGEND, xaxis=dict(type='date', rangeslider=dict(visible=True)), **_WIDE),
+    'macd': Skeleton(
+        [_line('MACD', 'orange'), _line('Signal', 'red', dash='dash'),
+         go.Bar(name='Histogram', marker=dict(colorscale=[[0, 'red'], [1, 'green']], cmin=0, cmax=1))],
+        legend=_LEGEND, xaxis=dict(type='date'), **_SHORT),
+    'atr': Skeleton(
+        [_line('ATR', '#5ab7ff')], legend=_LEGEND, xaxis=dict(type='date'), **_SHORT),
+    'forecast': Skeleton(
+        [_line('Close Price', 'black'), _line('Future Close Price', 'red')],
+        xaxis=dict(type='date', title=dict(text="Date", font=dict(color='black')), gridcolor='white',
+                   showline=True, ticks='outside', linecolor='black', rangeslider=dict(visible=True)),
+        yaxis=dict(title=dict(text="Close Price", font=dict(color='black')), gridcolor='white',
+                   showline=True, ticks='outside', linecolor='black'),
+        legend=dict(yanchor='top', xanchor='right', font=dict(color='black')), **_WIDE),
+}
+
+
+# Data for a line trace: dates as epoch ms, WebGL once the series is long
+def line_values(x, y):
+    values = {'x': epoch_ms(x), 'y': np.asarray(y, dtype=np.float64)}
+    if scatter_class(len(values['x'])) is go.Scattergl:
+        values['type'] = 'scattergl'
+    return values
+
+
+OVERLAY_COLORS = ['#ffd700', '#ff7f0e', '#17becf', '#e377c2', '#bcbd22', '#9467bd', '#8c564b']
+
+
+# Indicator overlay lines for a price chart from {column: line_values(...)};
+# the upper and lower Bollinger bands take the colour of their middle line
+def overlay_traces(columns):
+    traces, colors = [], {}
+    for name, values in columns.items():
+        group = 'BB_' + name.split('_')[2] if name.startswith('BB_') else name
+        color = colors.setdefault(group, OVERLAY_COLORS[len(colors) % len(OVERLAY_COLORS)])
+        dash = 'dot' if name.startswith(('BB_UPPER', 'BB_LOWER')) else None
+        traces.append(dict({'type': 'scatter', 'mode': 'lines', 'name': name.replace('_', ' '),
+                            'line': {'width': 1.5, 'color': color, 'dash': dash}}, **values))
+    return traces
+
+
+def build_figure(kind, *values, extra=()):
+    return SKELETONS[kind].build(*values, extra=extra)
@@ -0,0 +1,131 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from pages.utils.indicators import batch_indicators
+from pages.utils.indicators import sync_indicators
+from pages.utils.indicators import compute_indicators
+from pages.utils.model_cache import fingerprint
+from pages.utils.tracing import traced
+
+# Process-wide LRU of computed indicators as read-only arrays, keyed by
+# (ticker, data version, spec)
+
+MAX_BYTES = int(float(os.environ.get('TRADEZY_INDICATOR_CACHE_MB', 128)) * 1024 * 1024)
+
+
+# Indicator columns as read-only arrays aligned to a sorted DatetimeIndex
+class IndicatorResult:
+    def __init__(self, index, columns):
+        self.index = index
+        self.columns = columns
+        self.nbytes = index.nbytes + sum(values.nbytes for values in columns.values())
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    # Zero-copy views of every column for a contiguous run of dates taken
+    # from the same history (e.g. a filtered chart window)
+    def window(self, dates):
+        dates = np.asarray(dates)
+        if len(dates) == 0:
+            return {name: values[:0] for name, values in self.columns.items()}
+        left = self.index.searchsorted(dates[0], side='left')
+        right = self.index.searchsorted(dates[-1], side='right')
+        return {name: values[left:right] for name, values in self.columns.items()}
+
+
+def _freeze(values):
+    values = np.array(values, dtype=np.float64)
+    values.flags.writeable = False
+    return values
+
+
+# Identity of a price series: its span plus content hashes of the dates and
+# closes, so two series never share a key unless they are identical
+def data_version(close):
+    if len(close) == 0:
+        return (0,)
+    return (len(close), close.index[0].value, close.index[-1].value,
+            fingerprint(close.index.asi8), fingerprint(close.to_numpy()))
+
+
+class IndicatorCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        result = compute()
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = result
+                self._bytes += result.nbytes
+                while self._bytes > self.max_bytes and len(self._entries) > 1:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+                    self.evictions += 1
+            return self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
+
+
+_cache = IndicatorCache()
+
+
+# Indicator for a close series. With a ticker the values come from the
+# persisted incremental engine; without one they are computed in batch.
+@traced('indicators.get')
+def get_indicator(ticker, close, spec, cache=None):
+    cache = cache or _cache
+    spec = tuple(spec)
+    key = (ticker.upper() if ticker else None, data_version(close), spec)
+
+    def compute():
+        if ticker:
+            frame = sync_indicators(ticker, close, (spec,))
+        else:
+            frame = batch_indicators(close, (spec,))
+        frame = frame.reindex(close.index)
+        return IndicatorResult(close.index, {name: _freeze(frame[name].to_numpy()) for name in frame.columns})
+
+    return cache.get(key, compute)
+
+
+# Several indicators of a price frame (Close, plus High/Low for ATR) as one
+# aligned block, computed together so they share intermediates. The block
+# is memoized per data version like single indicators.
+@traced('indicators.get_many')
+def get_indicators(ticker, prices, specs, cache=None):
+    cache = cache or _cache
+    specs = tuple(tuple(spec) for spec in specs)
+    key = (ticker.upper() if ticker else None, data_version(prices['Close']), specs)
+
+    def compute():
+        frame = compute_indicators(prices, specs)
+        return IndicatorResult(prices.index, {name: _freeze(frame[name].to_numpy()) for name in frame.columns})
+
+    return cache.get(key, compute)
+
+
+def indicator_cache_stats():
+    return _cache.stats()
@@ -0,0 +1,439 @@
+import os
+import json
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pages.utils.data_store import STORE_DIR
+from pages.utils.tracing import traced
+from pages.utils.storage import atomic_write
+from pages.utils.storage import keyed_lock
+
+# RSI, SMA, EMA, MACD, Bollinger and ATR: batch (matching `ta`), one-pass
+# sets, and O(1) streaming states persisted per ticker
+
+INDICATOR_DIR = os.path.join(STORE_DIR, 'indicators')
+METADATA_KEY = b'tradezy_indicator_state'
+
+DEFAULT_SPECS = (('rsi', 14), ('sma', 50), ('macd', 12, 26, 9))
+
+
+# ---------- Batch mode (identical to ta) ----------
+
+def ema(close, window):
+    return close.ewm(span=window, min_periods=window, adjust=False).mean()
+
+
+def sma(close, window):
+    return close.rolling(window, min_periods=window).mean()
+
+
+def rsi(close, window=14):
+    diff = close.diff(1)
+    up_direction = diff.where(diff > 0, 0.0)
+    down_direction = -diff.where(diff < 0, 0.0)
+    emaup = up_direction.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    emadn = down_direction.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    relative_strength = emaup / emadn
+    return pd.Series(np.where(emadn == 0, 100, 100 - (100 / (1 + relative_strength))), index=close.index)
+
+
+def macd(close, window_fast=12, window_slow=26, window_sign=9):
+    line = ema(close, window_fast) - ema(close, window_slow)
+    signal = ema(line, window_sign)
+    return pd.DataFrame({'MACD': line, 'MACD Signal': signal, 'MACD Hist': line - signal}, index=close.index)
+
+
+def bollinger(close, window=20, window_dev=2):
+    columns = compute_indicators(close, (('bbands', window, window_dev),))
+    return columns.rename(columns=dict(zip(columns.columns, ['Mid', 'Upper', 'Lower'])))
+
+
+# Wilder ATR as in ta, except that the warm-up bars are NaN instead of 0
+def atr(high, low, close, window=14):
+    frame = pd.DataFrame({'High': high, 'Low': low, 'Close': close})
+    return compute_indicators(frame, (('atr', window),))[f'ATR_{window}']
+
+
+# ---------- One-pass pipeline ----------
+
+# Intermediate series for one price frame, each computed on first request
+# and reused by every spec that needs it
+class _Intermediates:
+    def __init__(self, close, high=None, low=None):
+        self.close = close
+        self.high = high
+        self.low = low
+        self._memo = {}
+
+    def _get(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def ema(self, span):
+        return self._get(('ema', span), lambda: ema(self.close, span))
+
+    def mean(self, window):
+        return self._get(('mean', window), lambda: sma(self.close, window))
+
+    # Population standard deviation, like ta's Bollinger Bands
+    def std(self, window):
+        return self._get(('std', window), lambda: self.close.rolling(window, min_periods=window).std(ddof=0))
+
+    def moves(self):
+        def compute():
+            diff = self.close.diff(1)
+            return diff.where(diff > 0, 0.0), -diff.where(diff < 0, 0.0)
+        return self._get(('moves',), compute)
+
+    def wilder(self, series_name, series, window):
+        return self._get(('wilder', series_name, window),
+                         lambda: series.ewm(alpha=1 / window, min_periods=window, adjust=False).mean())
+
+    def true_range(self):
+        def compute():
+            if self.high is None or self.low is None:
+                raise ValueError("ATR needs High and Low columns")
+            high, low = self.high.to_numpy(np.float64), self.low.to_numpy(np.float64)
+            prev_close = self.close.shift(1).to_numpy(np.float64)
+            # fmax skips the missing previous close of the first bar
+            values = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+            return pd.Series(values, index=self.close.index)
+        return self._get(('true_range',), compute)
+
+
+def _rsi_from(parts, window):
+    up, down = parts.moves()
+    emaup = parts.wilder('up', up, window)
+    emadn = parts.wilder('down', down, window)
+    return pd.Series(np.where(emadn == 0, 100, 100 - (100 / (1 + emaup / emadn))), index=parts.close.index)
+
+
+# Wilder smoothing seeded with the mean of the first window bars
+def _atr_from(parts, window):
+    true_range = parts.true_range()
+    result = pd.Series(np.nan, index=true_range.index)
+    if len(true_range) >= window:
+        seeded = true_range.iloc[window - 1:].copy()
+        seeded.iloc[0] = true_range.iloc[:window].mean()
+        result.iloc[window - 1:] = seeded.ewm(alpha=1 / window, adjust=False).mean().to_numpy()
+    return result
+
+
+def _spec_values(parts, spec):
+    kind = spec[0]
+    if kind == 'rsi':
+        return [_rsi_from(parts, spec[1])]
+    if kind == 'sma':
+        return [parts.mean(spec[1])]
+    if kind == 'ema':
+        return [parts.ema(spec[1])]
+    if kind == 'macd':
+        window_fast, window_slow, window_sign = spec[1:]
+        line = parts.ema(window_fast) - parts.ema(window_slow)
+        signal = ema(line, window_sign)
+        return [line, signal, line - signal]
+    if kind == 'bbands':
+        window, window_dev = spec[1:]
+        mid, std = parts.mean(window), parts.std(window)
+        return [mid, mid + window_dev * std, mid - window_dev * std]
+    if kind == 'atr':
+        return [_atr_from(parts, spec[1])]
+    raise ValueError(f"Unknown indicator: {kind}")
+
+
+# Every indicator of specs as one frame aligned to prices, which is a close
+# Series or a frame with a Close column (and High/Low for ATR)
+@traced('indicators.pipeline')
+def compute_indicators(prices, specs=DEFAULT_SPECS):
+    if isinstance(prices, pd.DataFrame):
+        parts = _Intermediates(prices['Close'].astype('float64'), prices.get('High'), prices.get('Low'))
+    else:
+        parts = _Intermediates(prices.astype('float64'))
+    columns = {}
+    for spec in specs:
+        columns.update(zip(spec_columns(spec), _spec_values(parts, tuple(spec))))
+    return pd.DataFrame(columns, index=parts.close.index)
+
+
+# ---------- Streaming states ----------
+
+# Exponentially weighted mean with pandas' adjust=False recursion, including
+# its handling of missing values, so streamed values match ewm().mean()
+class EMAState:
+    def __init__(self, com, min_periods, weighted=math.nan, old_wt=1.0, nobs=0):
+        self.com = com
+        self.min_periods = min_periods
+        self.weighted = weighted
+        self.old_wt = old_wt
+        self.nobs = nobs
+
+    @classmethod
+    def from_span(cls, span):
+        return cls((span - 1) / 2.0, span)
+
+    @classmethod
+    def from_alpha(cls, alpha, min_periods):
+        return cls(1.0 / alpha - 1.0, min_periods)
+
+    def update(self, value):
+        alpha = 1.0 / (1.0 + self.com)
+        observed = value == value
+        self.nobs += observed
+        if self.weighted == self.weighted:
+            self.old_wt *= 1.0 - alpha
+            if observed:
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + alpha * value) / (self.old_wt + alpha)
+                self.old_wt = 1.0
+        elif observed:
+            self.weighted = value
+        return self.value
+
+    @property
+    def value(self):
+        return self.weighted if self.nobs >= max(self.min_periods, 1) else math.nan
+
+    def to_dict(self):
+        return {'com': self.com, 'min_periods': self.min_periods, 'weighted': self.weighted,
+                'old_wt': self.old_wt, 'nobs': self.nobs}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+# Rolling mean over a fixed window using a compensated running sum; missing
+# values are counted rather than summed, like pandas' rolling().mean()
+class SMAState:
+    def __init__(self, window, values=(), total=0.0, compensation=0.0, nan_count=0):
+        self.window = window
+        self.values = deque(values, maxlen=window)
+        self.total = total
+        self.compensation = compensation
+        self.nan_count = nan_count
+
+    def _add(self, value, sign):
+        if value != value:
+            self.nan_count += sign
+            return
+        y = sign * value - self.compensation
+        t = self.total + y
+        self.compensation = (t - self.total) - y
+        self.total = t
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            self._add(self.values[0], -1)
+        self.values.append(value)
+        self._add(value, 1)
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.values) < self.window or self.nan_count:
+            return math.nan
+        return self.total / self.window
+
+    def to_dict(self):
+        return {'window': self.window, 'values': list(self.values), 'total': self.total,
+                'compensation': self.compensation, 'nan_count': self.nan_count}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+# Wilder RSI: smoothed up and down moves with alpha = 1 / window
+class RSIState:
+    def __init__(self, window, prev_close=math.nan, up=None, down=None):
+        self.window = window
+        self.prev_close = prev_close
+        self.up = up or EMAState.from_alpha(1 / window, window)
+        self.down = down or EMAState.from_alpha(1 / window, window)
+
+    def update(self, close):
+        diff = close - self.prev_close
+        self.prev_close = close
+        self.up.update(diff if diff > 0 else 0.0)
+        self.down.update(-diff if diff < 0 else -0.0)
+        return self.value
+
+    @property
+    def value(self):
+        emaup, emadn = self.up.value, self.down.value
+        if emadn == 0:
+            return 100.0
+        return 100 - (100 / (1 + emaup / emadn))
+
+    def to_dict(self):
+        return {'window': self.window, 'prev_close': self.prev_close,
+                'up': self.up.to_dict(), 'down': self.down.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['window'], state['prev_close'],
+                   EMAState.from_dict(state['up']), EMAState.from_dict(state['down']))
+
+
+class MACDState:
+    def __init__(self, window_fast=12, window_slow=26, window_sign=9, fast=None, slow=None, signal=None):
+        self.windows = (window_fast, window_slow, window_sign)
+        self.fast = fast or EMAState.from_span(window_fast)
+        self.slow = slow or EMAState.from_span(window_slow)
+        self.signal = signal or EMAState.from_span(window_sign)
+
+    def update(self, close):
+        line = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(line)
+        return line, signal, line - signal
+
+    def to_dict(self):
+        return {'windows': list(self.windows), 'fast': self.fast.to_dict(),
+                'slow': self.slow.to_dict(), 'signal': self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(*state['windows'], EMAState.from_dict(state['fast']),
+                   EMAState.from_dict(state['slow']), EMAState.from_dict(state['signal']))
+
+
+# ---------- Indicator specs ----------
+
+def spec_columns(spec):
+    kind = spec[0]
+    if kind == 'rsi':
+        return ['RSI'] if spec[1] == 14 else [f'RSI_{spec[1]}']
+    if kind == 'sma':
+        return [f'SMA_{spec[1]}']
+    if kind == 'ema':
+        return [f'EMA_{spec[1]}']
+    if kind == 'macd':
+        return ['MACD', 'MACD Signal', 'MACD Hist']
+    if kind == 'bbands':
+        suffix = f'{spec[1]}' if spec[2] == 2 else f'{spec[1]}_{spec[2]}'
+        return [f'BB_MID_{spec[1]}', f'BB_UPPER_{suffix}', f'BB_LOWER_{suffix}']
+    if kind == 'atr':
+        return [f'ATR_{spec[1]}']
+    raise ValueError(f"Unknown indicator: {kind}")
+
+
+def _new_state(spec):
+    kind = spec[0]
+    if kind == 'rsi':
+        return RSIState(spec[1])
+    if kind == 'sma':
+        return SMAState(spec[1])
+    if kind == 'ema':
+        return EMAState.from_span(spec[1])
+    if kind == 'macd':
+        return MACDState(*spec[1:])
+    raise ValueError(f"No streaming state for indicator: {kind}")
+
+
+def _state_from_dict(spec, state):
+    kind = spec[0]
+    if kind == 'rsi':
+        return RSIState.from_dict(state)
+    if kind == 'sma':
+        return SMAState.from_dict(state)
+    if kind == 'ema':
+        return EMAState.from_dict(state)
+    return MACDState.from_dict(state)
+
+
+def _update_state(state, close):
+    value = state.update(close)
+    return value if isinstance(value, tuple) else (value,)
+
+
+@traced('indicators.batch')
+def batch_indicators(close, specs=DEFAULT_SPECS):
+    return compute_indicators(close, specs)
+
+
+# Stream closes through fresh or restored states, returning the indicator rows
+def stream_indicators(close, specs=DEFAULT_SPECS, states=None):
+    states = states if states is not None else [_new_state(spec) for spec in specs]
+    values = np.asarray(close, dtype=np.float64)
+    rows = np.empty((len(values), sum(len(spec_columns(spec)) for spec in specs)))
+    for i, value in enumerate(values):
+        row = []
+        for state in states:
+            row.extend(_update_state(state, float(value)))
+        rows[i] = row
+    columns = [name for spec in specs for name in spec_columns(spec)]
+    return pd.DataFrame(rows, index=close.index, columns=columns), states
+
+
+# ---------- Persisted per-ticker engine ----------
+
+def _indicator_path(ticker, specs):
+    key = '_'.join('-'.join(str(i) for i in spec) for spec in specs)
+    return os.path.join(INDICATOR_DIR, f"{ticker.upper().replace('/', '_')}_{key}.parquet")
+
+
+def _read(ticker, specs):
+    path = _indicator_path(ticker, specs)
+    if not os.path.exists(path):
+        return None, None
+    table = pq.read_table(path)
+    meta = json.loads(table.schema.metadata[METADATA_KEY])
+    return table.to_pandas(), meta
+
+
+def _write(ticker, specs, outputs, meta):
+    path = _indicator_path(ticker, specs)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(outputs, preserve_index=True)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), METADATA_KEY: json.dumps(meta)})
+    with atomic_write(path) as tmp_path:
+        pq.write_table(table, tmp_path)
+
+
+def _continues(meta, close):
+    # Saved state is reusable when the stored history is unchanged up to the
+    # last synced bar: same row count at that date and the same close
+    n_rows = meta['n_rows']
+    if n_rows == 0 or n_rows > len(close):
+        return False
+    last_date = pd.Timestamp(meta['last_date'])
+    return close.index[n_rows - 1] == last_date and float(close.iloc[n_rows - 1]) == meta['last_close']
+
+
+# Indicator columns aligned to the close series of a ticker. Completed bars are
+# synced into the saved state incrementally; today's still-moving bar is
+# streamed through a throwaway copy of the state and never saved.
+@traced('indicators.sync')
+def sync_indicators(ticker, close, specs=DEFAULT_SPECS):
+    specs = tuple(tuple(spec) for spec in specs)
+    close = close.astype('float64')
+    cutoff = close.index.searchsorted(pd.Timestamp.today().normalize(), side='left')
+    completed, live = close.iloc[:cutoff], close.iloc[cutoff:]
+
+    with keyed_lock('indicators', ticker.upper()):
+        outputs, meta = _read(ticker, specs)
+        if outputs is not None and _continues(meta, completed):
+            states = [_state_from_dict(spec, state) for spec, state in zip(specs, meta['states'])]
+            new_rows, states = stream_indicators(completed.iloc[meta['n_rows']:], specs, states)
+            changed = len(new_rows) > 0
+            outputs = pd.concat([outputs, new_rows]) if changed else outputs
+        else:
+            outputs, states = stream_indicators(completed, specs)
+            changed = True
+        if changed and len(completed):
+            _write(ticker, specs, outputs, {
+                'n_rows': len(completed),
+                'last_date': completed.index[-1].isoformat(),
+                'last_close': float(completed.iloc[-1]),
+                'states': [state.to_dict() for state in states],
+            })
+
+    if len(live):
+        scratch = [_state_from_dict(spec, state.to_dict()) for spec, state in zip(specs, states)]
+        live_rows, _ = stream_indicators(live, specs, scratch)
+        outputs = pd.concat([outputs, live_rows])
+    return outputs
@@ -0,0 +1,201 @@
+import os
+import sys
+import time
+import uuid
+import types
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Background jobs on a shared process pool, deduplicated by key, with
+# progress reports and cancellation at the job's next report
+
+MAX_WORKERS = int(os.environ.get('TRADEZY_JOB_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
+RESULT_TTL = 3600
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLING = 'cancelling'
+CANCELLED = 'cancelled'
+
+
+_main_lock = threading.Lock()
+# Size of the worker pool this process belongs to; None outside a worker
+_pool_workers = None
+
+
+# Spawned processes re-import the parent's __main__, which under Streamlit is
+# the page script, so they start under a bare __main__ that imports nothing;
+# job functions must therefore live in importable modules
+@contextlib.contextmanager
+def _bare_main():
+    with _main_lock:
+        main = sys.modules['__main__']
+        sys.modules['__main__'] = types.ModuleType('__main__')
+        try:
+            yield
+        finally:
+            sys.modules['__main__'] = main
+
+
+# Pool initializer for processes that run jobs next to max_workers - 1 others
+def enter_worker(max_workers):
+    global _pool_workers
+    _pool_workers = max_workers
+
+
+# CPUs a job may use for processes of its own: its share of the machine
+# inside a job worker, None outside one
+def job_cpu_share():
+    if _pool_workers is None:
+        return None
+    return max(1, (os.cpu_count() or 2) // _pool_workers)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class _Reporter:
+    def __init__(self, job_id, progress):
+        self.job_id = job_id
+        self.progress = progress
+
+    def __call__(self, fraction, message=''):
+        if self.progress.get(('cancel', self.job_id)):
+            raise JobCancelled(self.job_id)
+        self.progress[self.job_id] = (float(fraction), message)
+
+
+def _run_job(fn, job_id, progress, args, kwargs):
+    report = _Reporter(job_id, progress)
+    report(0.0, 'Started')
+    result = fn(*args, report=report, **kwargs)
+    progress[job_id] = (1.0, 'Done')
+    return result
+
+
+class Job:
+    def __init__(self, job_id, key, future):
+        self.id = job_id
+        self.key = key
+        self.future = future
+        self.submitted_at = time.time()
+        self.finished_at = None
+
+
+class JobRunner:
+    def __init__(self, max_workers=MAX_WORKERS):
+        # spawn keeps workers independent of the server's threads and locks
+        context = multiprocessing.get_context('spawn')
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                             initializer=enter_worker, initargs=(max_workers,))
+        with _bare_main():
+            self._manager = context.Manager()
+        self._progress = self._manager.dict()
+        self._jobs = {}
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    def _mark_finished(self, job_id):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].finished_at = time.time()
+
+    def _purge(self):
+        cutoff = time.time() - RESULT_TTL
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at < cutoff:
+                self._forget(job)
+
+    def _forget(self, job):
+        self._jobs.pop(job.id, None)
+        if self._by_key.get(job.key) == job.id:
+            del self._by_key[job.key]
+        self._progress.pop(job.id, None)
+        self._progress.pop(('cancel', job.id), None)
+
+    def _reusable(self, job):
+        if job.future.cancelled() or self._progress.get(('cancel', job.id)):
+            return False
+        return not (job.future.done() and job.future.exception() is not None)
+
+    # Id of the job for key, if one has been submitted and not purged
+    def lookup(self, key):
+        with self._lock:
+            return self._by_key.get(key)
+
+    def submit(self, fn, *args, key=None, **kwargs):
+        with self._lock:
+            self._purge()
+            if key is not None and key in self._by_key:
+                job = self._jobs[self._by_key[key]]
+                if self._reusable(job):
+                    return job.id
+                self._forget(job)
+            job_id = uuid.uuid4().hex
+            self._progress[job_id] = (0.0, 'Queued')
+            # workers are spawned on demand, inside submit
+            with _bare_main():
+                future = self._executor.submit(_run_job, fn, job_id, self._progress, args, kwargs)
+            job = Job(job_id, key if key is not None else job_id, future)
+            self._jobs[job_id] = job
+            self._by_key[job.key] = job_id
+        future.add_done_callback(lambda _: self._mark_finished(job_id))
+        return job_id
+
+    def status(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        future = job.future
+        if future.cancelled():
+            return CANCELLED
+        if not future.done():
+            if self._progress.get(('cancel', job_id)):
+                return CANCELLING
+            return RUNNING if future.running() else PENDING
+        error = future.exception()
+        if isinstance(error, JobCancelled):
+            return CANCELLED
+        return FAILED if error is not None else DONE
+
+    # (fraction, message) last reported by the job
+    def progress(self, job_id):
+        return self._progress.get(job_id, (0.0, ''))
+
+    def result(self, job_id, timeout=None):
+        return self._jobs[job_id].future.result(timeout=timeout)
+
+    def error(self, job_id):
+        future = self._jobs[job_id].future
+        return future.exception() if future.done() and not future.cancelled() else None
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None or job.future.done():
+            return False
+        if not job.future.cancel():
+            # Already running: stop at the job's next progress report
+            self._progress[('cancel', job_id)] = True
+        return True
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+# Process-wide runner shared across Streamlit sessions
+def get_runner():
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
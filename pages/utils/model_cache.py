@@ -0,0 +1,167 @@
+import os
+import json
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from pages.utils.data_store import STORE_DIR
+from pages.utils.lazy import lazy_import
+from pages.utils.storage import atomic_write
+
+# Fitted ARIMA results on disk by (ticker, order, series fingerprint);
+# grown series are extended with results.append, and the scaler's fitting
+# window is kept so scaled prefixes stay identical
+
+arima_model = lazy_import('statsmodels.tsa.arima.model')
+
+MODEL_DIR = os.path.join(STORE_DIR, 'models')
+MAX_ENTRIES = 4
+APPEND_LIMIT = 10
+MEMORY_ENTRIES = 8
+# Bars the series may grow past the scaler's fitting window before refitting
+SCALER_REFRESH = int(os.environ.get('TRADEZY_SCALER_REFRESH', 63))
+
+_lock = threading.Lock()
+_memory = OrderedDict()
+
+
+def fingerprint(values):
+    data = np.ascontiguousarray(np.asarray(values, dtype=np.float64).ravel())
+    return hashlib.sha1(data.tobytes()).hexdigest()[:16]
+
+
+def _order_key(ticker, order):
+    return f"{ticker.upper().replace('/', '_')}_{'_'.join(str(i) for i in order)}"
+
+
+def _manifest_path(ticker, order):
+    return os.path.join(MODEL_DIR, _order_key(ticker, order) + '.json')
+
+
+def _model_path(ticker, order, data_fingerprint):
+    return os.path.join(MODEL_DIR, f"{_order_key(ticker, order)}_{data_fingerprint}.pkl")
+
+
+def _scaler_path(ticker):
+    return os.path.join(MODEL_DIR, ticker.upper().replace('/', '_') + '_scaler.json')
+
+
+def _read_manifest(ticker, order):
+    try:
+        with open(_manifest_path(ticker, order)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def _write_manifest(ticker, order, entries):
+    path = _manifest_path(ticker, order)
+    with atomic_write(path) as tmp_path, open(tmp_path, 'w') as f:
+        json.dump(entries, f)
+
+
+def _remember(key, results):
+    _memory[key] = results
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def _load_entry(ticker, order, data_fingerprint):
+    key = (ticker.upper(), tuple(order), data_fingerprint)
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+    try:
+        results = arima_model.ARIMAResults.load(_model_path(ticker, order, data_fingerprint))
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        # Missing, truncated or written by another statsmodels version
+        return None
+    with _lock:
+        _remember(key, results)
+    return results
+
+
+# fitted_n_obs is the series length the parameters were estimated on, which
+# differs from len(data) for results extended through append
+def save_model(ticker, order, data, results, fitted_n_obs=None):
+    data = np.asarray(data, dtype=np.float64).ravel()
+    data_fingerprint = fingerprint(data)
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    path = _model_path(ticker, order, data_fingerprint)
+    with atomic_write(path) as tmp_path:
+        results.save(tmp_path)
+
+    with _lock:
+        _remember((ticker.upper(), tuple(order), data_fingerprint), results)
+        entries = [e for e in _read_manifest(ticker, order) if e['fingerprint'] != data_fingerprint]
+        entries.insert(0, {
+            'fingerprint': data_fingerprint,
+            'n_obs': int(len(data)),
+            'fitted_n_obs': int(fitted_n_obs or len(data)),
+            'params': np.asarray(results.params, dtype=np.float64).tolist(),
+        })
+        for stale in entries[MAX_ENTRIES:]:
+            try:
+                os.remove(_model_path(ticker, order, stale['fingerprint']))
+            except OSError:
+                pass
+        _write_manifest(ticker, order, entries[:MAX_ENTRIES])
+
+
+# Fitted results for exactly this series, or a cached fit of a prefix of it
+# extended with the new bars; None when nothing reusable is cached
+def load_model(ticker, order, data):
+    data = np.asarray(data, dtype=np.float64).ravel()
+    data_fingerprint = fingerprint(data)
+    entries = _read_manifest(ticker, order)
+
+    for entry in entries:
+        if entry['fingerprint'] == data_fingerprint:
+            results = _load_entry(ticker, order, data_fingerprint)
+            if results is not None:
+                return results
+
+    for entry in entries:
+        n_obs = entry['n_obs']
+        if n_obs >= len(data) or len(data) - entry['fitted_n_obs'] > APPEND_LIMIT:
+            continue
+        if fingerprint(data[:n_obs]) != entry['fingerprint']:
+            continue
+        results = _load_entry(ticker, order, entry['fingerprint'])
+        if results is None:
+            continue
+        results = results.append(data[n_obs:], refit=False)
+        save_model(ticker, order, data, results, entry['fitted_n_obs'])
+        return results
+    return None
+
+
+# Parameters of the most recent fit for (ticker, order), used as start_params
+def latest_params(ticker, order):
+    entries = _read_manifest(ticker, order)
+    if not entries:
+        return None
+    return np.asarray(entries[0]['params'])
+
+
+# Number of leading values of the ticker's series to fit its scaler on: the
+# stored window while values still extends it by at most SCALER_REFRESH
+# bars, otherwise the whole series, which becomes the new stored window
+def scaler_window(ticker, values):
+    values = np.asarray(values, dtype=np.float64).ravel()
+    path = _scaler_path(ticker)
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+        n_obs = entry['n_obs']
+        if n_obs <= len(values) <= n_obs + SCALER_REFRESH and fingerprint(values[:n_obs]) == entry['fingerprint']:
+            return n_obs
+    except (OSError, ValueError, KeyError):
+        pass
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    with atomic_write(path) as tmp_path, open(tmp_path, 'w') as f:
+        json.dump({'fingerprint': fingerprint(values), 'n_obs': int(len(values))}, f)
+    return len(values)
@@ -1,40 +1,62 @@
-import yfinance as yf
-from statsmodels.tsa.stattools import adfuller
-from sklearn.metrics import mean_squared_error, r2_score
-from statsmodels.tsa.arima.model import ARIMA
 import numpy as np
-from sklearn.preprocessing import StandardScaler
 from datetime import datetime, timedelta
 import pandas as pd
+from pages.utils.data_store import load_prices
+from pages.utils.model_cache import load_model
+from pages.utils.model_cache import save_model
+from pages.utils.model_cache import latest_params
+from pages.utils.model_cache import scaler_window
+from pages.utils.stationarity import stationarity_pvalue
+from pages.utils.stationarity import differencing_order as bounded_differencing_order
+from pages.utils.order_search import search_order
+from pages.utils.backtest import walk_forward
+from pages.utils.jobs import job_cpu_share
+from pages.utils.tracing import traced
+from pages.utils.lazy import lazy_import
+
+# statsmodels and sklearn load on the first fit, not when a page imports this
+arima_model = lazy_import('statsmodels.tsa.arima.model')
+sk_metrics = lazy_import('sklearn.metrics')
+sk_preprocessing = lazy_import('sklearn.preprocessing')
 
 def get_data(ticker):
-    stock_data = yf.download(ticker, start='2024-01-01')
+    stock_data = load_prices(ticker, start='2024-01-01')
     return stock_data[['Close']]
 
 def stationary_check(close_price):
-    adf_test = adfuller(close_price)
-    p_value = round(adf_test[1], 3)
-    return p_value
+    return stationarity_pvalue(close_price)
 
 def get_rolling_mean(close_price):
     rolling_price = close_price.rolling(window=7).mean().dropna()
     return rolling_price
 
+# Bounded search (d <= MAX_DIFFERENCING) with ADF results cached per series
 def get_differencing_order(close_price):
-    p_value = stationary_check(close_price)
-    d = 0
-    while True:
-        if p_value > 0.05:
-            d += 1
-            close_price = close_price.diff().dropna()
-            p_value = stationary_check(close_price)
-        else:
-            break
-    return d
-
-def fit_model(data, differencing_order):
-    model = ARIMA(data, order=(30, differencing_order, 30))
-    model_fit = model.fit()
+    return bounded_differencing_order(close_price)
+
+def get_order(differencing_order):
+    return (30, differencing_order, 30)
+
+# Fitted ARIMA results, restored or extended from the model cache when a ticker
+# is given, otherwise fitted (warm started from the latest cached parameters)
+@traced('model.fit')
+def fit_arima(data, order, ticker=None, start_params=None):
+    if ticker:
+        model_fit = load_model(ticker, order, data)
+        if model_fit is not None:
+            return model_fit
+        if start_params is None:
+            start_params = latest_params(ticker, order)
+    model = arima_model.ARIMA(data, order=order)
+    model_fit = model.fit(start_params=start_params)
+    if ticker:
+        save_model(ticker, order, data, model_fit)
+    return model_fit
+
+# order overrides the default (30, d, 30), e.g. with a searched order, and
+# start_params warm starts a fresh fit (e.g. with the search's parameters)
+def fit_model(data, differencing_order, ticker=None, order=None, start_params=None):
+    model_fit = fit_arima(data, order or get_order(differencing_order), ticker, start_params)
 
     forecast_steps = 30
     forecast = model_fit.get_forecast(steps=forecast_steps)
@@ -42,19 +64,33 @@ def fit_model(data, differencing_order):
     predictions = forecast.predicted_mean
     return predictions
 
-def evaluate_model(original_price, differencing_order):
+@traced('model.evaluate')
+def evaluate_model(original_price, differencing_order, ticker=None, order=None, start_params=None):
     train_data, test_data = original_price[:-30], original_price[-30:]
-    predictions = fit_model(train_data, differencing_order)
-    rmse = np.sqrt(mean_squared_error(test_data, predictions))
+    predictions = fit_model(train_data, differencing_order, ticker, order, start_params)
+    rmse = np.sqrt(sk_metrics.mean_squared_error(test_data, predictions))
     return round(rmse, 2)
 
-def scaling(close_price):
-    scaler = StandardScaler()
-    scaled_data = scaler.fit_transform(np.array(close_price).reshape(-1, 1))
+# Walk-forward alternative to the single holdout: per-fold RMSE/MAE and fit
+# times over n_folds rolling origins (see pages/utils/backtest.py)
+def backtest_model(original_price, differencing_order, order=None, n_folds=10, ticker=None, max_workers=None):
+    kwargs = {} if max_workers is None else {'max_workers': max_workers}
+    return walk_forward(original_price, order or get_order(differencing_order), n_folds=n_folds, ticker=ticker, **kwargs)
+
+# With a ticker the scaler is fitted on the window kept by the model cache,
+# so earlier bars scale to the same values as in cached fits
+def scaling(close_price, ticker=None):
+    values = np.array(close_price, dtype=np.float64).reshape(-1, 1)
+    n_obs = scaler_window(ticker, values) if ticker else len(values)
+    scaler = sk_preprocessing.StandardScaler().fit(values[:n_obs])
+    scaled_data = scaler.transform(values)
     return scaled_data, scaler
 
-def get_forecast(original_price, differencing_order):
-    predictions = fit_model(original_price, differencing_order)
+# With a ticker, the full-series fit is warm started from the evaluation fit
+# that evaluate_model just cached for the same order
+@traced('model.forecast')
+def get_forecast(original_price, differencing_order, ticker=None, order=None, start_params=None):
+    predictions = fit_model(original_price, differencing_order, ticker, order, start_params)
     start_date = datetime.now().strftime('%Y-%m-%d')
     end_date = (datetime.now() + timedelta(days=29)).strftime('%Y-%m-%d')
     forecast_index = pd.date_range(start=start_date, end=end_date, freq='D')
@@ -64,3 +100,45 @@ def get_forecast(original_price, differencing_order):
 def inverse_scaling(scaler, scaled_data):
     close_price=scaler.inverse_transform(np.array(scaled_data).reshape(-1,1))
     return close_price
+
+# Whole prediction pipeline for one ticker, run by the background job runner.
+# report(fraction, message) is called between stages for progress display.
+# With auto_order the ARIMA order is searched on the training split first;
+# with backtest_folds the fitted order is also scored by walk-forward folds.
+@traced('model.run_forecast')
+def run_forecast(ticker, auto_order=False, report=None, backtest_folds=0):
+    if report is None:
+        report = lambda fraction, message='': None
+    report(0.05, 'Downloading prices')
+    close_price = get_data(ticker)
+    rolling_price = get_rolling_mean(close_price)
+
+    report(0.15, 'Checking stationarity')
+    differencing_order = get_differencing_order(rolling_price)
+    scaled_data, scaler = scaling(rolling_price, ticker)
+
+    order = get_order(differencing_order)
+    order_table = None
+    start_params = None
+    if auto_order:
+        report(0.2, 'Searching model order')
+        search = search_order(scaled_data[:-30], differencing_order,
+                              report=lambda fraction, message='': report(0.2 + 0.05 * fraction, message))
+        order, order_table, start_params = search.best_order, search.table, search.best_params
+
+    report(0.25, 'Evaluating model')
+    rmse = evaluate_model(scaled_data, differencing_order, ticker, order, start_params)
+
+    report(0.6, 'Fitting forecast model')
+    forecast = get_forecast(scaled_data, differencing_order, ticker, order, start_params)
+    forecast['Close'] = inverse_scaling(scaler, forecast['Close'])
+
+    backtest = None
+    if backtest_folds:
+        report(0.8, 'Running walk-forward backtest')
+        folds = backtest_model(scaled_data, differencing_order, order, backtest_folds, ticker=ticker,
+                               max_workers=job_cpu_share()).folds
+        backtest = {'folds': len(folds), 'rmse': float(folds['rmse'].mean()), 'mae': float(folds['mae'].mean()),
+                    'fit_seconds': float(folds['fit_seconds'].sum())}
+    return {'rmse': rmse, 'forecast': forecast, 'rolling_price': rolling_price,
+            'order': order, 'order_table': order_table, 'backtest': backtest}
@@ -0,0 +1,100 @@
+import os
+import time
+import multiprocessing
+import numpy as np
+import pandas as pd
+from pages.utils.jobs import job_cpu_share
+from pages.utils.tracing import traced
+from pages.utils.lazy import lazy_import
+
+# ARIMA order search by AIC on a process pool within a wall-clock budget
+
+arima_model = lazy_import('statsmodels.tsa.arima.model')
+
+P_VALUES = range(0, 6)
+Q_VALUES = range(0, 6)
+BUDGET_SECONDS = float(os.environ.get('TRADEZY_ORDER_SEARCH_BUDGET', 60))
+MAX_ITER = 50
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# Longest wait for the worker processes to start before the budget runs anyway
+STARTUP_TIMEOUT = 60
+
+
+class OrderSearchResult:
+    def __init__(self, best_order, best_params, table, elapsed):
+        self.best_order = best_order
+        self.best_params = best_params
+        self.table = table
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f"OrderSearchResult(best_order={self.best_order}, candidates={len(self.table)}, elapsed={self.elapsed:.1f}s)"
+
+
+# Pool initializer: pay for the statsmodels import before the clock starts
+def _warm_up(ready):
+    arima_model.ARIMA
+    ready.release()
+
+
+def _fit_candidate(data, order):
+    started = time.perf_counter()
+    model_fit = arima_model.ARIMA(data, order=order).fit(method_kwargs={'maxiter': MAX_ITER})
+    return model_fit.aic, model_fit.bic, np.asarray(model_fit.params), time.perf_counter() - started
+
+
+def candidate_orders(d, p_values=P_VALUES, q_values=Q_VALUES):
+    orders = [(p, d, q) for p in p_values for q in q_values]
+    return sorted(orders, key=lambda order: (order[0] + order[2], order))
+
+
+# report(fraction, message) is called after each candidate, so a job
+# cancelled between candidates stops the search there
+@traced('model.order_search')
+def search_order(data, d, p_values=P_VALUES, q_values=Q_VALUES, budget=BUDGET_SECONDS, max_workers=None,
+                 report=None):
+    if max_workers is None:
+        # Inside a job worker the pool gets only that job's CPU share
+        max_workers = job_cpu_share() or MAX_WORKERS
+    data = np.asarray(data, dtype=np.float64).ravel()
+    orders = candidate_orders(d, p_values, q_values)
+    rows = []
+    params = {}
+
+    # multiprocessing.Pool rather than an executor: terminate() stops
+    # candidates that are still fitting when the budget is spent
+    context = multiprocessing.get_context('spawn')
+    workers = min(max_workers, len(orders))
+    ready = context.Semaphore(0)
+    pool = context.Pool(workers, initializer=_warm_up, initargs=(ready,))
+    try:
+        startup_deadline = time.perf_counter() + STARTUP_TIMEOUT
+        for _ in range(workers):
+            ready.acquire(timeout=max(0.0, startup_deadline - time.perf_counter()))
+        started = time.perf_counter()
+        deadline = started + budget
+        pending = [(order, pool.apply_async(_fit_candidate, (data, order))) for order in orders]
+        for i, (order, async_result) in enumerate(pending):
+            row = {'order': order, 'aic': np.nan, 'bic': np.nan, 'fit_seconds': np.nan}
+            try:
+                aic, bic, order_params, seconds = async_result.get(timeout=max(0.0, deadline - time.perf_counter()))
+                row.update(aic=aic, bic=bic, fit_seconds=round(seconds, 3), status='ok')
+                params[order] = order_params
+            except multiprocessing.TimeoutError:
+                row['status'] = 'timeout'
+            except Exception as e:
+                row['status'] = f'failed: {e}'
+            rows.append(row)
+            if report is not None:
+                report((i + 1) / len(pending), f'Searched {i + 1} of {len(pending)} orders')
+    finally:
+        pool.terminate()
+        pool.join()
+
+    table = pd.DataFrame(rows, columns=['order', 'aic', 'bic', 'fit_seconds', 'status'])
+    table = table.sort_values('aic', na_position='last').reset_index(drop=True)
+    fitted = table[table['status'] == 'ok']
+    if fitted.empty:
+        raise RuntimeError(f"No ARIMA order could be fitted within {budget:.0f}s")
+    best_order = tuple(fitted['order'].iloc[0])
+    return OrderSearchResult(best_order, params[best_order], table, time.perf_counter() - started)
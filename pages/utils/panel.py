@@ -0,0 +1,272 @@
+import os
+import weakref
+import functools
+import threading
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import AbstractHolidayCalendar, Holiday, GoodFriday
+from pandas.tseries.holiday import USMartinLutherKingJr, USPresidentsDay, USMemorialDay
+from pandas.tseries.holiday import USLaborDay, USThanksgivingDay
+from pandas.tseries.holiday import nearest_workday, sunday_to_monday
+from pandas.tseries.offsets import CustomBusinessDay
+from pages.utils.data_store import load_many
+from pages.utils.data_store import read_closes
+from pages.utils.benchmarks import load_benchmark
+from pages.utils.tracing import traced
+
+# Price panel on the NYSE calendar: one preallocated buffer slot per
+# column; compact mode stores float32 (TRADEZY_COMPACT_PANELS=1)
+
+INITIAL_SLOTS = 8
+COMPACT = os.environ.get('TRADEZY_COMPACT_PANELS', '0') == '1'
+MEMORY_BUDGET_MB = float(os.environ.get('TRADEZY_PANEL_MEMORY_MB', 2048))
+# Columns read from the store per block when bulk loading a panel
+LOAD_CHUNK = 256
+
+
+# Unscheduled full-day closures (national days of mourning, weather, 9/11);
+# new ones have to be added here
+SPECIAL_CLOSURES = [
+    '1972-12-28', '1973-01-25', '1977-07-14', '1985-09-27', '1994-04-27',
+    '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14', '2004-06-11',
+    '2007-01-02', '2012-10-29', '2012-10-30', '2018-12-05', '2025-01-09',
+]
+
+
+class NYSECalendar(AbstractHolidayCalendar):
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        # Observed by the exchange from 1998
+        Holiday('Martin Luther King Jr. Day', month=1, day=1, start_date='1998-01-01',
+                offset=USMartinLutherKingJr.offset),
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday),
+    ] + [Holiday(f'Closure {date}', year=int(date[:4]), month=int(date[5:7]), day=int(date[8:]))
+         for date in SPECIAL_CLOSURES]
+
+
+# Built on first use: the offset expands every holiday from 1970 to 2200,
+# which is most of this module's import time
+@functools.lru_cache(maxsize=None)
+def _trading_day():
+    return CustomBusinessDay(calendar=NYSECalendar())
+
+
+_panels = weakref.WeakSet()
+_budget_lock = threading.Lock()
+
+
+def _epoch_days(dates):
+    return np.asarray(pd.DatetimeIndex(dates).normalize().values.astype('datetime64[D]').astype(np.int64))
+
+
+def panel_bytes():
+    return sum(panel.nbytes for panel in list(_panels))
+
+
+# One row per live panel: shape, storage and bytes held, against the budget
+def memory_report():
+    rows = [(id(panel), len(panel.days), panel._values.shape[1], len(panel), str(panel._values.dtype),
+             panel.nbytes) for panel in list(_panels)]
+    report = pd.DataFrame(rows, columns=['panel', 'days', 'slots', 'columns', 'dtype', 'bytes'])
+    report.attrs['budget_bytes'] = int(MEMORY_BUDGET_MB * 1024 * 1024)
+    return report
+
+
+def _reserve(nbytes):
+    with _budget_lock:
+        budget = MEMORY_BUDGET_MB * 1024 * 1024
+        in_use = panel_bytes()
+        if in_use + nbytes > budget:
+            raise MemoryError(f"Panel memory budget exceeded: {(in_use + nbytes) / 2**20:.0f} MB requested, "
+                              f"{budget / 2**20:.0f} MB allowed (TRADEZY_PANEL_MEMORY_MB)")
+
+
+# NYSE trading days in [start, end]
+def trading_days(start, end):
+    return pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq=_trading_day(), name='Date')
+
+
+class PricePanel:
+    def __init__(self, index, capacity=INITIAL_SLOTS, compact=None):
+        self.compact = COMPACT if compact is None else compact
+        self.days = _epoch_days(index)
+        self._index = None
+        self._values, self._mask = self._allocate(capacity)
+        self._slots = {}
+        self._free = list(range(capacity - 1, -1, -1))
+        self._shared = False
+        _panels.add(self)
+
+    def _allocate(self, capacity):
+        dtype = np.float32 if self.compact else np.float64
+        _reserve(len(self.days) * capacity * (np.dtype(dtype).itemsize + (0 if self.compact else 1)))
+        values = np.full((len(self.days), capacity), np.nan, dtype=dtype, order='F')
+        mask = None if self.compact else np.zeros((len(self.days), capacity), dtype=bool, order='F')
+        return values, mask
+
+    # Panel on the trading days in [start, end] holding the tickers' closes
+    # and, optionally, a benchmark series as a column of the same name
+    @classmethod
+    @traced('align.panel_build')
+    def build(cls, tickers, start, end, benchmark=None, field='Close', compact=None):
+        panel = cls(trading_days(start, end), capacity=max(INITIAL_SLOTS, len(tickers) + 1), compact=compact)
+        panel.add_tickers(tickers, field)
+        if benchmark:
+            panel.add(benchmark, load_benchmark(benchmark, start, end)[benchmark])
+        return panel
+
+    # Stored closes of a whole universe, read block by block straight into
+    # the slot buffer without touching the network
+    @classmethod
+    @traced('align.panel_from_store')
+    def from_store(cls, tickers, start, end, compact=None):
+        panel = cls(trading_days(start, end), capacity=max(INITIAL_SLOTS, len(tickers)), compact=compact)
+        for first in range(0, len(tickers), LOAD_CHUNK):
+            chunk = tickers[first:first + LOAD_CHUNK]
+            block = read_closes(chunk, panel.index)
+            for j, ticker in enumerate(chunk):
+                if not np.isnan(block[:, j]).all():
+                    panel._store(ticker, block[:, j])
+        return panel
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = pd.DatetimeIndex(self.days.astype('datetime64[D]'), name='Date').as_unit('ns')
+        return self._index
+
+    @property
+    def nbytes(self):
+        return self._values.nbytes + (0 if self._mask is None else self._mask.nbytes)
+
+    def __contains__(self, name):
+        return name in self._slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    @property
+    def columns(self):
+        return list(self._slots)
+
+    def _grow(self):
+        capacity = self._values.shape[1]
+        values, mask = self._allocate(capacity * 2)
+        values[:, :capacity] = self._values
+        if mask is not None:
+            mask[:, :capacity] = self._mask
+        self._values, self._mask = values, mask
+        self._free = list(range(capacity * 2 - 1, capacity - 1, -1))
+
+    # A window copies its columns into buffers of its own before its first
+    # write, so it never overwrites its parent's slots
+    def _unshare(self):
+        names = list(self._slots)
+        values, mask = self._allocate(max(INITIAL_SLOTS, len(names) + 1))
+        slots = [self._slots[name] for name in names]
+        values[:, :len(names)] = self._values[:, slots]
+        if mask is not None:
+            mask[:, :len(names)] = self._mask[:, slots]
+        self._values, self._mask = values, mask
+        self._slots = {name: slot for slot, name in enumerate(names)}
+        self._free = list(range(values.shape[1] - 1, len(names) - 1, -1))
+        self._shared = False
+        _panels.add(self)
+
+    def _store(self, name, aligned):
+        if self._shared:
+            self._unshare()
+        if name in self._slots:
+            self.remove(name)
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self._values[:, slot] = aligned
+        if self._mask is not None:
+            self._mask[:, slot] = ~np.isnan(aligned)
+        self._slots[name] = slot
+
+    # Align a Series to the calendar and store it; dates outside the calendar
+    # are dropped and calendar days without a value are masked out
+    @traced('align.panel_add')
+    def add(self, name, series):
+        dates = pd.DatetimeIndex(series.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        days = _epoch_days(dates)
+        positions = np.minimum(np.searchsorted(self.days, days), len(self.days) - 1)
+        known = self.days[positions] == days
+        aligned = np.full(len(self.days), np.nan)
+        aligned[positions[known]] = np.asarray(series, dtype=np.float64)[known]
+        self._store(name, aligned)
+
+    # Closes (or another OHLCV field) of several tickers from the price store;
+    # returns the tickers that could not be loaded
+    def add_tickers(self, tickers, field='Close'):
+        tickers = [ticker for ticker in tickers if ticker not in self._slots]
+        if not tickers:
+            return {}
+        frames, failures = load_many(tickers, start=self.index[0], end=self.index[-1] + pd.Timedelta(days=1))
+        for ticker in tickers:
+            if ticker in frames and not frames[ticker].empty:
+                self.add(ticker, frames[ticker][field])
+        return failures
+
+    def remove(self, name):
+        slot = self._slots.pop(name)
+        if not self._shared:
+            self._free.append(slot)
+
+    # Column values as a view of the panel buffer (float32 in compact mode)
+    def column(self, name):
+        return self._values[:, self._slots[name]]
+
+    # Validity mask of a column (a view, or derived from NaN in compact mode)
+    def mask(self, name):
+        if self._mask is None:
+            return ~np.isnan(self.column(name))
+        return self._mask[:, self._slots[name]]
+
+    def series(self, name):
+        return pd.Series(self.column(name), index=self.index, name=name, copy=False)
+
+    # (days, len(names)) float64 matrix of the columns, in the order given
+    def matrix(self, names):
+        return self._values[:, [self._slots[name] for name in names]].astype(np.float64, copy=False)
+
+    # Days on which all the given columns have a value
+    def common_mask(self, names):
+        slots = [self._slots[name] for name in names]
+        if self._mask is None:
+            return ~np.isnan(self._values[:, slots]).any(axis=1)
+        return self._mask[:, slots].all(axis=1)
+
+    # DataFrame of the columns; dropna keeps only days where all of them are valid
+    def frame(self, names, dropna=False):
+        frame = pd.DataFrame(self.matrix(names), index=self.index, columns=list(names))
+        if dropna:
+            frame = frame[self.common_mask(names)]
+        return frame
+
+    # Panel over the days in [start, end] sharing this panel's buffers; storing
+    # a column in a window gives it buffers of its own
+    def window(self, start, end=None):
+        left = self.index.searchsorted(pd.Timestamp(start), side='left')
+        right = len(self.days) if end is None else self.index.searchsorted(pd.Timestamp(end), side='right')
+        view = PricePanel.__new__(PricePanel)
+        view.compact = self.compact
+        view.days = self.days[left:right]
+        view._index = None
+        view._values = self._values[left:right]
+        view._mask = None if self._mask is None else self._mask[left:right]
+        view._slots = dict(self._slots)
+        view._free = []
+        view._shared = True
+        return view
@@ -1,20 +1,25 @@
-import dateutil.relativedelta
 import plotly.graph_objects as go
-import ta
-from ta.trend import SMAIndicator, EMAIndicator, MACD
-from ta.momentum import RSIIndicator
-from ta.volatility import BollingerBands
-import pandas as pd
-import yfinance as yf
-import datetime
-import dateutil
-
-# Plotly Table Function
+import numpy as np
+from pages.utils.indicator_cache import get_indicator
+from pages.utils.windows import slice_period
+from pages.utils.downsample import downsample_line
+from pages.utils.downsample import ohlc_buckets
+from pages.utils.figure_templates import build_figure
+from pages.utils.figure_templates import line_values
+from pages.utils.figure_templates import epoch_ms
+from pages.utils.figure_templates import overlay_traces
+from pages.utils.tracing import traced
+
+# Plotly Table Function (small frames; see table_view.paged_table)
+@traced('figure.plotly_table')
 def plotly_table(dataframe):
     headerColor = '#1f2c56'
     rowEvenColor = '#2e3b5f'
     rowOddColor = '#1c253b'
 
+    index_labels = np.char.add(np.char.add('<b>', dataframe.index.astype(str).to_numpy(dtype=str)), '</b>')
+    row_colors = np.where(np.arange(len(dataframe)) % 2 == 0, rowOddColor, rowEvenColor)
+
     fig = go.Figure(data=[go.Table(
         header=dict(
             values=["<b>Index</b>"] + ["<b>"+str(i)+"</b>" for i in dataframe.columns],
@@ -22,8 +27,8 @@ def plotly_table(dataframe):
             align='center', font=dict(color='white', size=15), height=35
         ),
         cells=dict(
-            values=[[f"<b>{i}</b>" for i in dataframe.index]] + [dataframe[col] for col in dataframe.columns],
-            fill_color=[rowOddColor if i % 2 == 0 else rowEvenColor for i in range(len(dataframe))],
+            values=[index_labels] + [dataframe[col].to_numpy() for col in dataframe.columns],
+            fill_color=[row_colors] * (len(dataframe.columns) + 1),
             align='left', line_color='white',
             font=dict(color="white", size=14)
         )
@@ -32,368 +37,95 @@ def plotly_table(dataframe):
     fig.update_layout(height=600, margin=dict(l=0, r=0, t=0, b=0))
     return fig
 
+# Window of the frame for a period, as a zero-copy slice on the Date index
 def filter_data(dataframe, num_period):
-    if num_period == '1mo':
-        date = dataframe.index[-1] + dateutil.relativedelta.relativedelta(months=-1)
-    elif num_period == '5d':
-        date = dataframe.index[-1] + dateutil.relativedelta.relativedelta(days=-5)
-    elif num_period == '6mo':
-        date = dataframe.index[-1] + dateutil.relativedelta.relativedelta(months=-6)
-    elif num_period == '1y':
-        date = dataframe.index[-1] + dateutil.relativedelta.relativedelta(years=-1)
-    elif num_period == '5y':
-        date = dataframe.index[-1] + dateutil.relativedelta.relativedelta(years=-5)
-    elif num_period == 'ytd':
-        date = datetime.datetime(dataframe.index[-1].year, 1, 1).strftime('%Y-%m-%d')
-    else:
-        date = dataframe.index[0]
-
-    return dataframe.reset_index()[dataframe.reset_index()['Date'] > date]
-
-def close_chart(dataframe, num_period=False):
+    return slice_period(dataframe, num_period)
+
+# Line trace data reduced to the chart's resolution (LTTB)
+def _line(x, y):
+    return line_values(*downsample_line(x, y))
+
+def _ohlc_lines(dataframe):
+    return [_line(dataframe.index, dataframe[column]) for column in ('Open', 'Close', 'High', 'Low')]
+
+# overlays: optional IndicatorResult (indicator_cache.get_indicators) whose
+# columns are all drawn over the price chart
+def _overlays(dataframe, overlays):
+    if overlays is None:
+        return []
+    window = overlays.window(dataframe.index)
+    return overlay_traces({name: _line(dataframe.index, values) for name, values in window.items()})
+
+# The builders fill the skeletons of pages/utils/figure_templates.py, which
+# carry each chart's traces, colours and layout
+@traced('figure.close_chart')
+def close_chart(dataframe, num_period=False, overlays=None):
     if num_period:
         dataframe = filter_data(dataframe, num_period)
-
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['Open'],
-        mode='lines',
-        name='Open',
-        line=dict(width=2, color='#5ab7ff')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['Close'],
-        mode='lines',
-        name='Close',
-        line=dict(width=2, color='black')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['High'],
-        mode='lines',
-        name='High',
-        line=dict(width=2, color='#0078ff')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['Low'],
-        mode='lines',
-        name='Low',
-        line=dict(width=2, color='red')
-    ))
-
-    fig.update_xaxes(rangeslider_visible=True)
-    fig.update_layout(
-        height=500,
-        margin=dict(l=0, r=20, t=20, b=0),
-        plot_bgcolor='black',
-        paper_bgcolor='#e1efff',
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            font=dict(
-                size=14,
-                color="black"
-            )
-        ),
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        )
-    )
-
-    return fig
-
-def candlestick(dataframe, num_period):
-    dataframe = filter_data(dataframe, num_period)
-    fig = go.Figure()
-
-    fig.add_trace(go.Candlestick(
-        x=dataframe['Date'],
-        open=dataframe['Open'],
-        high=dataframe['High'],
-        low=dataframe['Low'],
-        close=dataframe['Close']
-    ))
-
-    fig.update_layout(
-        showlegend=False,
-        height=500,
-        margin=dict(l=0, r=20, t=20, b=0),
-        plot_bgcolor='black',
-        paper_bgcolor='#e1efff',
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        )
-    )
-    return fig
-
-def RSI(dataframe, num_period):
+    return build_figure('price', *_ohlc_lines(dataframe), extra=_overlays(dataframe, overlays))
+
+@traced('figure.candlestick')
+def candlestick(dataframe, num_period, overlays=None):
+    window = filter_data(dataframe, num_period)
+    # Overlays keep their own (LTTB) resolution over the unbucketed window
+    extra = _overlays(window, overlays)
+    dataframe = ohlc_buckets(window)
+    return build_figure('candlestick', {
+        'x': epoch_ms(dataframe.index),
+        'open': dataframe['Open'].to_numpy(np.float64),
+        'high': dataframe['High'].to_numpy(np.float64),
+        'low': dataframe['Low'].to_numpy(np.float64),
+        'close': dataframe['Close'].to_numpy(np.float64),
+    }, extra=extra)
+
+# indicators: optional IndicatorResult from indicator_cache.get_indicator
+# covering the full history; without it the indicator is computed on the
+# window. The figure builders never modify the frame they are given.
+@traced('figure.RSI')
+def RSI(dataframe, num_period, indicators=None):
     if num_period:
         dataframe = filter_data(dataframe, num_period)
 
-    rsi = RSIIndicator(close=dataframe['Close'], window=14)
-    dataframe['RSI'] = rsi.rsi()
-
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['RSI'],
-        name='RSI',
-        mode='lines',
-        marker_color='orange',
-        line=dict(width=2, color='orange')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=[70]*len(dataframe),
-        name='Overbought',
-        mode='lines',
-        marker_color='red',
-        line=dict(width=2, color='red', dash='dash')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=[30]*len(dataframe),
-        name='Oversold',
-        mode='lines',
-        marker_color='#79da84',
-        line=dict(width=2, color='#79da84', dash='dash')
-    ))
-
-    fig.update_layout(
-        yaxis_range=[0, 100],
-        height=200,
-        plot_bgcolor='black',
-        paper_bgcolor='#e1efff',
-        margin=dict(l=0, r=0, t=0, b=0),
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            font=dict(
-                color='black'
-            )
-        ),
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        )
-    )
-    return fig
+    if indicators is None:
+        indicators = get_indicator(None, dataframe['Close'], ('rsi', 14))
+    rsi = indicators.window(dataframe.index)['RSI']
+    # The 70/30 levels are layout shapes of the skeleton
+    return build_figure('rsi', _line(dataframe.index, rsi))
 
-def Moving_average(dataframe, num_period):
-    sma = SMAIndicator(close=dataframe['Close'], window=50)
-    dataframe['SMA_50'] = sma.sma_indicator()
+@traced('figure.Moving_average')
+def Moving_average(dataframe, num_period, indicators=None):
+    if indicators is None:
+        indicators = get_indicator(None, dataframe['Close'], ('sma', 50))
 
     dataframe = filter_data(dataframe, num_period)
+    sma = indicators.window(dataframe.index)['SMA_50']
+    return build_figure('moving_average', *_ohlc_lines(dataframe), _line(dataframe.index, sma))
 
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['Open'],
-        mode='lines', name='Open',
-        line=dict(width=2, color='#5ab7ff')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['Close'],
-        mode='lines', name='Close',
-        line=dict(width=2, color='black')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['High'],
-        mode='lines', name='High',
-        line=dict(width=2, color='#0078ff')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['Low'],
-        mode='lines', name='Low',
-        line=dict(width=2, color='red')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'], y=dataframe['SMA_50'],
-        mode='lines', name='SMA 50',
-        line=dict(width=2, color='purple')
-    ))
-
-    fig.update_xaxes(rangeslider_visible=True)
-    fig.update_layout(
-        height=500,
-        margin=dict(l=0, r=20, t=20, b=0),
-        plot_bgcolor='black',
-        paper_bgcolor='#e1efff',
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            font=dict(
-                color='black'
-            )
-        ),
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        )
-    )
-    return fig
-
-def plot_MACD(dataframe, num_period):
-    macd = MACD(close=dataframe['Close'])
-    dataframe['MACD'] = macd.macd()
-    dataframe['MACD Signal'] = macd.macd_signal()
-    dataframe['MACD Hist'] = macd.macd_diff()
+@traced('figure.plot_MACD')
+def plot_MACD(dataframe, num_period, indicators=None):
+    if indicators is None:
+        indicators = get_indicator(None, dataframe['Close'], ('macd', 12, 26, 9))
 
     dataframe = filter_data(dataframe, num_period)
+    macd = indicators.window(dataframe.index)
+
+    hist_dates, hist = downsample_line(dataframe.index, macd['MACD Hist'])
+    # 1 = green, 0 = red through the skeleton's two-colour scale
+    histogram = {'x': epoch_ms(hist_dates), 'y': hist, 'marker': {'color': (hist >= 0).astype(np.int8)}}
+    return build_figure('macd',
+                        _line(dataframe.index, macd['MACD']),
+                        _line(dataframe.index, macd['MACD Signal']),
+                        histogram)
+
+@traced('figure.ATR')
+def ATR(dataframe, num_period, indicators):
+    dataframe = filter_data(dataframe, num_period)
+    (values,) = indicators.window(dataframe.index).values()
+    return build_figure('atr', _line(dataframe.index, values))
 
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'],
-        y=dataframe['MACD'],
-        name='MACD',
-        mode='lines',
-        line=dict(width=2, color='orange')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=dataframe['Date'],
-        y=dataframe['MACD Signal'],
-        name='Signal',
-        mode='lines',
-        line=dict(width=2, color='red', dash='dash')
-    ))
-
-    bar_colors = ['green' if val >= 0 else 'red' for val in dataframe['MACD Hist']]
-    fig.add_trace(go.Bar(
-        x=dataframe['Date'],
-        y=dataframe['MACD Hist'],
-        name='Histogram',
-        marker_color=bar_colors
-    ))
-
-    fig.update_layout(
-        height=200,
-        plot_bgcolor='black',
-        paper_bgcolor='#e1efff',
-        margin=dict(l=0, r=0, t=0, b=0),
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            font=dict(
-                color='black'
-            )
-        ),
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            tickfont=dict(color='black')
-        )
-    )
-    return fig
-
-import plotly.graph_objects as go
-
+@traced('figure.Moving_average_forecast')
 def Moving_average_forecast(forecast):
-    fig = go.Figure()
-
-    # Actual Close Price
-    fig.add_trace(go.Scatter(
-        x=forecast.index[:-30], 
-        y=forecast['Close'].iloc[:-30],
-        mode='lines',
-        name='Close Price', 
-        line=dict(width=2, color='black')
-    ))
-
-    # Forecasted Close Price
-    fig.add_trace(go.Scatter(
-        x=forecast.index[-31:], 
-        y=forecast['Close'].iloc[-31:],
-        mode='lines', 
-        name='Future Close Price', 
-        line=dict(width=2, color='red')
-    ))
-
-    # Update axes with scales
-    fig.update_xaxes(
-        title_text="Date",
-        showgrid=True,
-        showline=True,
-        ticks="outside",
-        showticklabels=True,
-        linecolor='black',
-        tickfont=dict(color='black'),
-        title_font=dict(color='black')
-    )
-    fig.update_yaxes(
-        title_text="Close Price",
-        showgrid=True,
-        showline=True,
-        ticks="outside",
-        showticklabels=True,
-        linecolor='black',
-        tickfont=dict(color='black'),
-        title_font=dict(color='black')
-    )
-
-    # Layout customization
-    fig.update_layout(
-        height=500,
-        margin=dict(l=0, r=20, t=20, b=0), 
-        plot_bgcolor='black',
-        paper_bgcolor='#e1efff',
-        legend=dict(
-            yanchor="top",
-            xanchor="right",
-            font=dict(color='black')  # Legend font color
-        ),
-        xaxis_rangeslider_visible=True
-    )
-
-    return fig
+    # Actual close price, then the forecast joined to the last actual close
+    return build_figure('forecast',
+                        line_values(forecast.index[:-30], forecast['Close'].iloc[:-30]),
+                        line_values(forecast.index[-31:], forecast['Close'].iloc[-31:]))
@@ -0,0 +1,156 @@
+import os
+import json
+import pandas as pd
+from pages.utils.tracing import traced
+from pages.utils.lazy import lazy_import
+
+# Price providers: Yahoo, or a fixture directory for offline runs
+
+yf = lazy_import('yfinance')
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def empty_frame():
+    return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name='Date'), dtype='float64')
+
+
+# Bring a provider frame into the store layout: flat OHLCV columns and a
+# tz-naive, sorted, de-duplicated daily index named 'Date'
+def normalize_frame(df):
+    if df is None or df.empty:
+        return empty_frame()
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        for level in range(df.columns.nlevels):
+            if 'Close' in df.columns.get_level_values(level):
+                df.columns = df.columns.get_level_values(level)
+                break
+    df = df[[col for col in OHLCV_COLUMNS if col in df.columns]]
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df.index = index.normalize()
+    df.index.name = 'Date'
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    return df.astype('float64')
+
+
+def _date_str(value):
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+class PriceProvider:
+    name = 'base'
+
+    # Source the bars come from, e.g. 'yahoo' or 'fixture:<directory>'.
+    # Providers compare and hash by it, so cached loads key on the source
+    # rather than on the instance.
+    @property
+    def key(self):
+        return self.name
+
+    def __eq__(self, other):
+        return isinstance(other, PriceProvider) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    # Bars for one ticker in [start, end); raises when nothing can be fetched
+    def fetch(self, ticker, start, end):
+        raise NotImplementedError
+
+    # Company profile and fundamentals (yfinance .info layout)
+    def fetch_info(self, ticker):
+        return {}
+
+    # Bars for several tickers in one request where the source supports it.
+    # Tickers that could not be fetched are simply left out of the result.
+    def fetch_batch(self, tickers, start, end):
+        frames = {}
+        for ticker in tickers:
+            try:
+                frames[ticker] = self.fetch(ticker, start, end)
+            except Exception:
+                continue
+        return frames
+
+
+class YahooProvider(PriceProvider):
+    name = 'yahoo'
+
+    @traced('fetch.yahoo.download')
+    def fetch(self, ticker, start, end):
+        data = yf.download(ticker, start=_date_str(start), end=_date_str(end),
+                           progress=False, auto_adjust=True, threads=False)
+        data = normalize_frame(data)
+        if data.empty:
+            raise LookupError(f"No price data returned for {ticker}")
+        return data
+
+    @traced('fetch.yahoo.info')
+    def fetch_info(self, ticker):
+        return yf.Ticker(ticker).info
+
+    @traced('fetch.yahoo.batch')
+    def fetch_batch(self, tickers, start, end):
+        if len(tickers) == 1:
+            return super().fetch_batch(tickers, start, end)
+        data = yf.download(list(tickers), start=_date_str(start), end=_date_str(end),
+                           progress=False, auto_adjust=True, threads=True, group_by='ticker')
+        frames = {}
+        if data is None or data.empty or not isinstance(data.columns, pd.MultiIndex):
+            return frames
+        available = set(data.columns.get_level_values(0))
+        for ticker in tickers:
+            if ticker not in available:
+                continue
+            frame = normalize_frame(data[ticker].dropna(how='all'))
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+
+# Reads <directory>/<TICKER>.parquet or <TICKER>.csv (Date index + OHLCV columns)
+class FixtureProvider(PriceProvider):
+    name = 'fixture'
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    @property
+    def key(self):
+        return f"{self.name}:{os.path.abspath(self.directory)}"
+
+    def _load(self, ticker):
+        base = os.path.join(self.directory, ticker.upper())
+        if os.path.exists(base + '.parquet'):
+            return normalize_frame(pd.read_parquet(base + '.parquet'))
+        if os.path.exists(base + '.csv'):
+            return normalize_frame(pd.read_csv(base + '.csv', index_col=0, parse_dates=True))
+        raise FileNotFoundError(f"No fixture file for {ticker} in {self.directory}")
+
+    def fetch_info(self, ticker):
+        path = os.path.join(self.directory, ticker.upper() + '.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    @traced('fetch.fixture')
+    def fetch(self, ticker, start, end):
+        data = self._load(ticker)
+        left = data.index.searchsorted(pd.Timestamp(start), side='left')
+        right = data.index.searchsorted(pd.Timestamp(end), side='left')
+        data = data.iloc[left:right]
+        if data.empty:
+            raise LookupError(f"No price data returned for {ticker}")
+        return data
+
+
+# Provider selected with TRADEZY_PROVIDER: 'yahoo' (default) or 'fixture:<directory>'
+def get_provider():
+    setting = os.environ.get('TRADEZY_PROVIDER', 'yahoo')
+    if setting.startswith('fixture:'):
+        return FixtureProvider(setting.split(':', 1)[1])
+    return YahooProvider()
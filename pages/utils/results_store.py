@@ -0,0 +1,78 @@
+import os
+import json
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pages.utils.data_store import STORE_DIR
+from pages.utils.storage import atomic_write
+
+# Finished forecasts, one Parquet file per (ticker, order mode), written by
+# batch_forecast.py and the prediction page
+
+RESULTS_DIR = os.path.join(STORE_DIR, 'forecasts')
+METADATA_KEY = b'tradezy_forecast'
+MAX_AGE_HOURS = float(os.environ.get('TRADEZY_FORECAST_MAX_AGE_HOURS', 24))
+
+
+def _result_path(ticker, auto_order):
+    mode = 'auto' if auto_order else 'fixed'
+    return os.path.join(RESULTS_DIR, f"{ticker.upper().replace('/', '_')}_{mode}.parquet")
+
+
+def save_forecast(ticker, auto_order, result):
+    path = _result_path(ticker, auto_order)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame = pd.DataFrame({'Rolling': result['rolling_price']['Close'], 'Forecast': result['forecast']['Close']})
+    frame.index.name = 'Date'
+    order_table = result.get('order_table')
+    meta = {
+        'ticker': ticker.upper(),
+        'auto_order': bool(auto_order),
+        'created_at': time.time(),
+        'rmse': float(result['rmse']),
+        'order': list(result['order']),
+        'order_table': None if order_table is None else order_table.astype({'order': str}).to_dict('records'),
+        'backtest': result.get('backtest'),
+    }
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps(meta)
+    table = table.replace_schema_metadata(metadata)
+    with atomic_write(path) as tmp_path:
+        pq.write_table(table, tmp_path)
+
+
+# Stored result in the run_forecast layout (plus 'created_at' and
+# 'backtest'), or None when missing or older than max_age_hours
+def load_forecast(ticker, auto_order, max_age_hours=MAX_AGE_HOURS):
+    path = _result_path(ticker, auto_order)
+    if not os.path.exists(path):
+        return None
+    table = pq.read_table(path)
+    meta = json.loads(table.schema.metadata[METADATA_KEY])
+    if time.time() - meta['created_at'] > max_age_hours * 3600:
+        return None
+    frame = table.to_pandas()
+    return {
+        'rmse': meta['rmse'],
+        'forecast': frame[['Forecast']].dropna().rename(columns={'Forecast': 'Close'}),
+        'rolling_price': frame[['Rolling']].dropna().rename(columns={'Rolling': 'Close'}),
+        'order': tuple(meta['order']),
+        'order_table': None if meta['order_table'] is None else pd.DataFrame(meta['order_table']),
+        'created_at': pd.Timestamp(meta['created_at'], unit='s'),
+        'backtest': meta['backtest'],
+    }
+
+
+# One row per stored forecast: ticker, order mode, age and headline metrics
+def stored_forecasts():
+    rows = []
+    if os.path.isdir(RESULTS_DIR):
+        for name in sorted(os.listdir(RESULTS_DIR)):
+            if not name.endswith('.parquet'):
+                continue
+            meta = json.loads(pq.read_schema(os.path.join(RESULTS_DIR, name)).metadata[METADATA_KEY])
+            rows.append((meta['ticker'], meta['auto_order'], pd.Timestamp(meta['created_at'], unit='s'),
+                         meta['rmse'], tuple(meta['order'])))
+    return pd.DataFrame(rows, columns=['ticker', 'auto_order', 'created_at', 'rmse', 'order'])
@@ -0,0 +1,138 @@
+import numpy as np
+from pages.utils.tracing import traced
+from pages.utils.lazy import lazy_import
+
+# Returns and CAPM statistics over (n_days, n_assets) matrices
+
+# scipy is only needed by the EWMA estimator
+signal = lazy_import('scipy.signal')
+
+# Share of a rolling window that must hold valid pairs (rolling_beta_alpha)
+MIN_PERIODS_FRACTION = 0.8
+
+
+def as_matrix(values):
+    matrix = np.asarray(values, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(-1, 1)
+    return matrix
+
+
+# Simple returns, first row set to 0 (percent=True gives returns * 100)
+def simple_returns(prices, percent=False):
+    prices = as_matrix(prices)
+    returns = np.zeros_like(prices)
+    np.divide(np.diff(prices, axis=0), prices[:-1], out=returns[1:])
+    if percent:
+        returns *= 100
+    return returns
+
+
+# Log returns, first row set to 0
+def log_returns(prices):
+    prices = as_matrix(prices)
+    returns = np.zeros_like(prices)
+    returns[1:] = np.diff(np.log(prices), axis=0)
+    return returns
+
+
+# Prices rebased to the first row, so every column starts at 1
+def normalize_prices(prices):
+    prices = as_matrix(prices)
+    return prices / prices[0]
+
+
+# OLS beta and alpha of every column of returns against the benchmark
+# returns, from one closed-form covariance pass:
+#   beta = cov(x, y) / var(x),  alpha = mean(y) - beta * mean(x)
+@traced('risk.beta_alpha')
+def beta_alpha(returns, benchmark):
+    returns = as_matrix(returns)
+    benchmark = np.asarray(benchmark, dtype=np.float64).ravel()
+    benchmark_mean = benchmark.mean()
+    centered = benchmark - benchmark_mean
+    beta = (centered @ returns) / (centered @ centered)
+    alpha = returns.mean(axis=0) - beta * benchmark_mean
+    return beta, alpha
+
+
+# CAPM expected return for each beta, rm and rf in the same units
+def capm_expected_return(beta, rm, rf=0):
+    return rf + np.asarray(beta, dtype=np.float64) * (rm - rf)
+
+
+# Per-window moments of (benchmark, returns) pairs as running sums. Missing
+# values are masked per column, so one asset's gaps only drop its own pairs.
+# Both series are demeaned first to keep the differences of cumulative sums
+# well conditioned; the means are added back to alpha.
+def _paired_moments(returns, benchmark):
+    returns = as_matrix(returns)
+    benchmark = np.asarray(benchmark, dtype=np.float64).reshape(-1, 1)
+    valid = ~np.isnan(returns) & ~np.isnan(benchmark)
+    x_mean = np.nanmean(benchmark)
+    y_mean = np.nanmean(np.where(valid, returns, np.nan), axis=0)
+    x = np.where(valid, benchmark - x_mean, 0.0)
+    y = np.where(valid, returns - y_mean, 0.0)
+    return valid.astype(np.float64), x, y, x_mean, y_mean
+
+
+def _beta_from_sums(n, sx, sy, sxy, sxx, x_mean, y_mean, min_periods):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = sxx - sx * sx / n
+        beta = (sxy - sx * sy / n) / var
+        alpha = (sy - beta * sx) / n + y_mean - beta * x_mean
+    enough = (n >= min_periods) & (var > 0)
+    return np.where(enough, beta, np.nan), np.where(enough, alpha, np.nan)
+
+
+# Rolling-window OLS beta and alpha of every column against the benchmark,
+# (n_days, n_assets) each. Window sums come from cumulative sums of x, y, xy
+# and x^2, so each window costs O(1) whatever its length. Rows with fewer
+# than min_periods valid pairs in the window are NaN; by default
+# MIN_PERIODS_FRACTION of the window, so one missing day (an unscheduled
+# closure, a halted stock) does not blank out a whole window's worth of rows.
+@traced('risk.rolling_beta')
+def rolling_beta_alpha(returns, benchmark, window, min_periods=None):
+    valid, x, y, x_mean, y_mean = _paired_moments(returns, benchmark)
+    sums = []
+    for values in (valid, x, y, x * y, x * x):
+        cumulative = np.zeros((values.shape[0] + 1, values.shape[1]))
+        np.cumsum(values, axis=0, out=cumulative[1:])
+        windowed = cumulative[1:].copy()
+        windowed[window:] -= cumulative[1:-window]
+        sums.append(windowed)
+    return _beta_from_sums(*sums, x_mean, y_mean, min_periods or int(MIN_PERIODS_FRACTION * window))
+
+
+# Exponentially weighted beta and alpha (weights halve every halflife days),
+# from the same sums run through a first order recursive filter
+@traced('risk.ewma_beta')
+def ewma_beta_alpha(returns, benchmark, halflife, min_periods=20):
+    valid, x, y, x_mean, y_mean = _paired_moments(returns, benchmark)
+    decay = 0.5 ** (1.0 / halflife)
+    sums = [signal.lfilter([1.0], [1.0, -decay], values, axis=0) for values in (valid, x, y, x * y, x * x)]
+    beta, alpha = _beta_from_sums(*sums, x_mean, y_mean, 0)
+    # Weighted sums above decay, so the warm-up is judged on the plain count
+    enough = np.cumsum(valid, axis=0) >= min_periods
+    return np.where(enough, beta, np.nan), np.where(enough, alpha, np.nan)
+
+
+# Full-sample OLS of every column against the benchmark over its own valid
+# pairs: observation count, beta, alpha, residual standard deviation and R^2
+@traced('risk.regression_stats')
+def regression_stats(returns, benchmark):
+    valid, x, y, x_mean, y_mean = _paired_moments(returns, benchmark)
+    n = valid.sum(axis=0)
+    sx, sy = x.sum(axis=0), y.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sxx = np.einsum('ij,ij->j', x, x) - sx * sx / n
+        syy = np.einsum('ij,ij->j', y, y) - sy * sy / n
+        sxy = np.einsum('ij,ij->j', x, y) - sx * sy / n
+        beta = sxy / sxx
+        alpha = (sy - beta * sx) / n + y_mean - beta * x_mean
+        residual = np.maximum(syy - beta * sxy, 0.0)
+        residual_std = np.sqrt(residual / (n - 2))
+        r_squared = sxy * sxy / (sxx * syy)
+    ok = (n > 2) & (sxx > 0)
+    return (n.astype(np.int64), np.where(ok, beta, np.nan), np.where(ok, alpha, np.nan),
+            np.where(ok, residual_std, np.nan), np.where(ok, r_squared, np.nan))
@@ -0,0 +1,119 @@
+import os
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from pages.utils.model_cache import fingerprint
+from pages.utils.tracing import traced
+from pages.utils.lazy import lazy_import
+
+# ADF checks for the differencing order: bounded, cached per series,
+# optionally fixed-lag and parallel
+
+stattools = lazy_import('statsmodels.tsa.stattools')
+
+MAX_DIFFERENCING = 2
+SIGNIFICANCE = 0.05
+CACHE_ENTRIES = 4096
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _values(series):
+    return np.asarray(series, dtype=np.float64).ravel()
+
+
+# Schwert's rule, the lag statsmodels starts its autolag search from
+def fixed_lag(n_obs):
+    return int(np.ceil(12.0 * np.power(n_obs / 100.0, 1 / 4.0)))
+
+
+def adf_pvalue(values, fast=False):
+    if fast:
+        result = stattools.adfuller(values, maxlag=min(fixed_lag(len(values)), len(values) // 2 - 2), autolag=None)
+    else:
+        result = stattools.adfuller(values)
+    return round(result[1], 3)
+
+
+def _cache_get(key):
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    return None
+
+
+def _cache_set(key, p_value):
+    with _lock:
+        _cache[key] = p_value
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_ENTRIES:
+            _cache.popitem(last=False)
+
+
+# ADF p-value (rounded to 3 places) of the series differenced d times
+def stationarity_pvalue(series, d=0, fast=False):
+    values = _values(series)
+    key = (fingerprint(values), d, fast)
+    p_value = _cache_get(key)
+    if p_value is None:
+        p_value = adf_pvalue(np.diff(values, n=d) if d else values, fast)
+        _cache_set(key, p_value)
+    return p_value
+
+
+# Smallest d <= max_d whose differenced series passes the ADF test at
+# SIGNIFICANCE; max_d when none does
+@traced('model.differencing_order')
+def differencing_order(series, max_d=MAX_DIFFERENCING, fast=False):
+    values = _values(series)
+    for d in range(max_d + 1):
+        if stationarity_pvalue(values, d, fast) <= SIGNIFICANCE:
+            return d
+    return max_d
+
+
+def _search_worker(values, max_d, fast):
+    p_values = []
+    for d in range(max_d + 1):
+        p_values.append(adf_pvalue(np.diff(values, n=d) if d else values, fast))
+        if p_values[-1] <= SIGNIFICANCE:
+            break
+    return p_values
+
+
+# {ticker: d} for many series at once; cached results are answered directly
+# and the rest are tested in parallel worker processes
+@traced('model.differencing_orders')
+def differencing_orders(series_by_ticker, max_d=MAX_DIFFERENCING, fast=False, max_workers=MAX_WORKERS):
+    orders = {}
+    pending = {}
+    for ticker, series in series_by_ticker.items():
+        values = _values(series)
+        keys = [(fingerprint(values), d, fast) for d in range(max_d + 1)]
+        for d, key in enumerate(keys):
+            p_value = _cache_get(key)
+            if p_value is None:
+                pending[ticker] = (values, keys)
+                break
+            if p_value <= SIGNIFICANCE:
+                orders[ticker] = d
+                break
+        else:
+            orders[ticker] = max_d
+
+    if pending:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(pending)), mp_context=context) as pool:
+            futures = {ticker: pool.submit(_search_worker, values, max_d, fast)
+                       for ticker, (values, _) in pending.items()}
+            for ticker, future in futures.items():
+                p_values = future.result()
+                for key, p_value in zip(pending[ticker][1], p_values):
+                    _cache_set(key, p_value)
+                orders[ticker] = len(p_values) - 1 if p_values[-1] <= SIGNIFICANCE else max_d
+    return orders
@@ -0,0 +1,27 @@
+import os
+import threading
+import contextlib
+
+# File helpers shared by the on-disk stores
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+# Process-wide lock for one key of a store, e.g. keyed_lock('prices', 'AAPL')
+def keyed_lock(namespace, key):
+    with _locks_guard:
+        return _locks.setdefault((namespace, key), threading.Lock())
+
+
+# Yields a temporary path to write instead of path; it replaces path when
+# the block succeeds, so readers never see a partial file
+@contextlib.contextmanager
+def atomic_write(path):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
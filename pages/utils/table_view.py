@@ -0,0 +1,118 @@
+import os
+import math
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import streamlit as st
+from pages.utils.tracing import traced
+
+# Paginated tables: server-side sort, vectorized formatting and an LRU of
+# formatted pages keyed by frame content
+
+PAGE_SIZE = int(os.environ.get('TRADEZY_TABLE_PAGE_SIZE', 50))
+MAX_PAGES = 256
+ROW_HEIGHT_PX = 35
+
+_pages = OrderedDict()
+_orders = OrderedDict()
+_lock = threading.Lock()
+
+
+# Content hash of a frame: values, index and column labels
+def frame_token(frame):
+    digest = hashlib.sha1(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    digest.update(repr(list(frame.columns)).encode())
+    return digest.hexdigest()[:16]
+
+
+def _remember(store, key, value):
+    with _lock:
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > MAX_PAGES:
+            store.popitem(last=False)
+
+
+def _lookup(store, key):
+    with _lock:
+        value = store.get(key)
+        if value is not None:
+            store.move_to_end(key)
+        return value
+
+
+# Row positions of the frame in display order; missing values sort last
+def _row_order(frame, token, sort_by, ascending):
+    key = (token, sort_by, ascending)
+    order = _lookup(_orders, key)
+    if order is None:
+        values = pd.Series(frame.index) if sort_by is None else frame[sort_by].reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, na_position='last', kind='stable').index.to_numpy()
+        _remember(_orders, key, order)
+    return order
+
+
+def _dates_if_daily(values):
+    values = np.asarray(values, dtype='datetime64[ns]')
+    days = values.astype('datetime64[D]')
+    if (days == values).all():
+        return np.datetime_as_string(days, unit='D')
+    return values
+
+
+# Display copy of a page: float columns rounded together, timestamps without
+# a time of day shown as dates
+@traced('table.format')
+def format_page(page, decimals=3):
+    page = page.copy()
+    floats = page.select_dtypes(include='floating').columns
+    if len(floats):
+        page[floats] = np.round(page[floats].to_numpy(), decimals)
+    for name in page.select_dtypes(include='datetime').columns:
+        page[name] = _dates_if_daily(page[name])
+    if isinstance(page.index, pd.DatetimeIndex) and page.index.tz is None:
+        page.index = pd.Index(_dates_if_daily(page.index), name=page.index.name)
+    return page
+
+
+def table_page(frame, page=0, page_size=PAGE_SIZE, sort_by=None, ascending=True, decimals=3, token=None):
+    token = token or frame_token(frame)
+    key = (token, page, page_size, sort_by, ascending, decimals)
+    formatted = _lookup(_pages, key)
+    if formatted is None:
+        rows = _row_order(frame, token, sort_by, ascending)[page * page_size:(page + 1) * page_size]
+        formatted = format_page(frame.iloc[rows], decimals)
+        _remember(_pages, key, formatted)
+    return formatted
+
+
+# Streamlit table showing one page of frame at a time, with server-side
+# sorting. key must be unique on the page; column_config is passed on to
+# st.dataframe.
+def paged_table(frame, key, page_size=PAGE_SIZE, sort_by=None, ascending=True, decimals=3,
+                column_config=None, sortable=True):
+    n_rows = len(frame)
+    n_pages = max(1, math.ceil(n_rows / page_size))
+    index_label = frame.index.name or '(index)'
+
+    controls = st.columns([2, 1, 1, 3])
+    if sortable:
+        options = [index_label] + [str(name) for name in frame.columns]
+        default = options.index(str(sort_by)) if sort_by is not None and str(sort_by) in options else 0
+        with controls[0]:
+            choice = st.selectbox("Sort by", options, index=default, key=f'{key}_sort')
+        with controls[1]:
+            ascending = st.toggle("Ascending", value=ascending, key=f'{key}_ascending')
+        sort_by = None if choice == index_label else frame.columns[options.index(choice) - 1]
+    with controls[2]:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, key=f'{key}_page') - 1
+    page = min(page, n_pages - 1)
+
+    view = table_page(frame, page, page_size, sort_by, ascending, decimals)
+    first = page * page_size
+    with controls[3]:
+        st.caption(f"Rows {first + 1 if n_rows else 0}-{first + len(view)} of {n_rows} (page {page + 1} of {n_pages})")
+    st.dataframe(view, use_container_width=True, column_config=column_config,
+                 height=ROW_HEIGHT_PX * (min(page_size, max(len(view), 1)) + 1) + 3)
@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import atexit
+import threading
+import functools
+import itertools
+from collections import deque
+import pandas as pd
+from pages.utils.storage import atomic_write
+
+# Named timing spans for the debug panel, with JSON lines and Prometheus
+# export; a flag check when tracing is off. TRADEZY_TRACE=1 traces the whole
+# process, a session traces only its own script runs.
+
+ENABLED = os.environ.get('TRADEZY_TRACE', '0') == '1'
+TRACE_FILE = os.environ.get('TRADEZY_TRACE_FILE')
+MAX_SPANS = 5000
+PROMETHEUS_INTERVAL = 5.0
+
+_spans = deque(maxlen=MAX_SPANS)
+_totals = {}
+_lock = threading.Lock()
+_local = threading.local()
+_sequence = itertools.count(1)
+_last_export = [0.0]
+
+
+# Tags the spans of the current thread (a session's script run) with the
+# session id and traces them when enabled, whatever the process setting
+def set_session(session, enabled=False):
+    _local.session = session
+    _local.enabled = enabled
+
+
+def _tracing():
+    return ENABLED or getattr(_local, 'enabled', False)
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def end(self):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'parent', 'session', 'started', 'duration', 'seq', '_t0')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+        self.session = getattr(_local, 'session', None)
+        self.duration = None
+        self.seq = None
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._t0
+        stack = _stack()
+        if self in stack:
+            del stack[stack.index(self):]
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        _record(self)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def end(self):
+        if self.duration is None:
+            self.__exit__(None, None, None)
+
+    def to_dict(self):
+        return {'seq': self.seq, 'name': self.name, 'parent': self.parent, 'start': self.started,
+                'ms': round(self.duration * 1000, 3), 'pid': os.getpid(), 'session': self.session, **self.attrs}
+
+
+def _record(span):
+    with _lock:
+        span.seq = next(_sequence)
+        _spans.append(span)
+        totals = _totals.setdefault(span.name, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += span.duration
+        totals[2] = max(totals[2], span.duration)
+    if TRACE_FILE:
+        _export(span)
+
+
+def _export(span):
+    if TRACE_FILE.endswith('.prom'):
+        now = time.time()
+        if now - _last_export[0] >= PROMETHEUS_INTERVAL:
+            _last_export[0] = now
+            write_prometheus(TRACE_FILE)
+        return
+    # One short append per span; lines from several processes do not interleave
+    with open(TRACE_FILE, 'a') as f:
+        f.write(json.dumps(span.to_dict(), default=str) + '\n')
+
+
+# Context manager timing a block: `with span('data.fetch', tickers=3): ...`
+def span(name, **attrs):
+    if not _tracing():
+        return _NOOP
+    return Span(name, attrs)
+
+
+# Span opened now and closed with .end(); root=True drops spans left open by
+# an earlier script run on this thread (e.g. one cut short by st.stop())
+def begin(name, root=False, **attrs):
+    if not _tracing():
+        return _NOOP
+    if root:
+        _stack().clear()
+    return Span(name, attrs).__enter__()
+
+
+# Decorator recording a span around every call of the function
+def traced(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracing():
+                return func(*args, **kwargs)
+            with Span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_sequence():
+    with _lock:
+        return _spans[-1].seq if _spans else 0
+
+
+# Spans recorded after sequence number since, optionally of one session only
+def _selected(since, session):
+    return [span for span in _spans if span.seq > since and (session is None or span.session == session)]
+
+
+def span_table(since=0, session=None):
+    with _lock:
+        rows = [span.to_dict() for span in _selected(since, session)]
+    return pd.DataFrame(rows, columns=None if rows else ['seq', 'name', 'parent', 'start', 'ms', 'pid', 'session'])
+
+
+def summary_table():
+    with _lock:
+        rows = [(name, count, total, total / count, peak) for name, (count, total, peak) in _totals.items()]
+    table = pd.DataFrame(rows, columns=['span', 'count', 'total_s', 'mean_s', 'max_s'])
+    return table.sort_values('total_s', ascending=False).reset_index(drop=True)
+
+
+def jsonl_text(since=0, session=None):
+    with _lock:
+        return ''.join(json.dumps(span.to_dict(), default=str) + '\n' for span in _selected(since, session))
+
+
+def prometheus_text():
+    with _lock:
+        totals = sorted(_totals.items())
+    lines = ['# HELP tradezy_span_seconds Time spent in traced spans.', '# TYPE tradezy_span_seconds summary']
+    for name, (count, total, _) in totals:
+        lines.append(f'tradezy_span_seconds_count{{span="{name}"}} {count}')
+        lines.append(f'tradezy_span_seconds_sum{{span="{name}"}} {total:.6f}')
+    lines += ['# HELP tradezy_span_seconds_max Longest single span.', '# TYPE tradezy_span_seconds_max gauge']
+    for name, (_, _, peak) in totals:
+        lines.append(f'tradezy_span_seconds_max{{span="{name}"}} {peak:.6f}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path):
+    with atomic_write(path) as tmp_path, open(tmp_path, 'w') as f:
+        f.write(prometheus_text())
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _totals.clear()
+
+
+@atexit.register
+def _flush():
+    if TRACE_FILE and TRACE_FILE.endswith('.prom') and _totals:
+        write_prometheus(TRACE_FILE)
@@ -0,0 +1,62 @@
+import os
+import numpy as np
+import pandas as pd
+from pages.utils.data_store import stored_tickers
+from pages.utils.data_store import read_closes
+from pages.utils.benchmarks import load_benchmark
+from pages.utils.risk_engine import regression_stats
+from pages.utils.risk_engine import capm_expected_return
+from pages.utils.cache import cached
+from pages.utils.tracing import traced
+
+# CAPM statistics for every stored ticker, in memory-bounded column chunks
+
+MEMORY_MB = float(os.environ.get('TRADEZY_UNIVERSE_MEMORY_MB', 256))
+# float64 (days, chunk) matrices alive at once: closes, returns, mask,
+# demeaned x and y and one product
+WORKING_MATRICES = 6
+TRADING_DAYS = 252
+MIN_OBSERVATIONS = 60
+
+UNIVERSE_COLUMNS = ['Observations', 'Beta', 'Alpha', 'Expected Return', 'Residual Vol', 'R2']
+
+
+def chunk_size(n_days, memory_mb=MEMORY_MB):
+    return max(1, int(memory_mb * 1024 * 1024 // (max(n_days, 1) * 8 * WORKING_MATRICES)))
+
+
+# Percent returns; NaN where either bar is missing
+def _percent_returns(closes):
+    return (closes[1:] / closes[:-1] - 1) * 100
+
+
+# One row per ticker: beta and alpha on daily percent returns, annualized
+# CAPM expected return and residual volatility (percent), and R^2.
+# benchmark is a close Series whose index is the trading calendar used.
+@traced('risk.capm_universe')
+def capm_universe(tickers, benchmark, rf=0, min_observations=MIN_OBSERVATIONS, memory_mb=MEMORY_MB):
+    benchmark = benchmark.dropna()
+    market = _percent_returns(benchmark.to_numpy(dtype=np.float64))
+    rm = np.nanmean(market) * TRADING_DAYS
+    size = chunk_size(len(benchmark), memory_mb)
+
+    blocks = []
+    for first in range(0, len(tickers), size):
+        chunk = tickers[first:first + size]
+        returns = _percent_returns(read_closes(chunk, benchmark.index))
+        n, beta, alpha, residual_std, r_squared = regression_stats(returns, market)
+        blocks.append(np.column_stack([n, beta, alpha, capm_expected_return(beta, rm, rf),
+                                       residual_std * np.sqrt(TRADING_DAYS), r_squared]))
+
+    values = np.vstack(blocks) if blocks else np.empty((0, len(UNIVERSE_COLUMNS)))
+    table = pd.DataFrame(values, index=pd.Index(tickers, name='Stock'), columns=UNIVERSE_COLUMNS)
+    table['Observations'] = table['Observations'].astype(np.int64)
+    return table[table['Observations'] >= min_observations]
+
+
+# capm_universe over every stored ticker against the FRED S&P 500
+@cached('prices')
+def load_universe_capm(start, end, rf=0, min_observations=MIN_OBSERVATIONS):
+    sp500 = load_benchmark('SP500', start, end).iloc[:, 0]
+    sp500.index = pd.to_datetime(sp500.index).normalize()
+    return capm_universe(stored_tickers(), sp500, rf, min_observations)
@@ -0,0 +1,39 @@
+import pandas as pd
+from pages.utils.data_store import PERIOD_OFFSETS
+
+# Chart windows as zero-copy iloc slices of one history
+
+
+# First date of a period window, counted back from the last bar
+def period_start(index, period):
+    period = (period or 'max').lower()
+    last = index[-1]
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(last.year, 1, 1)
+    return last - PERIOD_OFFSETS[period]
+
+
+# (left, right) positions of a period window; like the old filter_data the
+# start date itself is excluded ('1y' = bars after the date one year back)
+def period_bounds(index, period):
+    if len(index) == 0:
+        return 0, 0
+    start = period_start(index, period)
+    if start is None:
+        return 0, len(index)
+    return index.searchsorted(start, side='right'), len(index)
+
+
+def slice_period(dataframe, period):
+    left, right = period_bounds(dataframe.index, period)
+    return dataframe.iloc[left:right]
+
+
+# Bars in [start, end), matching yf.download's start/end semantics
+def slice_range(dataframe, start=None, end=None):
+    index = dataframe.index
+    left = 0 if start is None else index.searchsorted(pd.Timestamp(start), side='left')
+    right = len(index) if end is None else index.searchsorted(pd.Timestamp(end), side='left')
+    return dataframe.iloc[left:right]
@@ -0,0 +1,30 @@
+import os
+import tempfile
+import pytest
+import numpy as np
+import pandas as pd
+
+# Keep the stores of a test run out of the repo; set before pages.utils is imported
+os.environ.setdefault('TRADEZY_STORE_DIR', tempfile.mkdtemp(prefix='tradezy_tests_'))
+
+
+# Price store in a fresh directory for one test
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    from pages.utils import data_store
+    monkeypatch.setattr(data_store, 'STORE_DIR', str(tmp_path))
+    return tmp_path
+
+
+# 600 business days of a random walk with consistent OHLCV bars
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(3)
+    n = 600
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n)))
+    open_ = close * (1 + rng.normal(0, 0.004, n))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n))
+    volume = rng.integers(100_000, 5_000_000, n).astype('float64')
+    index = pd.bdate_range('2021-01-04', periods=n, name='Date')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
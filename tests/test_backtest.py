@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.arima.model import ARIMA
+from pages.utils.backtest import fold_origins, walk_forward, backtest_many
+
+
+@pytest.fixture(scope='module')
+def series():
+    return 100 + np.cumsum(np.random.default_rng(7).normal(0.05, 1, 400))
+
+
+def test_fold_origins_leave_a_full_horizon():
+    assert fold_origins(400, 3, 30) == [310, 340, 370]
+    assert fold_origins(400, 10, 30, step=10) == list(range(280, 371, 10))
+    assert fold_origins(200, 10, 30) == [110, 140, 170]
+    with pytest.raises(ValueError):
+        fold_origins(120, 3, 30)
+
+
+def test_chunks_fit_once_then_append(series):
+    folds = walk_forward(series, (1, 1, 0), n_folds=6, horizon=10, max_workers=2).folds
+    assert folds['fold'].tolist() == list(range(6))
+    assert folds['origin'].tolist() == fold_origins(400, 6, 10)
+    assert folds['update'].tolist() == ['fit', 'append', 'append', 'fit', 'append', 'append']
+    assert (folds['rmse'] >= folds['mae']).all()
+
+
+def test_first_fold_matches_a_direct_fit(series):
+    folds = walk_forward(series, (1, 1, 0), n_folds=3, horizon=10, max_workers=1).folds
+    origin = folds['origin'].iloc[0]
+    errors = ARIMA(series[:origin], order=(1, 1, 0)).fit().forecast(10) - series[origin:origin + 10]
+    assert folds['rmse'].iloc[0] == pytest.approx(np.sqrt(np.mean(errors ** 2)))
+
+
+def test_many_tickers_are_summarized_per_ticker(series):
+    result = backtest_many({'AAA': series, 'BBB': series[::-1].copy()}, {'AAA': (1, 1, 0), 'BBB': (0, 1, 1)},
+                           n_folds=3, horizon=10, max_workers=2)
+    assert result.summary['folds'].to_dict() == {'AAA': 3, 'BBB': 3}
+    assert result.folds.groupby('ticker')['update'].first().tolist() == ['fit', 'fit']
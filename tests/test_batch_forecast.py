@@ -0,0 +1,62 @@
+import argparse
+import pandas as pd
+import pytest
+import batch_forecast
+from pages.utils import results_store
+
+
+@pytest.fixture(autouse=True)
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(results_store, 'RESULTS_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _result():
+    rolling = pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=pd.bdate_range('2024-01-01', periods=3, name='Date'))
+    forecast = pd.DataFrame({'Close': [3.5, 4.0]}, index=pd.date_range('2024-01-04', periods=2, name='Date'))
+    return {'rmse': 0.25, 'forecast': forecast, 'rolling_price': rolling, 'order': (30, 1, 30), 'order_table': None}
+
+
+def test_tickers_from_arguments_and_file(tmp_path):
+    path = tmp_path / 'tickers.txt'
+    path.write_text('aapl  # Apple\n\n# comment\nMSFT\nAAPL\n')
+    args = argparse.Namespace(tickers=['tsla'], file=str(path))
+    assert batch_forecast._read_tickers(args) == ['TSLA', 'AAPL', 'MSFT']
+
+
+def test_no_tickers_is_a_usage_error():
+    with pytest.raises(SystemExit):
+        batch_forecast.main([])
+
+
+def test_forecast_ticker_stores_the_result(monkeypatch):
+    monkeypatch.setattr(batch_forecast, 'run_forecast', lambda ticker, auto_order, backtest_folds: _result())
+    rmse, order, backtest, _ = batch_forecast.forecast_ticker('AAPL')
+    assert (rmse, order, backtest) == (0.25, (30, 1, 30), None)
+
+    stored = results_store.load_forecast('AAPL', False)
+    pd.testing.assert_frame_equal(stored['forecast'], _result()['forecast'], check_freq=False)
+    pd.testing.assert_frame_equal(stored['rolling_price'], _result()['rolling_price'], check_freq=False)
+    assert stored['order'] == (30, 1, 30) and stored['backtest'] is None
+    assert results_store.load_forecast('AAPL', True) is None
+
+
+def test_old_forecasts_are_not_served():
+    results_store.save_forecast('AAPL', False, _result())
+    assert results_store.load_forecast('AAPL', False, max_age_hours=1) is not None
+    assert results_store.load_forecast('AAPL', False, max_age_hours=0) is None
+
+
+def test_backtest_from_run_forecast_is_stored(monkeypatch):
+    backtest = {'folds': 5, 'rmse': 0.5, 'mae': 0.4, 'fit_seconds': 2.0}
+    monkeypatch.setattr(batch_forecast, 'run_forecast',
+                        lambda ticker, auto_order, backtest_folds: {**_result(), 'backtest': backtest})
+    assert batch_forecast.forecast_ticker('AAPL', backtest_folds=5)[2] == backtest
+    assert results_store.load_forecast('AAPL', False)['backtest'] == backtest
+
+
+def test_list_prints_the_stored_forecasts(capsys):
+    results_store.save_forecast('AAPL', True, _result())
+    assert batch_forecast.main(['--list']) == 0
+    out = capsys.readouterr().out
+    assert 'AAPL' in out and '(30, 1, 30)' in out
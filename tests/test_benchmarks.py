@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+from pages.utils import benchmarks
+from pages.utils.benchmarks import FileBenchmarkProvider
+
+T = pd.Timestamp
+
+
+class RecordingProvider(FileBenchmarkProvider):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.calls = []
+
+    def fetch(self, series, start, end):
+        self.calls.append((start, end))
+        return super().fetch(series, start, end)
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmarks, 'BENCHMARK_DIR', str(tmp_path / 'benchmarks'))
+    index = pd.bdate_range('2024-01-02', periods=60, name='DATE')
+    pd.DataFrame({'SP500': range(4000, 4060)}, index=index, dtype='float64').to_parquet(tmp_path / 'SP500.parquet')
+    return RecordingProvider(str(tmp_path))
+
+
+def test_later_loads_fetch_only_the_new_edge(provider):
+    benchmarks._load('SP500', T('2024-01-02'), T('2024-02-01'), provider)
+    loaded = benchmarks._load('SP500', T('2024-01-02'), T('2024-03-01'), provider)
+    assert provider.calls == [(T('2024-01-02'), T('2024-02-01')), (T('2024-02-01'), T('2024-03-01'))]
+    assert loaded.index.equals(pd.bdate_range('2024-01-02', '2024-02-29', name='DATE'))
+
+    benchmarks._load('SP500', T('2024-01-10'), T('2024-02-20'), provider)
+    assert len(provider.calls) == 2
+
+
+# FRED publishes with a lag: once stale, the edge after the last
+# observation is asked for again
+def test_late_observations_are_picked_up_after_refresh(provider, tmp_path, monkeypatch):
+    full = pd.read_parquet(tmp_path / 'SP500.parquet')
+    full.iloc[:15].to_parquet(tmp_path / 'SP500.parquet')
+    benchmarks._load('SP500', T('2024-01-02'), T('2024-02-01'), provider)
+    full.to_parquet(tmp_path / 'SP500.parquet')
+    assert len(benchmarks._load('SP500', T('2024-01-02'), T('2024-02-01'), provider)) == 15
+
+    monkeypatch.setattr(benchmarks, 'REFRESH_HOURS', 0)
+    reloaded = benchmarks._load('SP500', T('2024-01-02'), T('2024-02-01'), provider)
+    assert provider.calls[-1] == (full.index[14] + pd.Timedelta(days=1), T('2024-02-01'))
+    assert reloaded.index[-1] == T('2024-01-31')
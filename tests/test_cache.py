@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pages.utils import cache
+from pages.utils.cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, 'time', clock)
+    return clock
+
+
+def test_entry_expires_after_ttl(clock):
+    store = TTLCache()
+    store.set('prices', ('prices', 'f', 1), 'value', ttl=60)
+    clock.now += 59
+    assert store.get('prices', ('prices', 'f', 1)) == (True, 'value')
+    clock.now += 2
+    assert store.get('prices', ('prices', 'f', 1)) == (False, None)
+    stats = store.stats().loc['prices']
+    assert (stats['hits'], stats['misses'], stats['expirations'], stats['entries']) == (1, 1, 1, 0)
+
+
+def test_ttl_defaults_per_kind(clock, monkeypatch):
+    monkeypatch.setenv('TRADEZY_CACHE_TTL_INTRADAY', '5')
+    store = TTLCache()
+    store.set('intraday', ('intraday', 'f'), 1)
+    store.set('fundamentals', ('fundamentals', 'f'), 2)
+    clock.now += 10
+    assert store.get('intraday', ('intraday', 'f')) == (False, None)
+    assert store.get('fundamentals', ('fundamentals', 'f')) == (True, 2)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    store = TTLCache(max_entries=2)
+    store.set('prices', ('prices', 'f', 'a'), 1)
+    store.set('prices', ('prices', 'f', 'b'), 2)
+    store.get('prices', ('prices', 'f', 'a'))
+    store.set('prices', ('prices', 'f', 'c'), 3)
+    assert store.get('prices', ('prices', 'f', 'b')) == (False, None)
+    assert store.get('prices', ('prices', 'f', 'a')) == (True, 1)
+    assert store.stats().loc['prices', 'evictions'] == 1
+
+
+def test_byte_limit_evicts(clock):
+    store = TTLCache(max_bytes=1000)
+    store.set('prices', ('prices', 'f', 'a'), np.zeros(100))
+    store.set('prices', ('prices', 'f', 'b'), np.zeros(100))
+    assert store.get('prices', ('prices', 'f', 'a')) == (False, None)
+    assert store.get('prices', ('prices', 'f', 'b'))[0]
+
+
+def test_invalidate_by_kind_and_function(clock):
+    store = TTLCache()
+    store.set('prices', ('prices', 'tests.load', 1), 1)
+    store.set('prices', ('prices', 'tests.other', 1), 2)
+    store.set('fundamentals', ('fundamentals', 'tests.load', 1), 3)
+    store.invalidate(kind='fundamentals')
+    assert store.get('fundamentals', ('fundamentals', 'tests.load', 1)) == (False, None)
+    assert store.get('prices', ('prices', 'tests.load', 1))[0]
+
+    def other():
+        pass
+    other.__module__, other.__qualname__ = 'tests', 'other'
+    store.invalidate(func=other)
+    assert store.get('prices', ('prices', 'tests.other', 1)) == (False, None)
+    assert store.get('prices', ('prices', 'tests.load', 1))[0]
+
+
+def test_cached_decorator(clock):
+    calls = []
+
+    @cache.cached('prices', ttl=30, skip=lambda result: result.empty)
+    def load(ticker, columns):
+        calls.append(ticker)
+        return pd.DataFrame({'Close': [1.0, 2.0]}) if ticker != 'NONE' else pd.DataFrame()
+
+    first = load('AAA', ['Close'])
+    first['Extra'] = 0
+    assert list(load('AAA', ['Close']).columns) == ['Close']
+    assert calls == ['AAA']
+
+    load('NONE', [])
+    load('NONE', [])
+    assert calls == ['AAA', 'NONE', 'NONE']
+
+    clock.now += 31
+    load('AAA', ['Close'])
+    assert calls == ['AAA', 'NONE', 'NONE', 'AAA']
+    load.invalidate()
+    load('AAA', ['Close'])
+    assert calls[-1] == 'AAA' and len(calls) == 5
@@ -0,0 +1,119 @@
+import pandas as pd
+import pytest
+from pages.utils import data_store
+from pages.utils import fetcher
+from pages.utils.data_store import missing_ranges
+from pages.utils.providers import FixtureProvider
+
+T = pd.Timestamp
+
+
+def test_missing_ranges_without_coverage():
+    assert missing_ranges(None, T('2024-01-01'), T('2024-02-01')) == [(T('2024-01-01'), T('2024-02-01'))]
+    assert missing_ranges(None, T('2024-02-01'), T('2024-02-01')) == []
+
+
+def test_missing_ranges_inside_coverage():
+    coverage = (T('2024-01-01'), T('2024-06-01'))
+    assert missing_ranges(coverage, T('2024-02-01'), T('2024-03-01')) == []
+    assert missing_ranges(coverage, *coverage) == []
+
+
+def test_missing_ranges_edges_touch_coverage():
+    coverage = (T('2024-03-01'), T('2024-06-01'))
+    assert missing_ranges(coverage, T('2024-01-01'), T('2024-04-01')) == [(T('2024-01-01'), T('2024-03-01'))]
+    assert missing_ranges(coverage, T('2024-04-01'), T('2024-08-01')) == [(T('2024-06-01'), T('2024-08-01'))]
+    assert missing_ranges(coverage, T('2024-01-01'), T('2024-08-01')) == [
+        (T('2024-01-01'), T('2024-03-01')), (T('2024-06-01'), T('2024-08-01'))]
+
+
+# A range entirely before the coverage still has to touch it, so the stored
+# block stays contiguous
+def test_missing_ranges_disjoint_request_fills_the_gap():
+    coverage = (T('2024-03-01'), T('2024-06-01'))
+    assert missing_ranges(coverage, T('2024-01-01'), T('2024-02-01')) == [(T('2024-01-01'), T('2024-03-01'))]
+
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    directory = tmp_path / 'fixtures'
+    directory.mkdir()
+    return directory
+
+
+def _bars(n):
+    index = pd.bdate_range('2024-01-02', periods=n, name='Date')
+    close = pd.Series(range(100, 100 + n), index=index, dtype='float64')
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': 1e6})
+
+
+def test_top_up_only_fetches_missing_edge(store_dir, fixture_dir):
+    bars = _bars(60)
+    bars.to_parquet(fixture_dir / 'AAA.parquet')
+    provider = FixtureProvider(str(fixture_dir))
+    frames, failures = data_store._load_many(['AAA'], '2024-01-02', '2024-02-15', provider)
+    assert not failures and frames['AAA'].index[-1] < T('2024-02-15')
+
+    frames, _ = data_store._load_many(['AAA'], '2024-01-02', '2024-03-26', provider)
+    pd.testing.assert_frame_equal(frames['AAA'], bars, check_freq=False)
+    assert data_store._read('AAA')[1] == (T('2024-01-02'), T('2024-03-26'))
+
+
+def test_failed_ticker_is_reported_with_the_others_loaded(store_dir, fixture_dir, monkeypatch):
+    monkeypatch.setattr(fetcher, 'RETRY_DELAY', 0)
+    _bars(20).to_parquet(fixture_dir / 'AAA.parquet')
+    frames, failures = data_store._load_many(['AAA', 'BBB'], '2024-01-02', '2024-01-20', FixtureProvider(str(fixture_dir)))
+    assert len(frames['AAA']) == 14 and frames['BBB'].empty
+    assert list(failures) == ['BBB']
+    assert data_store._read('BBB') == (None, None)
+
+
+# A split between two loads re-adjusts the whole history at the provider;
+# the stored bars must be replaced, not joined to the new ones
+def test_top_up_after_split_rewrites_history(store_dir, fixture_dir):
+    bars = _bars(60)
+    bars.iloc[:30].to_parquet(fixture_dir / 'AAA.parquet')
+    provider = FixtureProvider(str(fixture_dir))
+    data_store._load_many(['AAA'], '2024-01-02', '2024-02-13', provider)
+
+    adjusted = bars.copy()
+    adjusted[['Open', 'High', 'Low', 'Close']] /= 10
+    adjusted.to_parquet(fixture_dir / 'AAA.parquet')
+    frames, _ = data_store._load_many(['AAA'], '2024-01-02', '2024-03-26', provider)
+
+    pd.testing.assert_frame_equal(frames['AAA'], adjusted, check_freq=False)
+    assert data_store._read('AAA')[0]['Close'].iloc[0] == pytest.approx(10.0)
+
+
+# A weekend gap is never fetched, and a top-up that brings no new bars
+# leaves the stored file alone
+def test_top_up_without_new_bars_does_not_rewrite(store_dir, fixture_dir, monkeypatch):
+    _bars(60).to_parquet(fixture_dir / 'AAA.parquet')
+    provider = FixtureProvider(str(fixture_dir))
+    data_store._load_many(['AAA'], '2024-01-02', '2024-03-23', provider)
+    writes = []
+    write = data_store._write
+    monkeypatch.setattr(data_store, '_write', lambda *args: writes.append(args) or write(*args))
+
+    frames, _ = data_store._load_many(['AAA'], '2024-01-02', '2024-03-25', provider)
+    assert len(frames['AAA']) == 59 and not writes
+    frames, _ = data_store._load_many(['AAA'], '2024-01-02', '2024-03-30', provider)
+    assert len(frames['AAA']) == 60 and len(writes) == 1
+    frames, _ = data_store._load_many(['AAA'], '2024-01-02', '2024-03-30', provider)
+    assert len(writes) == 1
+
+
+# Fresh provider instances for the same source share cached loads
+def test_load_many_cache_keys_on_the_provider_source(store_dir, fixture_dir, tmp_path, monkeypatch):
+    _bars(20).to_parquet(fixture_dir / 'AAA.parquet')
+    calls = []
+    load = data_store._load_many
+    monkeypatch.setattr(data_store, '_load_many', lambda *args: calls.append(args) or load(*args))
+    data_store.load_many.invalidate()
+
+    for _ in range(2):
+        frames, _ = data_store.load_many(['AAA'], '2024-01-02', '2024-01-20', FixtureProvider(str(fixture_dir)))
+    assert len(calls) == 1 and len(frames['AAA']) == 14
+    data_store.load_many(['AAA'], '2024-01-02', '2024-01-20', FixtureProvider(str(tmp_path)))
+    assert len(calls) == 2
+    data_store.load_many.invalidate()
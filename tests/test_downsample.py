@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from pages.utils.downsample import lttb, downsample_line, ohlc_buckets
+
+
+def test_lttb_keeps_endpoints_and_count():
+    x = np.arange(10_000)
+    y = np.sin(x / 300.0)
+    selected = lttb(x, y, 500)
+    assert len(selected) == 500
+    assert selected[0] == 0 and selected[-1] == len(x) - 1
+    assert (np.diff(selected) > 0).all()
+
+
+def test_lttb_keeps_spikes():
+    x = np.arange(5_000)
+    y = np.zeros(5_000)
+    y[1234], y[4321] = 50.0, -50.0
+    selected = lttb(x, y, 100)
+    assert {1234, 4321} <= set(selected.tolist())
+
+
+def test_lttb_short_series_unchanged():
+    np.testing.assert_array_equal(lttb(np.arange(50), np.arange(50.0), 100), np.arange(50))
+
+
+def test_downsample_line_drops_warm_up_nans():
+    x = pd.bdate_range('2000-01-03', periods=3_000).to_numpy()
+    y = np.arange(3_000.0)
+    y[:50] = np.nan
+    dates, values = downsample_line(x, y, 200)
+    assert len(values) == 200 and not np.isnan(values).any()
+    assert dates[0] == x[50] and dates[-1] == x[-1]
+
+
+def test_ohlc_buckets_aggregate_candles(ohlcv):
+    buckets = ohlc_buckets(ohlcv, 60)
+    assert len(buckets) == 60
+    starts = ohlcv.index.get_indexer(buckets.index)
+    ends = np.append(starts[1:], len(ohlcv))
+    for (start, end), (_, row) in zip(zip(starts, ends), buckets.iterrows()):
+        chunk = ohlcv.iloc[start:end]
+        assert row['Open'] == chunk['Open'].iloc[0] and row['Close'] == chunk['Close'].iloc[-1]
+        assert row['High'] == chunk['High'].max() and row['Low'] == chunk['Low'].min()
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+from pages.utils import fetcher
+from pages.utils.fetcher import fetch_many
+from pages.utils.providers import PriceProvider
+
+
+def _frame():
+    return pd.DataFrame({'Close': [1.0]}, index=pd.DatetimeIndex(['2024-01-02'], name='Date'))
+
+
+# Batch returns only `batch`; single fetches of a ticker fail `flaky[ticker]`
+# times before they succeed, and always for tickers in `missing`
+class StubProvider(PriceProvider):
+    def __init__(self, batch=(), flaky=None, missing=(), batch_error=None):
+        self.batch = set(batch)
+        self.flaky = dict(flaky or {})
+        self.missing = set(missing)
+        self.batch_error = batch_error
+        self.batch_calls = []
+        self.calls = []
+
+    def fetch_batch(self, tickers, start, end):
+        self.batch_calls.append(list(tickers))
+        if self.batch_error:
+            raise self.batch_error
+        return {ticker: _frame() for ticker in tickers if ticker in self.batch}
+
+    def fetch(self, ticker, start, end):
+        self.calls.append(ticker)
+        if ticker in self.missing:
+            raise LookupError(f"No price data returned for {ticker}")
+        if self.flaky.get(ticker):
+            self.flaky[ticker] -= 1
+            raise ConnectionError('reset')
+        return _frame()
+
+
+@pytest.fixture(autouse=True)
+def no_delay(monkeypatch):
+    monkeypatch.setattr(fetcher, 'RETRY_DELAY', 0)
+
+
+def test_batch_covers_everything():
+    provider = StubProvider(batch=['AAA', 'BBB'])
+    result = fetch_many(['AAA', 'BBB', 'AAA'], '2024-01-01', '2024-02-01', provider)
+    assert sorted(result.frames) == ['AAA', 'BBB'] and not result.failures
+    assert provider.batch_calls == [['AAA', 'BBB']] and provider.calls == []
+
+
+def test_tickers_missing_from_the_batch_are_retried():
+    provider = StubProvider(batch=['AAA'], flaky={'BBB': 2})
+    result = fetch_many(['AAA', 'BBB'], '2024-01-01', '2024-02-01', provider)
+    assert sorted(result.frames) == ['AAA', 'BBB'] and not result.failures
+    assert provider.calls == ['BBB'] * 3
+
+
+def test_partial_failure_is_reported_not_raised():
+    provider = StubProvider(batch_error=ConnectionError('batch down'), flaky={'BBB': 5}, missing=['CCC'])
+    result = fetch_many(['AAA', 'BBB', 'CCC'], '2024-01-01', '2024-02-01', provider, retries=2)
+    assert sorted(result.frames) == ['AAA']
+    assert result.failures == {'BBB': 'reset', 'CCC': 'No price data returned for CCC'}
+    assert provider.calls.count('BBB') == 3 and provider.calls.count('CCC') == 3
+
+
+def test_single_ticker_skips_the_batch():
+    provider = StubProvider()
+    assert list(fetch_many(['AAA'], '2024-01-01', '2024-02-01', provider).frames) == ['AAA']
+    assert provider.batch_calls == []
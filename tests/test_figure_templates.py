@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from pages.utils.downsample import WEBGL_THRESHOLD
+from pages.utils.figure_templates import SKELETONS, build_figure, epoch_ms, line_values
+from pages.utils.figure_templates import overlay_traces
+
+
+def test_epoch_ms():
+    dates = pd.DatetimeIndex(['1970-01-02', '2024-01-02'])
+    np.testing.assert_array_equal(epoch_ms(dates), [86_400_000.0, pd.Timestamp('2024-01-02').value / 1e6])
+
+
+def test_build_swaps_data_into_the_skeleton():
+    dates = pd.bdate_range('2024-01-02', periods=5)
+    figure = build_figure('price', *[line_values(dates, np.arange(5.0) + i) for i in range(4)])
+    assert isinstance(figure, go.Figure)
+    assert [trace.name for trace in figure.data] == ['Open', 'Close', 'High', 'Low']
+    assert figure.data[1].line.color == 'black'
+    np.testing.assert_array_equal(figure.data[3].y, np.arange(5.0) + 3)
+    assert figure.layout.template.layout.plot_bgcolor == 'black'
+    assert all('y' not in trace for trace in SKELETONS['price'].traces)
+
+
+def test_long_series_switch_to_webgl():
+    dates = pd.bdate_range('2000-01-03', periods=WEBGL_THRESHOLD + 1)
+    figure = build_figure('rsi', line_values(dates, np.zeros(len(dates))))
+    assert figure.data[0].type == 'scattergl' and figure.data[0].line.color == 'orange'
+
+
+def test_nested_properties_are_merged():
+    figure = build_figure('macd', {}, {}, {'x': [0, 1], 'y': [1.0, -1.0], 'marker': {'color': [1, 0]}})
+    assert list(figure.data[2].marker.color) == [1, 0] and figure.data[2].marker.cmax == 1
+
+
+def test_bollinger_overlays_share_a_colour():
+    values = {'x': [0.0], 'y': [1.0]}
+    traces = overlay_traces({'SMA_20': values, 'BB_MID_20': values, 'BB_UPPER_20': values, 'BB_LOWER_20': values})
+    colors = [trace['line']['color'] for trace in traces]
+    assert colors[1] == colors[2] == colors[3] != colors[0]
+    assert [trace['line']['dash'] for trace in traces] == [None, None, 'dot', 'dot']
+    assert len(build_figure('price', *[values] * 4, extra=traces).data) == 8
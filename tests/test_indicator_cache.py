@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from pages.utils.indicator_cache import IndicatorCache, get_indicator
+from pages.utils.indicator_cache import data_version
+
+
+def test_repeated_lookups_share_one_read_only_result(ohlcv):
+    cache = IndicatorCache()
+    first = get_indicator(None, ohlcv['Close'], ('rsi', 14), cache=cache)
+    second = get_indicator(None, ohlcv['Close'].copy(), ('rsi', 14), cache=cache)
+    assert first is second and (cache.hits, cache.misses) == (1, 1)
+    with pytest.raises(ValueError):
+        first['RSI'][0] = 1.0
+
+
+def test_window_is_a_view_of_the_cached_arrays(ohlcv):
+    result = get_indicator(None, ohlcv['Close'], ('sma', 5), cache=IndicatorCache())
+    window = result.window(ohlcv.index[100:200])
+    assert len(window['SMA_5']) == 100
+    assert np.shares_memory(window['SMA_5'], result['SMA_5'])
+
+
+def test_least_recently_used_result_is_evicted(ohlcv):
+    cache = IndicatorCache(max_bytes=1)
+    get_indicator(None, ohlcv['Close'], ('sma', 5), cache=cache)
+    get_indicator(None, ohlcv['Close'], ('sma', 10), cache=cache)
+    assert cache.evictions == 1 and cache.stats()['entries'] == 1
+
+
+# Same span and last close, different history: must not share a cache entry
+def test_data_version_separates_series_with_same_last_close(ohlcv):
+    close = ohlcv['Close']
+    revised = close.copy()
+    revised.iloc[100] *= 1.5
+    assert data_version(close) != data_version(revised)
+
+    cache = IndicatorCache()
+    first = get_indicator(None, close, ('sma', 5), cache=cache)
+    second = get_indicator(None, revised, ('sma', 5), cache=cache)
+    assert first['SMA_5'][102] != pytest.approx(second['SMA_5'][102])
+    assert cache.misses == 2
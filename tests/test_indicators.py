@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+from pages.utils import indicators
+from pages.utils.indicators import batch_indicators, stream_indicators, sync_indicators
+from pages.utils.indicators import compute_indicators
+
+STREAMABLE = (('rsi', 14), ('sma', 50), ('ema', 12), ('macd', 12, 26, 9))
+
+
+@pytest.fixture
+def indicator_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(indicators, 'INDICATOR_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_rsi_sma_ema_match_ta(ohlcv):
+    close = ohlcv['Close']
+    pd.testing.assert_series_equal(indicators.rsi(close, 14), ta.momentum.RSIIndicator(close, 14).rsi(),
+                                   check_names=False)
+    pd.testing.assert_series_equal(indicators.sma(close, 50), ta.trend.SMAIndicator(close, 50).sma_indicator(),
+                                   check_names=False)
+    pd.testing.assert_series_equal(indicators.ema(close, 12), ta.trend.EMAIndicator(close, 12).ema_indicator(),
+                                   check_names=False)
+
+
+def test_macd_matches_ta(ohlcv):
+    close = ohlcv['Close']
+    expected = ta.trend.MACD(close, 26, 12, 9)
+    result = indicators.macd(close, 12, 26, 9)
+    pd.testing.assert_series_equal(result['MACD'], expected.macd(), check_names=False)
+    pd.testing.assert_series_equal(result['MACD Signal'], expected.macd_signal(), check_names=False)
+    pd.testing.assert_series_equal(result['MACD Hist'], expected.macd_diff(), check_names=False)
+
+
+def test_streaming_matches_batch(ohlcv):
+    close = ohlcv['Close']
+    streamed, _ = stream_indicators(close, STREAMABLE)
+    np.testing.assert_allclose(streamed, batch_indicators(close, STREAMABLE), rtol=1e-9, equal_nan=True)
+
+
+def test_sync_streams_only_new_bars(indicator_dir, ohlcv, monkeypatch):
+    close = ohlcv['Close']
+    sync_indicators('AAA', close.iloc[:400], STREAMABLE)
+
+    streamed = []
+    original = indicators.stream_indicators
+    monkeypatch.setattr(indicators, 'stream_indicators',
+                        lambda values, *args: streamed.append(len(values)) or original(values, *args))
+    result = sync_indicators('AAA', close, STREAMABLE)
+    assert streamed == [len(close) - 400]
+    np.testing.assert_allclose(result, batch_indicators(close, STREAMABLE), rtol=1e-9, equal_nan=True)
+
+
+def test_sync_restarts_when_history_is_revised(indicator_dir, ohlcv):
+    close = ohlcv['Close']
+    sync_indicators('AAA', close.iloc[:400], STREAMABLE)
+    revised = close / 10
+    result = sync_indicators('AAA', revised, STREAMABLE)
+    np.testing.assert_allclose(result, batch_indicators(revised, STREAMABLE), rtol=1e-9, equal_nan=True)
+
+
+def test_bollinger_matches_ta(ohlcv):
+    close = ohlcv['Close']
+    expected = ta.volatility.BollingerBands(close, 20, 2)
+    result = indicators.bollinger(close, 20, 2)
+    np.testing.assert_allclose(result['Mid'], expected.bollinger_mavg(), rtol=1e-12)
+    np.testing.assert_allclose(result['Upper'], expected.bollinger_hband(), rtol=1e-12)
+    np.testing.assert_allclose(result['Lower'], expected.bollinger_lband(), rtol=1e-12)
+
+
+# ta reports the warm-up bars as 0, this engine as NaN
+def test_atr_matches_ta_after_warm_up(ohlcv):
+    result = indicators.atr(ohlcv['High'], ohlcv['Low'], ohlcv['Close'], 14)
+    expected = ta.volatility.AverageTrueRange(ohlcv['High'], ohlcv['Low'], ohlcv['Close'], 14).average_true_range()
+    assert result.iloc[:13].isna().all()
+    np.testing.assert_allclose(result.iloc[13:], expected.iloc[13:], rtol=1e-12)
+
+
+def test_one_pass_set_matches_single_indicators(ohlcv):
+    specs = STREAMABLE + (('sma', 20), ('bbands', 20, 2), ('atr', 14))
+    together = compute_indicators(ohlcv, specs)
+    for spec in specs:
+        alone = compute_indicators(ohlcv, (spec,))
+        pd.testing.assert_frame_equal(together[alone.columns], alone)
+    np.testing.assert_allclose(together[batch_indicators(ohlcv['Close'], STREAMABLE).columns],
+                               batch_indicators(ohlcv['Close'], STREAMABLE), rtol=1e-12, equal_nan=True)
@@ -0,0 +1,92 @@
+import os
+import time
+import pytest
+from pages.utils.jobs import JobRunner, JobCancelled, RUNNING, DONE, FAILED, CANCELLED
+from pages.utils.jobs import CANCELLING, job_cpu_share
+
+# Job functions run in spawned workers, so they live at module level
+
+
+def _square(x, report):
+    report(0.5, 'Half way')
+    return x * x
+
+
+def _fail(report):
+    raise ValueError('boom')
+
+
+def _slow(seconds, report):
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        report(0.5, 'Working')
+        time.sleep(0.05)
+    return 'finished'
+
+
+def _cpu_share(report):
+    return job_cpu_share()
+
+
+@pytest.fixture(scope='module')
+def runner():
+    runner = JobRunner(max_workers=2)
+    yield runner
+    runner.shutdown()
+
+
+def _wait_for(runner, job_id, statuses, timeout=60):
+    deadline = time.time() + timeout
+    while runner.status(job_id) not in statuses:
+        assert time.time() < deadline, runner.status(job_id)
+        time.sleep(0.05)
+
+
+def test_result_and_progress(runner):
+    job_id = runner.submit(_square, 7)
+    assert runner.result(job_id, timeout=60) == 49
+    assert runner.status(job_id) == DONE
+    assert runner.progress(job_id) == (1.0, 'Done')
+
+
+def test_jobs_with_the_same_key_share_an_id(runner):
+    first = runner.submit(_square, 3, key=('square', 3))
+    assert runner.submit(_square, 3, key=('square', 3)) == first
+    assert runner.lookup(('square', 3)) == first
+    assert runner.result(first, timeout=60) == 9
+    assert runner.submit(_square, 3, key=('square', 3)) == first
+
+
+def test_failed_job_is_reported_and_not_reused(runner):
+    job_id = runner.submit(_fail, key='fail')
+    with pytest.raises(ValueError):
+        runner.result(job_id, timeout=60)
+    assert runner.status(job_id) == FAILED
+    assert isinstance(runner.error(job_id), ValueError)
+    assert runner.submit(_fail, key='fail') != job_id
+
+
+def test_running_job_stops_at_its_next_report(runner):
+    job_id = runner.submit(_slow, 30)
+    _wait_for(runner, job_id, (RUNNING,))
+    assert runner.cancel(job_id)
+    with pytest.raises(JobCancelled):
+        runner.result(job_id, timeout=30)
+    assert runner.status(job_id) == CANCELLED
+    assert not runner.cancel(job_id)
+
+
+def test_cancelled_job_is_cancelling_until_it_stops(runner):
+    job_id = runner.submit(_slow, 30)
+    _wait_for(runner, job_id, (RUNNING,))
+    runner.cancel(job_id)
+    assert runner.status(job_id) == CANCELLING
+    _wait_for(runner, job_id, (CANCELLED,), timeout=30)
+
+
+# Jobs size pools of their own from their share of the CPUs
+def test_jobs_get_a_share_of_the_cpus(runner):
+    job_id = runner.submit(_cpu_share)
+    _wait_for(runner, job_id, {DONE})
+    assert runner.result(job_id) == max(1, (os.cpu_count() or 2) // 2)
+    assert job_cpu_share() is None
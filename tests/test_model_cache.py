@@ -0,0 +1,70 @@
+import os
+import numpy as np
+import pytest
+from statsmodels.tsa.arima.model import ARIMA
+from pages.utils import model_cache
+from pages.utils.model_cache import save_model, load_model, latest_params
+from pages.utils.model_cache import scaler_window
+
+
+@pytest.fixture(autouse=True)
+def model_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_cache, 'MODEL_DIR', str(tmp_path))
+    model_cache._memory.clear()
+    return tmp_path
+
+
+@pytest.fixture
+def values():
+    return 100 + np.cumsum(np.random.default_rng(1).normal(0, 1, 300))
+
+
+def _fit(data):
+    return ARIMA(data, order=(1, 1, 0)).fit()
+
+
+def test_identical_series_restores_the_fit(values):
+    results = _fit(values[:250])
+    save_model('AAA', (1, 1, 0), values[:250], results)
+    model_cache._memory.clear()
+    restored = load_model('AAA', (1, 1, 0), values[:250])
+    np.testing.assert_allclose(restored.params, results.params)
+    np.testing.assert_allclose(latest_params('AAA', (1, 1, 0)), results.params)
+    assert load_model('AAA', (2, 1, 0), values[:250]) is None
+
+
+def test_grown_series_is_extended_with_append(values):
+    results = _fit(values[:250])
+    save_model('AAA', (1, 1, 0), values[:250], results)
+    extended = load_model('AAA', (1, 1, 0), values[:255])
+    assert extended.nobs == 255
+    np.testing.assert_allclose(extended.params, results.params)
+    np.testing.assert_allclose(extended.forecast(5), results.append(values[250:255]).forecast(5))
+
+
+def test_append_limit_and_revised_history_miss(values):
+    save_model('AAA', (1, 1, 0), values[:250], _fit(values[:250]))
+    assert load_model('AAA', (1, 1, 0), values[:251 + model_cache.APPEND_LIMIT]) is None
+    revised = values[:255].copy()
+    revised[10] += 1
+    assert load_model('AAA', (1, 1, 0), revised) is None
+
+
+def test_scaler_window_is_kept_while_the_series_grows(values):
+    assert scaler_window('AAA', values[:200]) == 200
+    assert scaler_window('AAA', values[:201]) == 200
+    assert scaler_window('AAA', values[:200 + model_cache.SCALER_REFRESH]) == 200
+
+
+def test_scaler_window_refits_after_refresh_or_revision(values):
+    scaler_window('AAA', values[:200])
+    assert scaler_window('AAA', values[:201 + model_cache.SCALER_REFRESH]) == 201 + model_cache.SCALER_REFRESH
+
+    scaler_window('BBB', values[:200])
+    assert scaler_window('BBB', values[:210] / 10) == 210
+
+
+def test_unreadable_model_entry_is_a_cache_miss(model_dir):
+    with open(model_cache._model_path('AAA', (1, 1, 1), 'abc'), 'wb') as f:
+        f.write(b'not a pickle')
+    assert model_cache._load_entry('AAA', (1, 1, 1), 'abc') is None
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from pages.utils.order_search import candidate_orders, search_order
+from pages.utils.jobs import JobCancelled
+
+
+@pytest.fixture(scope='module')
+def series():
+    rng = np.random.default_rng(11)
+    steps = np.zeros(200)
+    for i in range(1, 200):
+        steps[i] = 0.6 * steps[i - 1] + rng.normal()
+    return 100 + np.cumsum(steps)
+
+
+def test_candidates_run_cheapest_first():
+    orders = candidate_orders(1, range(3), range(3))
+    assert len(orders) == 9 and orders[0] == (0, 1, 0)
+    assert all(d == 1 for _, d, _ in orders)
+    assert [p + q for p, _, q in orders] == sorted(p + q for p, _, q in orders)
+
+
+def test_search_picks_the_lowest_aic(series):
+    result = search_order(series, 1, range(2), range(2), budget=120, max_workers=2)
+    assert len(result.table) == 4 and (result.table['status'] == 'ok').all()
+    assert result.table['aic'].iloc[0] == result.table['aic'].min()
+    assert result.best_order == tuple(result.table['order'].iloc[0])
+    assert len(result.best_params) == result.best_order[0] + result.best_order[2] + 1
+
+
+# The budget starts once the workers are up, so a short one still fits a small grid
+def test_short_budget_excludes_worker_start_up(series):
+    result = search_order(series, 1, range(2), range(2), budget=3, max_workers=2)
+    assert (result.table['status'] == 'ok').all()
+
+
+# A cancelled job raises from its report callback, which stops the search
+def test_report_after_each_candidate_can_stop_the_search(series):
+    calls = []
+
+    def report(fraction, message=''):
+        calls.append(fraction)
+        if len(calls) == 2:
+            raise JobCancelled("job")
+
+    with pytest.raises(JobCancelled):
+        search_order(series, 1, range(2), range(2), budget=120, max_workers=2, report=report)
+    assert calls == [0.25, 0.5]
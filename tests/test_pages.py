@@ -0,0 +1,48 @@
+import os
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+from pages.utils import jobs, model_train, results_store
+
+PAGES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pages')
+
+
+# Stands in for run_forecast in the spawned worker, so it lives at module level
+def _quick_forecast(ticker, auto_order=False, report=None, backtest_folds=0):
+    report(0.5, 'Fitting forecast model')
+    rolling = pd.DataFrame({'Close': [float(i) for i in range(150)]},
+                           index=pd.bdate_range('2024-01-01', periods=150, name='Date'))
+    forecast = pd.DataFrame({'Close': [150.0, 151.0]},
+                            index=pd.date_range(rolling.index[-1] + pd.Timedelta(days=1), periods=2, name='Date'))
+    backtest = {'folds': backtest_folds, 'rmse': 0.5, 'mae': 0.4, 'fit_seconds': 1.0} if backtest_folds else None
+    return {'rmse': 0.25, 'forecast': forecast, 'rolling_price': rolling, 'order': (1, 1, 1), 'order_table': None,
+            'backtest': backtest}
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    monkeypatch.setattr(results_store, 'RESULTS_DIR', str(tmp_path))
+    monkeypatch.setattr(model_train, 'run_forecast', _quick_forecast)
+    monkeypatch.setattr(jobs, '_runner', None)
+    yield
+    if jobs._runner is not None:
+        jobs._runner.shutdown()
+
+
+# Under Streamlit __main__ is the page script; the runner's processes must
+# start without re-running it
+def test_prediction_page_runs_forecast_job(runner):
+    at = AppTest.from_file(os.path.join(PAGES, 'Stock_Prediction.py'), default_timeout=120)
+    at.run()
+    assert not at.exception
+    assert any('Model RMSE Score' in m.value for m in at.markdown)
+    assert results_store.load_forecast('TSLA', False) is not None
+
+
+def test_prediction_page_shows_a_live_backtest(runner):
+    at = AppTest.from_file(os.path.join(PAGES, 'Stock_Prediction.py'), default_timeout=120)
+    at.run()
+    at.checkbox[1].check().run()
+    assert not at.exception
+    assert any('Walk-forward backtest (10 folds)' in m.value for m in at.markdown)
+    assert results_store.load_forecast('TSLA', False)['backtest']['folds'] == 10
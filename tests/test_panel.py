@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pages.utils.panel import PricePanel, trading_days
+
+
+@pytest.mark.parametrize('holiday', ['2024-01-01', '2024-01-15', '2024-03-29', '2024-07-04', '2024-11-28',
+                                     '2024-12-25', '2023-06-19'])
+def test_holidays_are_not_trading_days(holiday):
+    assert pd.Timestamp(holiday) not in trading_days('2023-01-01', '2024-12-31')
+
+
+def test_regular_sessions_are_trading_days():
+    days = trading_days('2024-01-01', '2024-12-31')
+    assert len(days) == 252
+    assert days[0] == pd.Timestamp('2024-01-02') and days[-1] == pd.Timestamp('2024-12-31')
+
+
+@pytest.fixture
+def panel():
+    return PricePanel(trading_days('2024-01-02', '2024-01-31'), capacity=2)
+
+
+def test_add_aligns_to_the_calendar(panel):
+    # The Saturday is dropped and the missing Friday is masked out
+    dates = pd.DatetimeIndex(['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-06'])
+    panel.add('A', pd.Series([1.0, 2.0, 3.0, 4.0], index=dates))
+    assert panel.column('A')[:3].tolist() == [1.0, 2.0, 3.0]
+    assert panel.mask('A').sum() == 3 and not panel.mask('A')[3]
+
+
+def test_columns_grow_and_reuse_slots(panel):
+    for i, name in enumerate('ABC'):
+        panel.add(name, pd.Series(float(i), index=panel.index))
+    assert panel.columns == ['A', 'B', 'C'] and panel._values.shape[1] == 4
+    panel.remove('B')
+    panel.add('D', pd.Series(9.0, index=panel.index))
+    assert panel._values.shape[1] == 4 and 'B' not in panel
+    np.testing.assert_array_equal(panel.matrix(['A', 'C', 'D'])[0], [0.0, 2.0, 9.0])
+
+
+def test_frame_dropna_keeps_common_days(panel):
+    panel.add('A', pd.Series(1.0, index=panel.index))
+    panel.add('B', pd.Series(2.0, index=panel.index[5:]))
+    assert len(panel.frame(['A', 'B'], dropna=True)) == len(panel.index) - 5
+    assert len(panel.frame(['A', 'B'])) == len(panel.index)
+
+
+def test_window_reads_the_parent_buffers(panel):
+    panel.add('A', pd.Series(np.arange(len(panel.index), dtype='float64'), index=panel.index))
+    window = panel.window('2024-01-10', '2024-01-19')
+    assert window.index[0] == pd.Timestamp('2024-01-10') and window.index[-1] == pd.Timestamp('2024-01-19')
+    assert np.shares_memory(window.column('A'), panel.column('A'))
+
+
+def test_window_writes_leave_the_parent_alone(panel):
+    panel.add('A', pd.Series(1.0, index=panel.index))
+    panel.add('B', pd.Series(2.0, index=panel.index))
+    window = panel.window('2024-01-10', '2024-01-19')
+    window.add('A', pd.Series(9.0, index=window.index))
+    window.remove('B')
+    window.add('C', pd.Series(7.0, index=window.index))
+    assert (panel.column('A') == 1.0).all() and (panel.column('B') == 2.0).all()
+    assert (window.column('A') == 9.0).all() and window.columns == ['A', 'C']
+    assert not np.shares_memory(window.column('C'), panel._values)
+
+    removed = panel.window('2024-01-10')
+    removed.remove('A')
+    removed.add('D', pd.Series(5.0, index=removed.index))
+    assert (panel.column('A') == 1.0).all()
+
+
+@pytest.mark.parametrize('closed', ['2001-09-11', '2007-01-02', '2012-10-29', '2018-12-05', '2025-01-09'])
+def test_exchange_closures_are_not_trading_days(closed):
+    assert pd.Timestamp(closed) not in trading_days('2000-01-01', '2025-12-31')
+
+
+def test_martin_luther_king_day_from_1998():
+    assert pd.Timestamp('1997-01-20') in trading_days('1997-01-01', '1997-01-31')
+    assert pd.Timestamp('1998-01-19') not in trading_days('1998-01-01', '1998-01-31')
+    assert pd.Timestamp('2018-12-06') in trading_days('2018-12-01', '2018-12-31')
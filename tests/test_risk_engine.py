@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pages.utils.risk_engine import simple_returns, beta_alpha
+from pages.utils.risk_engine import rolling_beta_alpha, ewma_beta_alpha
+from pages.utils.risk_engine import regression_stats
+
+
+# Daily returns of three assets with betas 0.8, 1.0 and 1.3 to the market
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(5)
+    market = rng.normal(0.0004, 0.01, 400)
+    matrix = 0.0002 + np.outer(market, [0.8, 1.0, 1.3]) + rng.normal(0, 0.01, (400, 3))
+    return matrix, market
+
+
+def test_simple_returns_matches_pct_change():
+    prices = np.array([[100.0, 10.0], [110.0, 9.0], [99.0, 9.9]])
+    expected = pd.DataFrame(prices).pct_change().fillna(0).to_numpy()
+    np.testing.assert_allclose(simple_returns(prices), expected)
+    np.testing.assert_allclose(simple_returns(prices[:, 0], percent=True)[:, 0], expected[:, 0] * 100)
+
+
+def test_beta_alpha_matches_least_squares(returns):
+    matrix, market = returns
+    beta, alpha = beta_alpha(matrix, market)
+    for j in range(matrix.shape[1]):
+        slope, intercept = np.polyfit(market, matrix[:, j], 1)
+        assert beta[j] == pytest.approx(slope)
+        assert alpha[j] == pytest.approx(intercept, abs=1e-12)
+
+
+def _pandas_rolling(matrix, market, window, min_periods):
+    frame = pd.DataFrame(matrix)
+    x = pd.Series(market)
+    beta = pd.DataFrame({
+        col: frame[col].rolling(window, min_periods=min_periods).cov(x) / x.where(frame[col].notna())
+        .rolling(window, min_periods=min_periods).var()
+        for col in frame})
+    return beta.to_numpy()
+
+
+@pytest.mark.parametrize('window', [20, 60, 252])
+def test_rolling_beta_matches_pandas(returns, window):
+    matrix, market = returns
+    beta, _ = rolling_beta_alpha(matrix, market, window, min_periods=window)
+    np.testing.assert_allclose(beta, _pandas_rolling(matrix, market, window, window), rtol=1e-8, atol=1e-10)
+
+
+def test_rolling_alpha_matches_window_regression(returns):
+    matrix, market = returns
+    window = 60
+    _, alpha = rolling_beta_alpha(matrix, market, window, min_periods=window)
+    for row in (window - 1, 200, len(market) - 1):
+        _, intercept = np.polyfit(market[row - window + 1:row + 1], matrix[row - window + 1:row + 1, 1], 1)
+        assert alpha[row, 1] == pytest.approx(intercept, abs=1e-12)
+
+
+def test_ewma_beta_matches_pandas(returns):
+    matrix, market = returns
+    beta, _ = ewma_beta_alpha(matrix, market, halflife=30, min_periods=1)
+    x = pd.Series(market)
+    for j in range(matrix.shape[1]):
+        y = pd.Series(matrix[:, j])
+        expected = x.ewm(halflife=30).cov(y, bias=True) / x.ewm(halflife=30).var(bias=True)
+        np.testing.assert_allclose(beta[5:, j], expected[5:], rtol=1e-7)
+
+
+def test_regression_stats_match_least_squares(returns):
+    matrix, market = returns
+    matrix = matrix.copy()
+    matrix[:50, 2] = np.nan
+    n, beta, alpha, _, r_squared = regression_stats(matrix, market)
+    assert n.tolist() == [len(market), len(market), len(market) - 50]
+    for j, rows in ((0, slice(None)), (2, slice(50, None))):
+        slope, intercept = np.polyfit(market[rows], matrix[rows, j], 1)
+        assert (beta[j], alpha[j]) == pytest.approx((slope, intercept), abs=1e-12)
+        assert r_squared[j] == pytest.approx(np.corrcoef(market[rows], matrix[rows, j])[0, 1] ** 2)
+
+
+# One missing day must not blank the following window's worth of rows
+def test_rolling_beta_tolerates_a_missing_day(returns):
+    matrix, market = returns
+    matrix = matrix.copy()
+    matrix[150, 0] = np.nan
+    beta, _ = rolling_beta_alpha(matrix, market, 100)
+    assert not np.isnan(beta[100:, 0]).any()
+    np.testing.assert_allclose(beta[100:], _pandas_rolling(matrix, market, 100, 80)[100:], rtol=1e-8)
+    strict, _ = rolling_beta_alpha(matrix, market, 100, min_periods=100)
+    assert np.isnan(strict[150:250, 0]).all()
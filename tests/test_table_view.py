@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pages.utils.table_view import table_page, format_page, frame_token
+
+
+@pytest.fixture
+def frame():
+    index = pd.bdate_range('2024-01-01', periods=23, name='Date')
+    values = np.arange(23.0)
+    values[[3, 7]] = np.nan
+    return pd.DataFrame({'Return': values[::-1] / 7, 'Ticker': [f'T{i}' for i in range(23)]}, index=index)
+
+
+def test_pages_cover_every_row_once(frame):
+    pages = [table_page(frame, page, page_size=10) for page in range(3)]
+    assert [len(page) for page in pages] == [10, 10, 3]
+    assert pd.concat(pages)['Ticker'].tolist() == frame['Ticker'].tolist()
+
+
+def test_sort_puts_missing_values_last(frame):
+    for ascending in (True, False):
+        rows = pd.concat([table_page(frame, page, 10, sort_by='Return', ascending=ascending) for page in range(3)])
+        assert rows['Return'].iloc[-2:].isna().all()
+        expected = frame['Return'].dropna().sort_values(ascending=ascending).round(3)
+        np.testing.assert_array_equal(rows['Return'].iloc[:-2], expected)
+
+
+def test_format_page_rounds_and_shows_dates(frame):
+    page = format_page(frame.iloc[:3], decimals=2)
+    assert page.index.tolist() == ['2024-01-01', '2024-01-02', '2024-01-03']
+    assert page['Return'].tolist() == pytest.approx(np.round(frame['Return'].iloc[:3], 2).tolist())
+    assert frame.index.dtype.kind == 'M'
+
+
+def test_frame_token_follows_content(frame):
+    changed = frame.copy()
+    changed.iloc[0, 0] = 99.0
+    assert frame_token(frame) == frame_token(frame.copy())
+    assert frame_token(frame) != frame_token(changed)
+    assert frame_token(frame) != frame_token(frame.rename(columns={'Return': 'R'}))
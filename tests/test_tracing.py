@@ -0,0 +1,87 @@
+import json
+import threading
+import pytest
+from pages.utils import tracing
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(tracing, 'ENABLED', True)
+    monkeypatch.setattr(tracing, 'TRACE_FILE', None)
+    tracing.reset()
+    yield
+    tracing.reset()
+
+
+def test_disabled_tracing_records_nothing(monkeypatch):
+    monkeypatch.setattr(tracing, 'ENABLED', False)
+    tracing.reset()
+    with tracing.span('data.fetch') as span:
+        span.set(rows=1)
+    assert tracing.span('data.fetch') is tracing._NOOP
+    assert tracing.span_table().empty
+
+
+def test_spans_nest_and_keep_attributes(enabled):
+    with tracing.span('page', page='Test'):
+        with tracing.span('data.fetch', tickers=3) as inner:
+            inner.set(rows=10)
+    table = tracing.span_table()
+    assert table['name'].tolist() == ['data.fetch', 'page']
+    assert table['parent'].tolist() == ['page', None]
+    assert (table['tickers'].iloc[0], table['rows'].iloc[0], table['page'].iloc[1]) == (3, 10, 'Test')
+
+
+def test_traced_records_errors(enabled):
+    @tracing.traced('model.fit')
+    def fit(fail):
+        if fail:
+            raise ValueError
+        return 1
+
+    assert fit(False) == 1
+    with pytest.raises(ValueError):
+        fit(True)
+    assert tracing.span_table()['error'].iloc[1] == 'ValueError'
+    summary = tracing.summary_table()
+    assert summary.loc[0, 'span'] == 'model.fit' and summary.loc[0, 'count'] == 2
+
+
+def test_span_table_since_and_exports(enabled):
+    with tracing.span('a'):
+        pass
+    since = tracing.current_sequence()
+    with tracing.span('b'):
+        pass
+    assert tracing.span_table(since)['name'].tolist() == ['b']
+    assert [json.loads(line)['name'] for line in tracing.jsonl_text().splitlines()] == ['a', 'b']
+    assert 'tradezy_span_seconds_count{span="a"} 1' in tracing.prometheus_text()
+
+
+def test_root_span_drops_spans_left_open(enabled):
+    tracing.begin('page', root=True)
+    tracing.begin('page', root=True).end()
+    assert tracing.span_table()['parent'].tolist() == [None]
+
+
+# A session's toggle traces its own thread only, and its spans are kept apart
+def test_session_tracing_is_per_thread(monkeypatch):
+    monkeypatch.setattr(tracing, 'ENABLED', False)
+    monkeypatch.setattr(tracing, 'TRACE_FILE', None)
+    tracing.reset()
+
+    def run(session, enabled):
+        tracing.set_session(session, enabled)
+        with tracing.span(f'page.{session}'):
+            pass
+
+    threads = [threading.Thread(target=run, args=args) for args in (('a', True), ('b', False))]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    assert tracing.span_table()['name'].tolist() == ['page.a']
+    assert tracing.span_table(session='b').empty
+    with tracing.span('main'):
+        pass
+    assert tracing.span_table(session='a')['session'].tolist() == ['a']
+    tracing.reset()
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pages.utils.data_store import PERIOD_OFFSETS
+from pages.utils.windows import slice_period, slice_range
+
+
+@pytest.mark.parametrize('period', ['5d', '1mo', '6mo', '1y', '5y'])
+def test_slice_period_matches_date_filter(ohlcv, period):
+    start = ohlcv.index[-1] - PERIOD_OFFSETS[period]
+    expected = ohlcv[ohlcv.index > start]
+    pd.testing.assert_frame_equal(slice_period(ohlcv, period), expected)
+
+
+def test_slice_period_ytd_and_max(ohlcv):
+    last = ohlcv.index[-1]
+    ytd = slice_period(ohlcv, 'ytd')
+    assert ytd.index[0] >= pd.Timestamp(last.year, 1, 1) and ytd.index[-1] == last
+    assert len(ytd) == (ohlcv.index > pd.Timestamp(last.year, 1, 1)).sum()
+    pd.testing.assert_frame_equal(slice_period(ohlcv, 'max'), ohlcv)
+    pd.testing.assert_frame_equal(slice_period(ohlcv, None), ohlcv)
+
+
+def test_slice_period_is_a_view(ohlcv):
+    window = slice_period(ohlcv, '1y')
+    assert np.shares_memory(window['Close'].to_numpy(), ohlcv['Close'].to_numpy())
+
+
+def test_slice_period_empty_frame(ohlcv):
+    assert slice_period(ohlcv.iloc[:0], '1y').empty
+
+
+def test_slice_range_is_end_exclusive(ohlcv):
+    start, end = ohlcv.index[10], ohlcv.index[20]
+    window = slice_range(ohlcv, start, end)
+    assert window.index[0] == start and window.index[-1] == ohlcv.index[19]
+    assert len(slice_range(ohlcv, end=end)) == 20
+    assert len(slice_range(ohlcv, start=start)) == len(ohlcv) - 10